@@ -43,6 +43,17 @@ class PerturbationConfig:
 
         return any(perturbation.is_perturbed(perturbation_type, block) for perturbation in self.perturbations)
 
+    def first_perturbed_block(self, num_blocks: int) -> int:
+        """Index of the first block this config perturbs, or ``num_blocks`` if it perturbs none of them."""
+        return next(
+            (
+                block
+                for block in range(num_blocks)
+                if any(self.is_perturbed(perturbation_type, block) for perturbation_type in PerturbationType)
+            ),
+            num_blocks,
+        )
+
     @staticmethod
     def empty() -> "PerturbationConfig":
         return PerturbationConfig([])
@@ -1,7 +1,9 @@
 """Loader utilities for model weights, LoRAs, and safetensor operations."""
 
-from ltx_core.loader.fuse_loras import apply_loras
+from ltx_core.loader.fuse_loras import apply_loras, fuse_loras_, restore_weights_
+from ltx_core.loader.fused_cache import FusedWeightCache, fused_weights_key, weights_fingerprint
 from ltx_core.loader.module_ops import ModuleOps
+from ltx_core.loader.prefetch import StateDictPrefetcher, load_pinned_state_dict
 from ltx_core.loader.primitives import (
     LoRAAdaptableProtocol,
     LoraPathStrengthAndSDOps,
@@ -11,6 +13,8 @@ from ltx_core.loader.primitives import (
     StateDictLoader,
 )
 from ltx_core.loader.registry import DummyRegistry, Registry, StateDictRegistry
+from ltx_core.loader.repack import repack_model
+from ltx_core.loader.runtime_lora import RuntimeLoras
 from ltx_core.loader.sd_ops import (
     LTXV_LORA_COMFY_RENAMING_MAP,
     ContentMatching,
@@ -20,14 +24,22 @@ from ltx_core.loader.sd_ops import (
     SDKeyValueOperation,
     SDOps,
 )
-from ltx_core.loader.sft_loader import SafetensorsModelStateDictLoader, SafetensorsStateDictLoader
-from ltx_core.loader.single_gpu_model_builder import SingleGPUModelBuilder
+from ltx_core.loader.sft_loader import (
+    REPACKED_METADATA_KEY,
+    ParallelSafetensorsStateDictLoader,
+    SafetensorsModelStateDictLoader,
+    SafetensorsStateDictLoader,
+    save_safetensors,
+)
+from ltx_core.loader.single_gpu_model_builder import SingleGPUModelBuilder, build_models
 
 __all__ = [
     "LTXV_LORA_COMFY_RENAMING_MAP",
+    "REPACKED_METADATA_KEY",
     "ContentMatching",
     "ContentReplacement",
     "DummyRegistry",
+    "FusedWeightCache",
     "KeyValueOperation",
     "KeyValueOperationResult",
     "LoRAAdaptableProtocol",
@@ -35,7 +47,9 @@ __all__ = [
     "LoraStateDictWithStrength",
     "ModelBuilderProtocol",
     "ModuleOps",
+    "ParallelSafetensorsStateDictLoader",
     "Registry",
+    "RuntimeLoras",
     "SDKeyValueOperation",
     "SDOps",
     "SafetensorsModelStateDictLoader",
@@ -43,6 +57,15 @@ __all__ = [
     "SingleGPUModelBuilder",
     "StateDict",
     "StateDictLoader",
+    "StateDictPrefetcher",
     "StateDictRegistry",
     "apply_loras",
+    "build_models",
+    "fuse_loras_",
+    "fused_weights_key",
+    "load_pinned_state_dict",
+    "repack_model",
+    "restore_weights_",
+    "save_safetensors",
+    "weights_fingerprint",
 ]
@@ -51,7 +51,7 @@ def _prepare_deltas(
     for lsd, coef in lora_sd_and_strengths:
         if key_a not in lsd.sd or key_b not in lsd.sd:
             continue
-        product = torch.matmul(lsd.sd[key_b] * coef, lsd.sd[key_a])
+        product = torch.matmul(lsd.sd[key_b].to(device) * coef, lsd.sd[key_a].to(device))
         deltas.append(product.to(dtype=dtype, device=device))
     if len(deltas) == 0:
         return None
@@ -98,3 +98,44 @@ def apply_loras(
     if destination_sd is not None:
         return destination_sd
     return StateDict(sd, device, size, inner_dtypes)
+
+
+def fuse_loras_(
+    model: torch.nn.Module,
+    lora_sd_and_strengths: list[LoraStateDictWithStrength],
+    original_weights: dict[str, torch.Tensor] | None = None,
+) -> torch.nn.Module:
+    """
+    Fuse LoRAs into the weights of an already built ``model``, in place.
+    Unlike :func:`apply_loras`, no new state dict is allocated: each targeted weight is updated with its delta,
+    so a model can be switched to a LoRA variant without reloading its checkpoint. FP8 weights are updated in
+    BF16 and rounded back like in :func:`apply_loras`. When ``original_weights`` is given, the weights are saved
+    there (on CPU, pinned for CUDA weights) before being modified, so :func:`restore_weights_` can undo the fusion
+    exactly: subtracting the deltas from the rounded fused weights does not give the original BF16 or FP8 weights
+    back.
+    """
+    for key, weight in model.named_parameters():
+        deltas_dtype = weight.dtype if weight.dtype not in [torch.float8_e4m3fn, torch.float8_e5m2] else torch.bfloat16
+        deltas = _prepare_deltas(lora_sd_and_strengths, key, deltas_dtype, weight.device)
+        if deltas is None:
+            continue
+        if original_weights is not None:
+            original = weight.detach().to(device="cpu", copy=True)
+            original_weights[key] = original.pin_memory() if weight.device.type == "cuda" else original
+        if weight.dtype == torch.float8_e4m3fn and weight.device.type == "cuda":
+            deltas = calculate_weight_float8_(deltas, weight.data)
+        elif weight.dtype in [torch.float8_e4m3fn, torch.float8_e5m2]:
+            deltas.add_(weight.data.to(dtype=deltas.dtype))
+        else:
+            weight.data.add_(deltas)
+            continue
+        weight.data.copy_(deltas.to(dtype=weight.dtype))
+    return model
+
+
+def restore_weights_(model: torch.nn.Module, original_weights: dict[str, torch.Tensor]) -> torch.nn.Module:
+    """Copy weights saved by :func:`fuse_loras_` back into ``model``, undoing the fusion bit for bit."""
+    parameters = dict(model.named_parameters())
+    for key, weight in original_weights.items():
+        parameters[key].data.copy_(weight)
+    return model
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+import os
+import struct
+import uuid
+from collections.abc import Sequence
+from pathlib import Path
+
+import torch
+
+from ltx_core.loader.primitives import LoraPathStrengthAndSDOps
+from ltx_core.loader.sd_ops import SDOps
+from ltx_core.loader.sft_loader import REPACKED_METADATA_KEY, read_safetensors_header, save_safetensors
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Bump when fusing changes, so that entries fused the old way are not reused.
+FUSED_CACHE_VERSION = 1
+
+
+def weights_fingerprint(paths: Sequence[str | Path]) -> str:
+    """
+    Fingerprint of weight files from their size, modification time and safetensors header (tensor names, dtypes,
+    shapes and offsets). Rewriting or replacing a file changes its fingerprint without hashing gigabytes of weights.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(p).resolve() for p in paths):
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        if path.suffix == ".safetensors":
+            with path.open("rb") as f:
+                (length,) = struct.unpack("<Q", f.read(8))
+                digest.update(f.read(length))
+    return digest.hexdigest()
+
+
+def fused_weights_key(
+    model_paths: Sequence[str],
+    sd_ops: SDOps | None,
+    loras: Sequence[LoraPathStrengthAndSDOps],
+    dtype: torch.dtype | None,
+    device: torch.device,
+) -> str:
+    """
+    Content address of the weights built from ``model_paths`` with ``loras`` fused in: the base and LoRA files,
+    the sd_ops applied to them, the LoRA strengths, the dtype and the device type, since FP8 weights are rounded
+    stochastically on CUDA only.
+    """
+    parts = {
+        "version": FUSED_CACHE_VERSION,
+        "model": weights_fingerprint(model_paths),
+        "sd_ops": getattr(sd_ops, "name", None),
+        "loras": [
+            (weights_fingerprint([lora.path]), lora.strength, getattr(lora.sd_ops, "name", None)) for lora in loras
+        ],
+        "dtype": str(dtype),
+        "device": torch.device(device).type,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class FusedWeightCache:
+    """
+    On-disk cache of model weights with LoRAs fused in, so a build with a LoRA combination seen before loads the
+    fused weights instead of fusing them again (see
+    :attr:`~ltx_core.loader.single_gpu_model_builder.SingleGPUModelBuilder.fused_cache`).
+    Entries are ``<cache_dir>/<key>.safetensors`` files marked as repacked, so loaders read them as stored, next to a
+    ``<key>.json`` record of their size and SHA-256. They are written atomically, so concurrent processes can share a
+    cache directory. An entry is only used if it parses, has the recorded size and carries its own key; with
+    ``verify`` its checksum is checked as well, the first time the entry is used by this cache object and again
+    whenever the file changes. Invalid entries are deleted and treated as misses. When the entries exceed
+    ``max_bytes``, the least recently used ones are deleted.
+    ### Constructor parameters
+    cache_dir:
+        Directory holding the cache entries. Created on first write.
+    max_bytes:
+        Size cap of the cache in bytes, or ``None`` for no cap. Entries larger than the cap are not stored.
+    verify:
+        Whether the SHA-256 of an entry is checked before it is first used, which reads the entry once more.
+    """
+
+    def __init__(self, cache_dir: Path | str, max_bytes: int | None = None, verify: bool = True):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_bytes = max_bytes
+        self.verify = verify
+        # Inode and modification time of the entries whose checksum was checked, by key.
+        self._verified: dict[str, tuple[int, int]] = {}
+
+    def get(self, key: str) -> str | None:
+        """Path of the valid entry stored under ``key``, marked as most recently used, or ``None``."""
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        try:
+            record = json.loads(path.with_suffix(".json").read_text())
+            header, _ = read_safetensors_header(str(path))
+            marker = json.loads(header["__metadata__"][REPACKED_METADATA_KEY])
+            stat = path.stat()
+            valid = stat.st_size == record["size"] and marker.get("fused_cache_key") == key
+            if valid and self.verify and self._verified.get(key) != (stat.st_ino, stat.st_mtime_ns):
+                valid = _file_sha256(path) == record["sha256"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Unreadable fused weight cache entry %s: %s", path, e)
+            valid = False
+        if not valid:
+            logger.warning("Deleting invalid fused weight cache entry %s", path)
+            self.remove(key)
+            return None
+        os.utime(path)
+        if self.verify:
+            stat = path.stat()
+            self._verified[key] = (stat.st_ino, stat.st_mtime_ns)
+        return str(path)
+
+    def put(self, key: str, model: torch.nn.Module, config: dict) -> str | None:
+        """
+        Store the parameters and buffers of ``model``, built from ``config``, under ``key``, then evict least
+        recently used entries over the size cap. Returns the path of the entry, or ``None`` if it was not kept.
+        """
+        tensors = [*model.named_parameters(remove_duplicate=False), *model.named_buffers(remove_duplicate=False)]
+        if any(tensor.is_meta for _, tensor in tensors):
+            logger.warning("Not caching fused weights of a model with uninitialized tensors")
+            return None
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{key}.{uuid.uuid4().hex}.tmp")
+        metadata = {"config": json.dumps(config), REPACKED_METADATA_KEY: json.dumps({"fused_cache_key": key})}
+        try:
+            digest = hashlib.sha256()
+            save_safetensors(tmp_path, tensors, metadata, digest=digest)
+            record = {"size": tmp_path.stat().st_size, "sha256": digest.hexdigest()}
+            tmp_record = tmp_path.with_suffix(".json.tmp")
+            tmp_record.write_text(json.dumps(record))
+            tmp_record.replace(path.with_suffix(".json"))
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning("Could not cache fused weights in %s: %s", path, e)
+            return None
+        finally:
+            tmp_path.unlink(missing_ok=True)
+            tmp_path.with_suffix(".json.tmp").unlink(missing_ok=True)
+        logger.info("Cached fused weights in %s (%.2f GiB)", path, record["size"] / 1024**3)
+        self._evict(keep=key)
+        return str(path) if path.is_file() else None
+
+    def remove(self, key: str) -> None:
+        self._verified.pop(key, None)
+        self._path(key).unlink(missing_ok=True)
+        self._path(key).with_suffix(".json").unlink(missing_ok=True)
+
+    def used_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self._entries())
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def _entries(self) -> list[Path]:
+        if not self.cache_dir.is_dir():
+            return []
+        return sorted(self.cache_dir.glob("*.safetensors"), key=lambda path: path.stat().st_mtime)
+
+    def _evict(self, keep: str) -> None:
+        if self.max_bytes is None:
+            return
+        entries = self._entries()
+        used = sum(path.stat().st_size for path in entries)
+        # Least recently used first, the new entry last.
+        for path in sorted(entries, key=lambda entry: entry.stem == keep):
+            if used <= self.max_bytes:
+                return
+            size = path.stat().st_size
+            if path.stem == keep:
+                logger.warning("Fused weights (%.2f GiB) exceed the cache size cap, not caching them", size / 1024**3)
+            else:
+                logger.info("Evicting fused weight cache entry %s", path)
+            self.remove(path.stem)
+            used -= size
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.safetensors"
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(64 * 1024**2):
+            digest.update(chunk)
+    return digest.hexdigest()
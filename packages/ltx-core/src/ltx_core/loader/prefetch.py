@@ -0,0 +1,93 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import torch
+
+from ltx_core.loader.primitives import StateDict, StateDictLoader
+from ltx_core.loader.registry import DummyRegistry, Registry, state_dict_id
+from ltx_core.loader.sd_ops import SDOps
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def load_pinned_state_dict(loader: StateDictLoader, paths: list[str], sd_ops: SDOps | None) -> StateDict:
+    """
+    Load the state dict at ``paths`` into page-locked host memory, so copying it to a GPU is a single DMA.
+    Each tensor is pinned as soon as it is read, so only one of them is ever held twice.
+    """
+    sd = {}
+    size = 0
+    dtypes = set()
+    for key, value in loader.iter_tensors(paths, sd_ops, torch.device("cpu")):
+        sd[key] = value.pin_memory()
+        size += value.nbytes
+        dtypes.add(value.dtype)
+    return StateDict(sd=sd, device=torch.device("cpu"), size=size, dtype=dtypes)
+
+
+class StateDictPrefetcher(Registry):
+    """
+    Registry that reads state dicts ahead of time on a background thread.
+    :meth:`prefetch` schedules loading a state dict into host memory (page-locked when CUDA is available) while
+    the caller keeps computing. The next :meth:`get` for the same paths and sd_ops waits for the load and hands the
+    state dict over, so a builder using this registry only copies the weights to their device. Prefetched state
+    dicts are handed over once and then dropped; everything else is delegated to ``registry``.
+    Loads run one at a time, in the order they were scheduled, so prefetching does not split disk bandwidth.
+    ### Constructor parameters
+    registry:
+        Registry the state dicts that were not prefetched are stored in and looked up from.
+        Defaults to :class:`~ltx_core.loader.registry.DummyRegistry`.
+    pin_memory:
+        Whether prefetched tensors are page-locked. Defaults to ``torch.cuda.is_available()``.
+    """
+
+    def __init__(self, registry: Registry | None = None, pin_memory: bool | None = None):
+        self.registry = registry if registry is not None else DummyRegistry()
+        self.pin_memory = torch.cuda.is_available() if pin_memory is None else pin_memory
+        self._pending: dict[str, Future[StateDict]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ltx-prefetch")
+
+    def prefetch(self, paths: list[str], sd_ops: SDOps | None, loader: StateDictLoader) -> None:
+        """Start loading the state dict at ``paths`` with ``loader`` unless it is already pending or registered."""
+        sd_id = state_dict_id(paths, sd_ops)
+        with self._lock:
+            if sd_id in self._pending or self.registry.get(paths, sd_ops) is not None:
+                return
+            logger.info("Prefetching %s", ", ".join(paths))
+            self._pending[sd_id] = self._executor.submit(self._load, paths, sd_ops, loader)
+
+    def _load(self, paths: list[str], sd_ops: SDOps | None, loader: StateDictLoader) -> StateDict:
+        if self.pin_memory:
+            return load_pinned_state_dict(loader, paths, sd_ops)
+        return loader.load(paths, sd_ops=sd_ops, device=torch.device("cpu"))
+
+    def add(self, paths: list[str], sd_ops: SDOps | None, state_dict: StateDict) -> None:
+        self.registry.add(paths, sd_ops, state_dict)
+
+    def pop(self, paths: list[str], sd_ops: SDOps | None) -> StateDict | None:
+        return self.get(paths, sd_ops) or self.registry.pop(paths, sd_ops)
+
+    def get(self, paths: list[str], sd_ops: SDOps | None) -> StateDict | None:
+        with self._lock:
+            future = self._pending.pop(state_dict_id(paths, sd_ops), None)
+        if future is None:
+            return self.registry.get(paths, sd_ops)
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning("Prefetching %s failed, loading it again: %s", ", ".join(paths), e)
+            return None
+
+    def clear(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.cancel()
+        self.registry.clear()
+
+    def pending(self) -> int:
+        """Number of prefetched state dicts not handed over yet."""
+        with self._lock:
+            return len(self._pending)
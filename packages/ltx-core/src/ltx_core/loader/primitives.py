@@ -1,3 +1,4 @@
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from typing import NamedTuple, Protocol
 
@@ -34,6 +35,8 @@ class StateDictLoader(Protocol):
     Implementations must provide:
     - metadata: Extract model metadata from a single path
     - load: Load state dict from path(s) and apply SDOps transformations
+    - iter_tensors: Yield the tensors of path(s) one at a time, after SDOps transformations
+    - iter_routed_tensors: Like iter_tensors for several SDOps at once, reading path(s) a single time
     """
 
     def metadata(self, path: str) -> dict:
@@ -46,6 +49,21 @@ class StateDictLoader(Protocol):
         Load state dict from path or paths (for sharded model storage) and apply sd_ops
         """
 
+    def iter_tensors(
+        self, path: str | list[str], sd_ops: SDOps | None = None, device: torch.device | None = None
+    ) -> Iterator[tuple[str, torch.Tensor]]:
+        """
+        Yield the (key, tensor) pairs :meth:`load` would return one at a time, without holding them all
+        """
+
+    def iter_routed_tensors(
+        self, path: str | list[str], sd_ops: Sequence[SDOps | None], device: torch.device | None = None
+    ) -> Iterator[tuple[int, str, torch.Tensor]]:
+        """
+        Yield (index, key, tensor) for the tensors :meth:`iter_tensors` would yield with ``sd_ops[index]``,
+        reading path or paths once for all of them
+        """
+
 
 class ModelBuilderProtocol(Protocol[ModelType]):
     """
@@ -8,6 +8,16 @@ from ltx_core.loader.primitives import StateDict
 from ltx_core.loader.sd_ops import SDOps
 
 
+def state_dict_id(paths: list[str], sd_ops: SDOps | None) -> str:
+    """Identifier of the state dict loaded from ``paths`` with ``sd_ops``."""
+    m = hashlib.sha256()
+    parts = [str(Path(p).resolve()) for p in paths]
+    if sd_ops is not None:
+        parts.append(sd_ops.name)
+    m.update("\0".join(parts).encode("utf-8"))
+    return m.hexdigest()
+
+
 class Registry(Protocol):
     """
     Protocol for managing state dictionaries in a registry.
@@ -55,16 +65,8 @@ class StateDictRegistry(Registry):
     _state_dicts: dict[str, StateDict] = field(default_factory=dict)
     _lock: threading.Lock = field(default_factory=threading.Lock)
 
-    def _generate_id(self, paths: list[str], sd_ops: SDOps) -> str:
-        m = hashlib.sha256()
-        parts = [str(Path(p).resolve()) for p in paths]
-        if sd_ops is not None:
-            parts.append(sd_ops.name)
-        m.update("\0".join(parts).encode("utf-8"))
-        return m.hexdigest()
-
     def add(self, paths: list[str], sd_ops: SDOps | None, state_dict: StateDict) -> str:
-        sd_id = self._generate_id(paths, sd_ops)
+        sd_id = state_dict_id(paths, sd_ops)
         with self._lock:
             if sd_id in self._state_dicts:
                 raise ValueError(f"State dict retrieved from {paths} with {sd_ops} already added, check with get first")
@@ -73,11 +75,11 @@ class StateDictRegistry(Registry):
 
     def pop(self, paths: list[str], sd_ops: SDOps | None) -> StateDict | None:
         with self._lock:
-            return self._state_dicts.pop(self._generate_id(paths, sd_ops), None)
+            return self._state_dicts.pop(state_dict_id(paths, sd_ops), None)
 
     def get(self, paths: list[str], sd_ops: SDOps | None) -> StateDict | None:
         with self._lock:
-            return self._state_dicts.get(self._generate_id(paths, sd_ops), None)
+            return self._state_dicts.get(state_dict_id(paths, sd_ops), None)
 
     def clear(self) -> None:
         with self._lock:
@@ -0,0 +1,32 @@
+import json
+import logging
+from pathlib import Path
+
+import torch
+
+from ltx_core.loader.sft_loader import REPACKED_METADATA_KEY, save_safetensors
+from ltx_core.loader.single_gpu_model_builder import SingleGPUModelBuilder
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def repack_model(builder: SingleGPUModelBuilder, output_path: str | Path, dtype: torch.dtype | None = None) -> int:
+    """
+    Write the weights ``builder`` builds its model from to a single safetensors file, with the ``model_sd_ops``
+    key and value operations (e.g. FP8 downcasting) already applied and the weights converted to ``dtype`` as
+    ``builder.build(dtype=dtype)`` converts them. The file carries the model config, so ``output_path``
+    can replace ``builder.model_path``; loaders recognize it as repacked and skip the sd_ops, so later builds
+    read the weights as stored. LoRAs of ``builder`` are not applied. Returns the number of bytes written.
+    """
+    model_paths = list(builder.model_path) if isinstance(builder.model_path, tuple) else [builder.model_path]
+    config = builder.model_config()
+    layout = builder.model_loader.meta_tensors(model_paths, builder.model_sd_ops)
+    tensors = builder.model_loader.iter_tensors(model_paths, builder.model_sd_ops, torch.device("cpu"))
+    if dtype is not None:
+        layout = [(key, value.to(dtype=dtype)) for key, value in layout]
+        tensors = ((key, value.to(dtype=dtype)) for key, value in tensors)
+    repacked = {"sd_ops": getattr(builder.model_sd_ops, "name", None), "dtype": str(dtype) if dtype else None}
+    metadata = {"config": json.dumps(config), REPACKED_METADATA_KEY: json.dumps(repacked)}
+    nbytes = save_safetensors(output_path, layout, metadata, values=tensors)
+    logger.info("Repacked %.2f GiB into %s", nbytes / 1024**3, output_path)
+    return nbytes
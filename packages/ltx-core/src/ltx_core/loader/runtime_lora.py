@@ -0,0 +1,152 @@
+from collections.abc import Iterable, Mapping, Sequence
+from functools import partial
+
+import torch
+from torch.utils.hooks import RemovableHandle
+
+from ltx_core.loader.primitives import StateDict
+
+
+class RuntimeLoras:
+    """
+    LoRAs applied while a model runs instead of being fused into its weights.
+    Each adapter adds ``strength * B @ A @ x`` to the output of the linear layers it targets, computed from the
+    input of the layer in ``dtype``, so the base weights are never modified and may be FP8. Adapters can be added,
+    removed or re-weighted between forwards: this only moves the LoRA tensors and rebuilds small per-layer stacks,
+    without touching or reloading the model. The adapters of a layer are stacked along the rank, so any number of
+    them costs two matrix multiplications per layer; layers without adapters run unchanged.
+    With :meth:`set_sample_strengths`, every sample of a batch selects its own adapters and strengths: the stacked
+    products are computed once for the whole batch and scaled per sample, so one base model serves samples with
+    different LoRAs in a single forward.
+    ### Constructor parameters
+    model:
+        Model whose :class:`torch.nn.Linear` layers the adapters attach to. LoRA keys are matched against the
+        module names of this model, like in :func:`~ltx_core.loader.fuse_loras.apply_loras`.
+    device:
+        Device the LoRA tensors are kept on, the device the model computes on.
+    dtype:
+        Dtype the low-rank products are computed in.
+    """
+
+    def __init__(self, model: torch.nn.Module, device: torch.device, dtype: torch.dtype = torch.bfloat16):
+        self.model = model
+        self.device = torch.device(device)
+        self.dtype = dtype
+        self._linears = {name: m for name, m in model.named_modules() if isinstance(m, torch.nn.Linear)}
+        self._adapters: dict[str, dict[str, tuple[torch.Tensor, torch.Tensor]]] = {}
+        self._strengths: dict[str, float] = {}
+        self._sample_strengths: list[dict[str, float]] | None = None
+        self._stacks: dict[str, tuple[torch.Tensor, torch.Tensor, torch.Tensor]] = {}
+        self._hooks: dict[str, RemovableHandle] = {}
+
+    @property
+    def strengths(self) -> dict[str, float]:
+        """Strength of every attached adapter, by name."""
+        return dict(self._strengths)
+
+    @property
+    def sample_strengths(self) -> list[dict[str, float]] | None:
+        """Adapter strengths of every sample set by :meth:`set_sample_strengths`, or ``None``."""
+        return None if self._sample_strengths is None else [dict(sample) for sample in self._sample_strengths]
+
+    def add(self, name: str, lora: StateDict, strength: float = 1.0) -> None:
+        """Attach the LoRA state dict ``lora`` (``<module>.lora_A.weight`` and ``.lora_B.weight`` keys) as ``name``."""
+        if name in self._adapters:
+            raise ValueError(f"A LoRA named {name!r} is already attached")
+        layers = {}
+        for key, down in lora.sd.items():
+            if not key.endswith(".lora_A.weight"):
+                continue
+            module_name = key[: -len(".lora_A.weight")]
+            up = lora.sd.get(f"{module_name}.lora_B.weight")
+            if up is None or module_name not in self._linears:
+                continue
+            layers[module_name] = (
+                down.to(device=self.device, dtype=self.dtype),
+                up.to(device=self.device, dtype=self.dtype),
+            )
+        if not layers:
+            raise ValueError(f"LoRA {name!r} targets no linear layer of the model")
+        self._adapters[name] = layers
+        self._strengths[name] = strength
+        self._restack(layers)
+
+    def remove(self, name: str) -> None:
+        """Detach the adapter ``name``."""
+        layers = self._adapter(name)
+        del self._adapters[name]
+        del self._strengths[name]
+        self._restack(layers)
+
+    def set_strength(self, name: str, strength: float) -> None:
+        """Re-weight the adapter ``name`` for all samples, unless they have their own strengths."""
+        layers = self._adapter(name)
+        self._strengths[name] = strength
+        self._restack(layers)
+
+    def set_sample_strengths(self, strengths: Sequence[Mapping[str, float]] | None) -> None:
+        """
+        Give every sample of the batch its own adapter strengths: ``strengths[i]`` maps adapter names to their
+        strength for sample ``i``, and adapters it omits are off for that sample. A batch stacking several passes
+        over the same samples (e.g. batched guidance passes) repeats them, so its size must be a multiple of
+        ``len(strengths)``. ``None`` goes back to the strengths shared by all samples.
+        """
+        if strengths is not None:
+            unknown = {name for sample in strengths for name in sample} - self._adapters.keys()
+            if unknown:
+                raise ValueError(f"No LoRAs named {sorted(unknown)} are attached")
+            if not strengths:
+                raise ValueError("Per-sample LoRA strengths need at least one sample")
+            strengths = [dict(sample) for sample in strengths]
+        self._sample_strengths = strengths
+        self._restack(set().union(*self._adapters.values()))
+
+    def clear(self) -> None:
+        """Detach every adapter."""
+        for name in list(self._adapters):
+            self.remove(name)
+
+    def _adapter(self, name: str) -> dict[str, tuple[torch.Tensor, torch.Tensor]]:
+        if name not in self._adapters:
+            raise ValueError(f"No LoRA named {name!r} is attached")
+        return self._adapters[name]
+
+    def _scales(self, name: str, rank: int) -> torch.Tensor:
+        if self._sample_strengths is None:
+            strengths = [self._strengths[name]]
+        else:
+            strengths = [sample.get(name, 0.0) for sample in self._sample_strengths]
+        return torch.tensor(strengths, device=self.device, dtype=self.dtype)[:, None].expand(-1, rank)
+
+    def _restack(self, module_names: Iterable[str]) -> None:
+        for module_name in module_names:
+            downs, ups, scales = [], [], []
+            for name, layers in self._adapters.items():
+                if module_name not in layers:
+                    continue
+                down, up = layers[module_name]
+                downs.append(down)
+                ups.append(up)
+                scales.append(self._scales(name, down.shape[0]))
+            if not downs:
+                self._stacks.pop(module_name, None)
+                self._hooks.pop(module_name).remove()
+                continue
+            self._stacks[module_name] = (torch.cat(downs), torch.cat(ups, dim=1), torch.cat(scales, dim=1))
+            if module_name not in self._hooks:
+                hook = partial(self._add_lora_output, module_name)
+                self._hooks[module_name] = self._linears[module_name].register_forward_hook(hook)
+
+    def _add_lora_output(
+        self, module_name: str, _module: torch.nn.Module, args: tuple, output: torch.Tensor
+    ) -> torch.Tensor:
+        down, up, scales = self._stacks[module_name]
+        hidden = torch.nn.functional.linear(args[0].to(self.dtype), down)
+        if len(scales) > 1:
+            # Per-sample strengths, repeated for every pass over the samples stacked in the batch.
+            batch = hidden.shape[0]
+            if batch % len(scales):
+                raise ValueError(f"Batch of {batch} is not a multiple of the {len(scales)} samples with LoRA strengths")
+            scales = scales.repeat(batch // len(scales), 1).view(batch, *[1] * (hidden.ndim - 2), -1)
+        hidden = hidden * scales
+        return output + torch.nn.functional.linear(hidden, up).to(output.dtype)
@@ -1,4 +1,13 @@
+import hashlib
 import json
+import logging
+import struct
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 
 import safetensors
 import torch
@@ -6,6 +15,97 @@ import torch
 from ltx_core.loader.primitives import StateDict, StateDictLoader
 from ltx_core.loader.sd_ops import SDOps
 
+logger: logging.Logger = logging.getLogger(__name__)
+
+SAFETENSORS_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "F8_E4M3": torch.float8_e4m3fn,
+    "F8_E5M2": torch.float8_e5m2,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+_SAFETENSORS_DTYPE_NAMES = {dtype: name for name, dtype in SAFETENSORS_DTYPES.items()}
+
+REPACKED_METADATA_KEY = "ltx_repacked"
+"""
+Metadata key marking safetensors files whose tensors have their final keys and values, e.g. written by
+:func:`~ltx_core.loader.repack.repack_model`. Loaders do not apply sd_ops to them.
+"""
+
+
+def save_safetensors(
+    path: str | Path,
+    tensors: Sequence[tuple[str, torch.Tensor]],
+    metadata: dict[str, str] | None = None,
+    values: Iterable[tuple[str, torch.Tensor]] | None = None,
+    digest: "hashlib._Hash | None" = None,
+) -> int:
+    """
+    Write ``tensors`` to a safetensors file at ``path`` in a single pass: the header is built up front from their
+    shapes and dtypes, then the data is streamed in one tensor at a time, each copied to the CPU only while it is
+    written. ``tensors`` may be meta tensors when ``values`` yields their data, e.g. read from a checkpoint; each
+    value is written at the offset of its key, in whatever order they come. ``digest`` (e.g. ``hashlib.sha256()``)
+    is updated with the bytes of the file as they are written, which requires the values in the order of
+    ``tensors``. ``path`` is replaced once the file is complete. Returns the number of bytes of tensor data.
+    """
+    path = Path(path)
+    partial_path = path.with_name(f"{path.name}.tmp")
+    header: dict[str, dict] = {}
+    offset = 0
+    for key, tensor in tensors:
+        nbytes = tensor.numel() * tensor.element_size()
+        header[key] = {
+            "dtype": _SAFETENSORS_DTYPE_NAMES[tensor.dtype],
+            "shape": list(tensor.shape),
+            "data_offsets": [offset, offset + nbytes],
+        }
+        offset += nbytes
+    layout = dict(header)
+    if metadata:
+        header["__metadata__"] = metadata
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    # Pad the header so that the tensor data starts 8-byte aligned.
+    header_bytes += b" " * (-len(header_bytes) % 8)
+    data_start = 8 + len(header_bytes)
+    try:
+        with open(partial_path, "wb") as out:
+            for chunk in (struct.pack("<Q", len(header_bytes)), header_bytes):
+                out.write(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+            for key, value in tensors if values is None else values:
+                info = layout.pop(key, None)
+                if (
+                    info is None
+                    or list(value.shape) != info["shape"]
+                    or value.dtype != SAFETENSORS_DTYPES[info["dtype"]]
+                ):
+                    raise ValueError(
+                        f"Tensor {key} ({value.dtype}, {list(value.shape)}) is not in the header of {path}"
+                    )
+                if out.tell() != data_start + info["data_offsets"][0]:
+                    if digest is not None:
+                        raise ValueError(f"Tensor {key} is out of order, the digest of {path} needs them in order")
+                    out.seek(data_start + info["data_offsets"][0])
+                raw = memoryview(value.detach().to("cpu").contiguous().reshape(-1).view(torch.uint8).numpy())
+                out.write(raw)
+                if digest is not None:
+                    digest.update(raw)
+        if layout:
+            raise ValueError(f"No data for tensors {sorted(layout)} of {path}")
+        partial_path.replace(path)
+    finally:
+        partial_path.unlink(missing_ok=True)
+    return offset
+
 
 class SafetensorsStateDictLoader(StateDictLoader):
     """
@@ -25,24 +125,236 @@ class SafetensorsStateDictLoader(StateDictLoader):
         size = 0
         dtype = set()
         device = device or torch.device("cpu")
+        for key, value in self.iter_tensors(path, sd_ops, device):
+            size += value.nbytes
+            dtype.add(value.dtype)
+            sd[key] = value
+
+        return StateDict(sd=sd, device=device, size=size, dtype=dtype)
+
+    def iter_tensors(
+        self, path: str | list[str], sd_ops: SDOps | None = None, device: torch.device | None = None
+    ) -> Iterator[tuple[str, torch.Tensor]]:
+        """
+        Yield the tensors of path or paths after sd_ops one at a time, read from the memory-mapped files.
+        Only the yielded tensor is materialized on ``device`` (CPU by default), so consumers that place each
+        tensor before asking for the next one never hold more than one tensor in addition to their own copies.
+        """
+        for _, key, value in self.iter_routed_tensors(path, [sd_ops], device):
+            yield key, value
+
+    def meta_tensors(self, path: str | list[str], sd_ops: SDOps | None = None) -> list[tuple[str, torch.Tensor]]:
+        """
+        The keys, dtypes and shapes of the tensors :meth:`iter_tensors` yields, as meta tensors computed from the
+        file headers without reading any tensor data.
+        """
+        model_paths = path if isinstance(path, list) else [path]
+        tensors = []
+        for shard_path in model_paths:
+            header, _ = read_safetensors_header(shard_path)
+            shard_ops = _shard_sd_ops([sd_ops], header.get("__metadata__"))
+            for name, info in header.items():
+                if name == "__metadata__":
+                    continue
+                routes = _routes(name, shard_ops)
+                if not routes:
+                    continue
+                value = torch.empty(info["shape"], dtype=SAFETENSORS_DTYPES[info["dtype"]], device="meta")
+                tensors.extend((key, meta) for _, key, meta in _apply_routes(routes, shard_ops, value))
+        return tensors
+
+    def iter_routed_tensors(
+        self, path: str | list[str], sd_ops: Sequence[SDOps | None], device: torch.device | None = None
+    ) -> Iterator[tuple[int, str, torch.Tensor]]:
+        """
+        Yield ``(index, key, tensor)`` for every tensor of path or paths kept by ``sd_ops[index]``, reading the
+        files once for all of them. A tensor kept by several sd_ops is read once and routed to each of them,
+        as a copy for all but the first so that no two consumers share storage. Repacked files already hold
+        final keys and values, so their tensors are routed to every sd_ops without applying them.
+        """
+        device = device or torch.device("cpu")
         model_paths = path if isinstance(path, list) else [path]
         for shard_path in model_paths:
             with safetensors.safe_open(shard_path, framework="pt", device=str(device)) as f:
+                shard_ops = _shard_sd_ops(sd_ops, f.metadata())
                 safetensor_keys = f.keys()
                 for name in safetensor_keys:
-                    expected_name = name if sd_ops is None else sd_ops.apply_to_key(name)
-                    if expected_name is None:
+                    routes = _routes(name, shard_ops)
+                    if not routes:
                         continue
                     value = f.get_tensor(name).to(device=device, non_blocking=True, copy=False)
-                    key_value_pairs = ((expected_name, value),)
-                    if sd_ops is not None:
-                        key_value_pairs = sd_ops.apply_to_key_value(expected_name, value)
-                    for key, value in key_value_pairs:
-                        size += value.nbytes
-                        dtype.add(value.dtype)
-                        sd[key] = value
+                    yield from _apply_routes(routes, shard_ops, value)
+
+
+def _shard_sd_ops(sd_ops: Sequence[SDOps | None], metadata: dict[str, str] | None) -> Sequence[SDOps | None]:
+    """The sd_ops to apply to a file with ``metadata``: none for repacked files."""
+    if metadata and REPACKED_METADATA_KEY in metadata:
+        return [None] * len(sd_ops)
+    return sd_ops
+
+
+def _routes(name: str, sd_ops: Sequence[SDOps | None]) -> tuple[tuple[int, str], ...]:
+    """The ``(index, key)`` pairs of the sd_ops keeping the tensor stored as ``name``."""
+    keys = ((index, name if ops is None else ops.apply_to_key(name)) for index, ops in enumerate(sd_ops))
+    return tuple((index, key) for index, key in keys if key is not None)
 
-        return StateDict(sd=sd, device=device, size=size, dtype=dtype)
+
+def _apply_routes(
+    routes: tuple[tuple[int, str], ...], sd_ops: Sequence[SDOps | None], value: torch.Tensor
+) -> Iterator[tuple[int, str, torch.Tensor]]:
+    for position, (index, key) in enumerate(routes):
+        routed = value if position == 0 else value.clone()
+        if sd_ops[index] is None:
+            yield index, key, routed
+            continue
+        for new_key, new_value in sd_ops[index].apply_to_key_value(key, routed):
+            yield index, new_key, new_value
+
+
+@dataclass(frozen=True)
+class _TensorEntry:
+    name: str
+    routes: tuple[tuple[int, str], ...]
+    dtype: torch.dtype
+    shape: tuple[int, ...]
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class _ReadTask:
+    """Tensors stored contiguously in one file, read with a single call, and the sd_ops applied to that file."""
+
+    path: str
+    entries: tuple[_TensorEntry, ...]
+    sd_ops: tuple[SDOps | None, ...]
+
+    @property
+    def start(self) -> int:
+        return self.entries[0].start
+
+    @property
+    def nbytes(self) -> int:
+        return self.entries[-1].end - self.entries[0].start
+
+
+def read_safetensors_header(path: str) -> tuple[dict, int]:
+    """The JSON header of a safetensors file and the file offset its tensor data starts at."""
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+    return header, 8 + header_size
+
+
+class ParallelSafetensorsStateDictLoader(SafetensorsStateDictLoader):
+    """
+    Loads weights from safetensors files with a pool of reader threads, so NVMe drives and network filesystems
+    serve several reads at once instead of one tensor at a time.
+    The tensors kept by ``sd_ops`` are planned from the file headers: tensors stored next to each other are
+    coalesced into reads of about ``read_size`` bytes, larger tensors are read on their own, and the reads of
+    different shards are interleaved. File reads release the GIL, so the threads read concurrently. Tensors are
+    yielded in plan order with at most two reads per worker in flight, which bounds the memory held by
+    :meth:`iter_tensors`. The achieved throughput is logged once all tensors were read.
+    ### Constructor parameters
+    max_workers:
+        Number of reader threads.
+    read_size:
+        Target size in bytes of a coalesced read.
+    """
+
+    def __init__(self, max_workers: int = 8, read_size: int = 64 * 1024**2):
+        self.max_workers = max_workers
+        self.read_size = read_size
+
+    def iter_routed_tensors(
+        self, path: str | list[str], sd_ops: Sequence[SDOps | None], device: torch.device | None = None
+    ) -> Iterator[tuple[int, str, torch.Tensor]]:
+        device = device or torch.device("cpu")
+        model_paths = path if isinstance(path, list) else [path]
+        tasks = self._plan(model_paths, sd_ops)
+        started = time.perf_counter()
+        total_bytes = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ltx-load") as executor:
+            pending: deque[Future[list[tuple[int, str, torch.Tensor]]]] = deque()
+            for task in tasks:
+                pending.append(executor.submit(self._read, task, device))
+                total_bytes += task.nbytes
+                if len(pending) >= 2 * self.max_workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Read %.2f GiB from %d file(s) in %.2f s (%.2f GiB/s, %d workers)",
+            total_bytes / 1024**3,
+            len(model_paths),
+            elapsed,
+            total_bytes / 1024**3 / max(elapsed, 1e-9),
+            self.max_workers,
+        )
+
+    def _plan(self, model_paths: list[str], sd_ops: Sequence[SDOps | None]) -> list[_ReadTask]:
+        shard_tasks = []
+        for shard_path in model_paths:
+            header, data_start = read_safetensors_header(shard_path)
+            shard_ops = tuple(_shard_sd_ops(sd_ops, header.get("__metadata__")))
+            entries = []
+            for name, info in header.items():
+                if name == "__metadata__":
+                    continue
+                routes = _routes(name, shard_ops)
+                if not routes:
+                    continue
+                start, end = info["data_offsets"]
+                entries.append(
+                    _TensorEntry(
+                        name,
+                        routes,
+                        SAFETENSORS_DTYPES[info["dtype"]],
+                        tuple(info["shape"]),
+                        data_start + start,
+                        data_start + end,
+                    )
+                )
+            entries.sort(key=lambda entry: entry.start)
+            tasks: list[_ReadTask] = []
+            group: list[_TensorEntry] = []
+            for entry in entries:
+                contiguous = group and group[-1].end == entry.start
+                if group and (not contiguous or entry.end - group[0].start > self.read_size):
+                    tasks.append(_ReadTask(shard_path, tuple(group), shard_ops))
+                    group = []
+                group.append(entry)
+            if group:
+                tasks.append(_ReadTask(shard_path, tuple(group), shard_ops))
+            shard_tasks.append(tasks)
+        # Interleave the shards, so that several files are read at once.
+        return [task for round_tasks in _round_robin(shard_tasks) for task in round_tasks]
+
+    def _read(self, task: _ReadTask, device: torch.device) -> list[tuple[int, str, torch.Tensor]]:
+        buffer = torch.empty(task.nbytes, dtype=torch.uint8)
+        with open(task.path, "rb", buffering=0) as f:
+            f.seek(task.start)
+            view = memoryview(buffer.numpy())
+            read = 0
+            while read < task.nbytes:
+                count = f.readinto(view[read:])
+                if not count:
+                    raise OSError(f"Unexpected end of file while reading {task.path}")
+                read += count
+        tensors = []
+        for entry in task.entries:
+            raw = buffer[entry.start - task.start : entry.end - task.start]
+            if (entry.start - task.start) % entry.dtype.itemsize:
+                raw = raw.clone()  # Unaligned in the read buffer: copy before viewing as the wider dtype.
+            value = raw.view(entry.dtype).reshape(entry.shape).to(device=device)
+            tensors.extend(_apply_routes(entry.routes, task.sd_ops, value))
+        return tensors
+
+
+def _round_robin(shard_tasks: list[list[_ReadTask]]) -> Iterator[list[_ReadTask]]:
+    for index in range(max((len(tasks) for tasks in shard_tasks), default=0)):
+        yield [tasks[index] for tasks in shard_tasks if index < len(tasks)]
 
 
 class SafetensorsModelStateDictLoader(StateDictLoader):
@@ -61,3 +373,16 @@ class SafetensorsModelStateDictLoader(StateDictLoader):
 
     def load(self, path: str | list[str], sd_ops: SDOps | None = None, device: torch.device | None = None) -> StateDict:
         return self.weight_loader.load(path, sd_ops, device)
+
+    def iter_tensors(
+        self, path: str | list[str], sd_ops: SDOps | None = None, device: torch.device | None = None
+    ) -> Iterator[tuple[str, torch.Tensor]]:
+        return self.weight_loader.iter_tensors(path, sd_ops, device)
+
+    def meta_tensors(self, path: str | list[str], sd_ops: SDOps | None = None) -> list[tuple[str, torch.Tensor]]:
+        return self.weight_loader.meta_tensors(path, sd_ops)
+
+    def iter_routed_tensors(
+        self, path: str | list[str], sd_ops: Sequence[SDOps | None], device: torch.device | None = None
+    ) -> Iterator[tuple[int, str, torch.Tensor]]:
+        return self.weight_loader.iter_routed_tensors(path, sd_ops, device)
@@ -1,10 +1,12 @@
 import logging
+from collections.abc import Sequence
 from dataclasses import dataclass, field, replace
 from typing import Generic
 
 import torch
 
 from ltx_core.loader.fuse_loras import apply_loras
+from ltx_core.loader.fused_cache import FusedWeightCache, fused_weights_key
 from ltx_core.loader.module_ops import ModuleOps
 from ltx_core.loader.primitives import (
     LoRAAdaptableProtocol,
@@ -26,6 +28,8 @@ logger: logging.Logger = logging.getLogger(__name__)
 class SingleGPUModelBuilder(Generic[ModelType], ModelBuilderProtocol[ModelType], LoRAAdaptableProtocol):
     """
     Builder for PyTorch models residing on a single GPU.
+    With a ``fused_cache``, models built with LoRAs are stored in it once fused, and later builds with the same
+    checkpoint, LoRAs, strengths, dtype and device type load the fused weights from it instead of fusing again.
     """
 
     model_class_configurator: type[ModelConfigurator[ModelType]]
@@ -35,6 +39,7 @@ class SingleGPUModelBuilder(Generic[ModelType], ModelBuilderProtocol[ModelType],
     loras: tuple[LoraPathStrengthAndSDOps, ...] = field(default_factory=tuple)
     model_loader: StateDictLoader = field(default_factory=SafetensorsModelStateDictLoader)
     registry: Registry = field(default_factory=DummyRegistry)
+    fused_cache: FusedWeightCache | None = None
 
     def lora(self, lora_path: str, strength: float = 1.0, sd_ops: SDOps | None = None) -> "SingleGPUModelBuilder":
         return replace(self, loras=(*self.loras, LoraPathStrengthAndSDOps(lora_path, strength, sd_ops)))
@@ -71,31 +76,157 @@ class SingleGPUModelBuilder(Generic[ModelType], ModelBuilderProtocol[ModelType],
 
     def build(self, device: torch.device | None = None, dtype: torch.dtype | None = None) -> ModelType:
         device = torch.device("cuda") if device is None else device
+        if self._uses_fused_cache():
+            return self._build_fused_cached(device, dtype)
         config = self.model_config()
         meta_model = self.meta_model(config, self.module_ops)
         model_paths = list(self.model_path) if isinstance(self.model_path, tuple) else [self.model_path]
+        if isinstance(self.registry, DummyRegistry):
+            # Nothing keeps the state dict: materialize the weights one at a time instead.
+            return self._build_streamed(meta_model, model_paths, device, dtype)
         model_state_dict = self.load_sd(model_paths, sd_ops=self.model_sd_ops, registry=self.registry, device=device)
 
-        lora_strengths = [lora.strength for lora in self.loras]
-        if not lora_strengths or (min(lora_strengths) == 0 and max(lora_strengths) == 0):
+        lora_sd_and_strengths = self._lora_sd_and_strengths(device)
+        if not lora_sd_and_strengths:
             sd = model_state_dict.sd
             if dtype is not None:
                 sd = {key: value.to(dtype=dtype) for key, value in model_state_dict.sd.items()}
             meta_model.load_state_dict(sd, strict=False, assign=True)
             return self._return_model(meta_model, device)
 
+        destination_sd = None
+        if model_state_dict.device != device:
+            # Fuse on the device the model runs on (e.g. with FP8 stochastic rounding on CUDA), not on the host a
+            # prefetching registry hands state dicts over from. The device copy is ours, so fuse into it.
+            model_state_dict = _state_dict_to(model_state_dict, device)
+            destination_sd = model_state_dict
+        final_sd = apply_loras(
+            model_sd=model_state_dict,
+            lora_sd_and_strengths=lora_sd_and_strengths,
+            dtype=dtype,
+            destination_sd=destination_sd,
+        )
+        sd = final_sd.sd
+        if destination_sd is not None and dtype is not None:
+            sd = {key: value.to(dtype=dtype) for key, value in sd.items()}
+        meta_model.load_state_dict(sd, strict=False, assign=True)
+        return self._return_model(meta_model, device)
+
+    def _uses_fused_cache(self) -> bool:
+        return self.fused_cache is not None and any(lora.strength != 0 for lora in self.loras)
+
+    def _build_fused_cached(self, device: torch.device, dtype: torch.dtype | None) -> ModelType:
+        model_paths = list(self.model_path) if isinstance(self.model_path, tuple) else [self.model_path]
+        key = fused_weights_key(model_paths, self.model_sd_ops, self.loras, dtype, device)
+        uncached = replace(self, fused_cache=None)
+        cached_path = self.fused_cache.get(key)
+        if cached_path is not None:
+            logger.info("Loading LoRA-fused weights from %s", cached_path)
+            return replace(uncached, model_path=cached_path, loras=()).build(device, dtype)
+        model = uncached.build(device, dtype)
+        self.fused_cache.put(key, model, self.model_config())
+        return model
+
+    def _lora_sd_and_strengths(self, device: torch.device) -> list[LoraStateDictWithStrength]:
+        lora_strengths = [lora.strength for lora in self.loras]
+        if not lora_strengths or (min(lora_strengths) == 0 and max(lora_strengths) == 0):
+            return []
         lora_state_dicts = [
             self.load_sd([lora.path], sd_ops=lora.sd_ops, registry=self.registry, device=device) for lora in self.loras
         ]
-        lora_sd_and_strengths = [
+        return [
             LoraStateDictWithStrength(sd, strength)
             for sd, strength in zip(lora_state_dicts, lora_strengths, strict=True)
         ]
-        final_sd = apply_loras(
-            model_sd=model_state_dict,
-            lora_sd_and_strengths=lora_sd_and_strengths,
-            dtype=dtype,
-            destination_sd=model_state_dict if isinstance(self.registry, DummyRegistry) else None,
-        )
-        meta_model.load_state_dict(final_sd.sd, strict=False, assign=True)
+
+    def _build_streamed(
+        self, meta_model: ModelType, model_paths: list[str], device: torch.device, dtype: torch.dtype | None
+    ) -> ModelType:
+        """
+        Materialize the weights of ``meta_model`` one tensor at a time, read from the memory-mapped checkpoint
+        straight to their final dtype and device (LoRAs fused on the way), so loading never holds a full state
+        dict or a dtype-converted copy of it.
+        """
+        target = _StreamedModel(meta_model, self._lora_sd_and_strengths(device), dtype)
+        for key, loaded in self.model_loader.iter_tensors(model_paths, self.model_sd_ops, device):
+            target.assign(key, loaded)
         return self._return_model(meta_model, device)
+
+
+def _state_dict_to(state_dict: StateDict, device: torch.device) -> StateDict:
+    sd = {key: value.to(device=device, non_blocking=True) for key, value in state_dict.sd.items()}
+    return StateDict(sd, device, state_dict.size, state_dict.dtype)
+
+
+class _StreamedModel:
+    """Assigns tensors read from a checkpoint to the parameters and buffers of a meta model."""
+
+    def __init__(
+        self,
+        meta_model: torch.nn.Module,
+        lora_sd_and_strengths: list[LoraStateDictWithStrength],
+        dtype: torch.dtype | None,
+    ):
+        self.meta_model = meta_model
+        self.lora_sd_and_strengths = lora_sd_and_strengths
+        self.dtype = dtype
+        self.parameters = dict(meta_model.named_parameters(remove_duplicate=False))
+        self.buffers = dict(meta_model.named_buffers(remove_duplicate=False))
+
+    def assign(self, key: str, loaded: torch.Tensor) -> None:
+        if key not in self.parameters and key not in self.buffers:
+            return
+        expected = self.parameters[key] if key in self.parameters else self.buffers[key]
+        if loaded.shape != expected.shape:
+            raise RuntimeError(
+                f"Error(s) in loading state_dict for {type(self.meta_model).__name__}:\n\tsize mismatch for {key}: "
+                f"copying a param with shape {loaded.shape} from checkpoint, "
+                f"the shape in current model is {expected.shape}."
+            )
+        value = loaded
+        if self.lora_sd_and_strengths:
+            tensor_sd = StateDict({key: loaded}, loaded.device, loaded.nbytes, {loaded.dtype})
+            value = apply_loras(tensor_sd, self.lora_sd_and_strengths, self.dtype).sd[key]
+        elif self.dtype is not None:
+            value = loaded.to(dtype=self.dtype)
+        module_name, _, name = key.rpartition(".")
+        module = self.meta_model.get_submodule(module_name)
+        if key in self.parameters:
+            module._parameters[name] = torch.nn.Parameter(value, requires_grad=self.parameters[key].requires_grad)
+        else:
+            module._buffers[name] = value
+
+
+def build_models(
+    builds: Sequence[tuple[SingleGPUModelBuilder, torch.device, torch.dtype | None]],
+) -> list[torch.nn.Module]:
+    """
+    Build several models, each given as ``(builder, device, dtype)`` and built like ``builder.build(device,
+    dtype)``, reading checkpoint files shared by several of them only once. Builders without a registry that
+    share their model path, loader and device are built in a single pass over the checkpoint: its header is
+    parsed once and every tensor is routed to each model whose ``model_sd_ops`` keeps it. The other builders,
+    including the ones loading or storing LoRA-fused weights in a ``fused_cache``, are built on their own.
+    Returns the models in the order of ``builds``.
+    """
+    models: list[torch.nn.Module | None] = [None] * len(builds)
+    passes: dict[tuple, list[int]] = {}
+    for index, (builder, device, dtype) in enumerate(builds):
+        if isinstance(builder.registry, DummyRegistry) and not builder._uses_fused_cache():
+            model_paths = builder.model_path if isinstance(builder.model_path, tuple) else (builder.model_path,)
+            passes.setdefault((model_paths, id(builder.model_loader), torch.device(device)), []).append(index)
+        else:
+            models[index] = builder.build(device=device, dtype=dtype)
+
+    for (model_paths, _, device), indices in passes.items():
+        targets = []
+        for index in indices:
+            builder, _, dtype = builds[index]
+            meta_model = builder.meta_model(builder.model_config(), builder.module_ops)
+            targets.append(_StreamedModel(meta_model, builder._lora_sd_and_strengths(device), dtype))
+        loader = builds[indices[0]][0].model_loader
+        sd_ops = [builds[index][0].model_sd_ops for index in indices]
+        for position, key, loaded in loader.iter_routed_tensors(list(model_paths), sd_ops, device):
+            targets[position].assign(key, loaded)
+        for index, target in zip(indices, targets, strict=True):
+            models[index] = builds[index][0]._return_model(target.meta_model, device)
+    return models
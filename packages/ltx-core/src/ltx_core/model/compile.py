@@ -0,0 +1,146 @@
+import logging
+import os
+import weakref
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+import torch
+
+from ltx_core.model.audio_vae import Vocoder
+from ltx_core.model.transformer.model import LTXModel
+from ltx_core.model.video_vae import VideoDecoder
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+ModuleT = TypeVar("ModuleT", bound=torch.nn.Module)
+
+# Submodules of a transformer block compiled by :func:`compile_transformer_`.
+TRANSFORMER_BLOCK_REGIONS = (
+    "attn1",
+    "attn2",
+    "audio_attn1",
+    "audio_attn2",
+    "audio_to_video_attn",
+    "video_to_audio_attn",
+    "ff",
+    "audio_ff",
+)
+# Compiled graphs kept per region: one per module configuration (e.g. video/audio attention, with or without
+# cached keys/values) and per specialization of a dynamic dim to size 1.
+RECOMPILE_LIMIT = 32
+
+
+class CompiledForward:
+    """
+    Forward of a module compiled with ``torch.compile``, falling back to the eager forward if compiling fails.
+    Before each call, ``dynamic_dims`` of every tensor argument (including tensors in tuple arguments) are marked
+    dynamic, so inputs whose sizes vary along them (batch, tokens, frames) share one compiled graph instead of
+    compiling one per shape. Dims of size 1 are still specialized, which costs at most one more graph per dim.
+    The function is compiled per module class, so modules of the same class and configuration (e.g. the attention
+    of every transformer block) share their compiled graphs. The module is only referenced weakly, so installing
+    the forward on it does not create a reference cycle keeping it alive.
+    ### Constructor parameters
+    module:
+        Module whose forward is compiled.
+    dynamic_dims:
+        Dims marked dynamic on tensor arguments; negative dims count from the last one. Dims a tensor does not
+        have are skipped.
+    backend:
+        ``torch.compile`` backend.
+    mode:
+        ``torch.compile`` mode, e.g. ``"max-autotune-no-cudagraphs"``.
+    """
+
+    def __init__(
+        self,
+        module: torch.nn.Module,
+        dynamic_dims: tuple[int, ...],
+        backend: str | Callable = "inductor",
+        mode: str | None = None,
+    ):
+        self._module = weakref.ref(module)
+        self.dynamic_dims = dynamic_dims
+        self.eager = type(module).forward
+        self.compiled = torch.compile(self.eager, backend=backend, mode=mode)
+        self.failed = False
+
+    @property
+    def module(self) -> torch.nn.Module:
+        return self._module()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        module = self.module
+        if self.failed:
+            return self.eager(module, *args, **kwargs)
+        for value in (*args, *kwargs.values()):
+            _mark_dynamic(value, self.dynamic_dims)
+        try:
+            return self.compiled(module, *args, **kwargs)
+        except torch._dynamo.exc.TorchDynamoException as e:
+            logger.warning("Compiling %s failed, running it eagerly: %s", type(module).__name__, e)
+            self.failed = True
+            return self.eager(module, *args, **kwargs)
+
+
+def _mark_dynamic(value: object, dims: tuple[int, ...]) -> None:
+    if isinstance(value, tuple):
+        for item in value:
+            _mark_dynamic(item, dims)
+    elif isinstance(value, torch.Tensor):
+        for dim in dims:
+            if -value.ndim <= dim < value.ndim:
+                torch._dynamo.maybe_mark_dynamic(value, dim % value.ndim)
+
+
+def compile_module_(
+    module: ModuleT,
+    dynamic_dims: tuple[int, ...],
+    backend: str | Callable = "inductor",
+    mode: str | None = None,
+) -> ModuleT:
+    """Compile the forward of ``module`` in place (see :class:`CompiledForward`)."""
+    torch._dynamo.config.recompile_limit = max(torch._dynamo.config.recompile_limit, RECOMPILE_LIMIT)
+    module.forward = CompiledForward(module, dynamic_dims, backend, mode)
+    return module
+
+
+def compile_transformer_(model: LTXModel, backend: str | Callable = "inductor", mode: str | None = None) -> LTXModel:
+    """
+    Compile the attention and feed-forward modules of every transformer block in place, fusing the q/k norms,
+    rotary embeddings and projections of attention and the activation of the feed-forward.
+    The blocks themselves stay eager: their perturbation handling branches on the block index, so compiling them
+    would compile every block separately. The batch and token dims are dynamic, so the graphs are shared by all
+    blocks, resolutions, frame counts and guidance batch sizes.
+    """
+    for block in model.transformer_blocks:
+        for name in TRANSFORMER_BLOCK_REGIONS:
+            region = getattr(block, name, None)
+            if region is not None:
+                compile_module_(region, (0, -2), backend, mode)
+    return model
+
+
+def compile_video_decoder_(
+    decoder: VideoDecoder, backend: str | Callable = "inductor", mode: str | None = None
+) -> VideoDecoder:
+    """Compile the video decoder in place, with dynamic frame, height and width dims (tiles of any size)."""
+    return compile_module_(decoder, (-3, -2, -1), backend, mode)
+
+
+def compile_vocoder_(vocoder: Vocoder, backend: str | Callable = "inductor", mode: str | None = None) -> Vocoder:
+    """Compile the vocoder in place, with a dynamic time dim."""
+    return compile_module_(vocoder, (-2,), backend, mode)
+
+
+def configure_compile_cache(cache_dir: str | Path) -> None:
+    """
+    Persist compiled artifacts in ``cache_dir`` so later processes start warm: Inductor's FX graph and autotuning
+    caches and Triton's kernel cache. Applies to the whole process, and to compilations started after the call.
+    """
+    cache_dir = Path(cache_dir).expanduser()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    os.environ["TORCHINDUCTOR_CACHE_DIR"] = str(cache_dir)
+    os.environ.setdefault("TRITON_CACHE_DIR", str(cache_dir / "triton"))
+    torch._inductor.config.fx_graph_cache = True
+    torch._inductor.config.autotune_local_cache = True
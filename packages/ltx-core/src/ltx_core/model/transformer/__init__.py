@@ -1,5 +1,8 @@
 """Transformer model components."""
 
+from ltx_core.model.transformer.block_streaming import StreamedTransformerBlocks, stream_transformer_blocks_
+from ltx_core.model.transformer.context_parallel import ContextParallel, enable_context_parallel_
+from ltx_core.model.transformer.cross_attention_cache import CrossAttentionCache
 from ltx_core.model.transformer.modality import Modality
 from ltx_core.model.transformer.model import LTXModel, X0Model
 from ltx_core.model.transformer.model_configurator import (
@@ -10,15 +13,22 @@ from ltx_core.model.transformer.model_configurator import (
     LTXVideoOnlyModelConfigurator,
     UpcastWithStochasticRounding,
 )
+from ltx_core.model.transformer.residual_cache import ResidualCache
 
 __all__ = [
     "LTXV_MODEL_COMFY_RENAMING_MAP",
     "LTXV_MODEL_COMFY_RENAMING_WITH_TRANSFORMER_LINEAR_DOWNCAST_MAP",
     "UPCAST_DURING_INFERENCE",
+    "ContextParallel",
+    "CrossAttentionCache",
     "LTXModel",
     "LTXModelConfigurator",
     "LTXVideoOnlyModelConfigurator",
     "Modality",
+    "ResidualCache",
+    "StreamedTransformerBlocks",
     "UpcastWithStochasticRounding",
     "X0Model",
+    "enable_context_parallel_",
+    "stream_transformer_blocks_",
 ]
@@ -170,6 +170,10 @@ class Attention(torch.nn.Module):
 
         self.to_out = torch.nn.Sequential(torch.nn.Linear(inner_dim, query_dim, bias=True), torch.nn.Identity())
 
+    def project_key_value(self, context: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+        """Normalized keys and values for ``context``, before rotary embeddings."""
+        return self.k_norm(self.to_k(context)), self.to_v(context)
+
     def forward(
         self,
         x: torch.Tensor,
@@ -177,14 +181,17 @@ class Attention(torch.nn.Module):
         mask: torch.Tensor | None = None,
         pe: torch.Tensor | None = None,
         k_pe: torch.Tensor | None = None,
+        key_value: tuple[torch.Tensor, torch.Tensor] | None = None,
     ) -> torch.Tensor:
-        q = self.to_q(x)
-        context = x if context is None else context
-        k = self.to_k(context)
-        v = self.to_v(context)
-
-        q = self.q_norm(q)
-        k = self.k_norm(k)
+        """
+        Attend from ``x`` to ``context`` (self-attention if ``None``). ``key_value`` are precomputed
+        :meth:`project_key_value` outputs for ``context``, e.g. from a
+        :class:`~ltx_core.model.transformer.cross_attention_cache.CrossAttentionCache`.
+        """
+        q = self.q_norm(self.to_q(x))
+        if key_value is None:
+            key_value = self.project_key_value(x if context is None else context)
+        k, v = key_value
 
         if pe is not None:
             q = apply_rotary_emb(q, pe, self.rope_type)
@@ -0,0 +1,137 @@
+from collections.abc import Callable, Iterable
+from functools import partial
+
+import torch
+
+from ltx_core.model.transformer.model import LTXModel
+
+
+class StreamedTransformerBlocks(torch.nn.ModuleList):
+    """
+    Transformer blocks whose weights stay in host memory and are streamed to the compute device while they run.
+    Before block ``i`` runs, its weights are on the device and blocks ``i + 1`` to ``i + window - 1`` are being
+    copied on a side CUDA stream, so copies overlap with compute; blocks behind are dropped from the device.
+    After the last block, no block weights are left on the device, so at most ``window`` blocks are resident at
+    any time. Between forwards the parameters hold the host weights, so in-place weight updates (e.g. fusing
+    LoRAs) apply to them.
+    ``Module.to`` and other conversions keep the weights in host memory: a dtype change converts them there and a
+    device change makes it the device they are streamed to.
+    ### Constructor parameters
+    blocks:
+        Blocks to stream, in the order the model runs them.
+    device:
+        Compute device the blocks run on.
+    window:
+        Number of blocks resident on the device at once, at least 1. Larger windows hide more of the copy time
+        behind compute at the cost of device memory.
+    pin_memory:
+        Whether the host weights are page-locked, so copies are asynchronous DMAs.
+        Defaults to ``torch.cuda.is_available()``.
+    """
+
+    def __init__(
+        self,
+        blocks: Iterable[torch.nn.Module],
+        device: torch.device,
+        window: int = 2,
+        pin_memory: bool | None = None,
+    ):
+        super().__init__(blocks)
+        if window < 1:
+            raise ValueError(f"The block streaming window must be at least 1, got {window}")
+        self.device = torch.device(device)
+        self.window = window
+        self.pin_memory = torch.cuda.is_available() if pin_memory is None else pin_memory
+        self._host = [
+            [(parameter, self._to_host(parameter.data)) for parameter in block.parameters()] for block in self
+        ]
+        self._resident: dict[int, list[torch.Tensor]] = {}
+        self._ready: dict[int, torch.cuda.Event] = {}
+        self._copy_stream: torch.cuda.Stream | None = None
+        for index, block in enumerate(self):
+            self._evict(index)
+            block.register_forward_pre_hook(partial(self._before_block, index))
+            block.register_forward_hook(partial(self._after_block, index))
+
+    @property
+    def resident(self) -> list[int]:
+        """Indices of the blocks whose weights are on the device or being copied there."""
+        return sorted(self._resident)
+
+    def release(self) -> None:
+        """Drop every block from the device."""
+        for index in list(self._resident):
+            self._evict(index)
+
+    def _to_host(self, tensor: torch.Tensor) -> torch.Tensor:
+        tensor = tensor.to("cpu")
+        return tensor.pin_memory() if self.pin_memory and not tensor.is_pinned() else tensor
+
+    def _load(self, index: int) -> None:
+        if index in self._resident:
+            return
+        if self.device.type != "cuda":
+            self._resident[index] = [host.to(self.device) for _, host in self._host[index]]
+            return
+        if self._copy_stream is None:
+            self._copy_stream = torch.cuda.Stream(self.device)
+        with torch.cuda.stream(self._copy_stream):
+            self._resident[index] = [host.to(self.device, non_blocking=True) for _, host in self._host[index]]
+        self._ready[index] = self._copy_stream.record_event()
+
+    def _evict(self, index: int) -> None:
+        self._resident.pop(index, None)
+        self._ready.pop(index, None)
+        for parameter, host in self._host[index]:
+            parameter.data = host
+
+    def _before_block(self, index: int, _block: torch.nn.Module, _args: tuple) -> None:
+        for resident in self.resident:
+            if not index <= resident < index + self.window:
+                self._evict(resident)
+        self._load(index)
+        ready = self._ready.pop(index, None)
+        if ready is not None:
+            stream = torch.cuda.current_stream(self.device)
+            stream.wait_event(ready)
+            for tensor in self._resident[index]:
+                # The copies were allocated on the copy stream: keep their memory until this stream used them.
+                tensor.record_stream(stream)
+        for (parameter, _), tensor in zip(self._host[index], self._resident[index], strict=True):
+            parameter.data = tensor
+        for upcoming in range(index + 1, min(index + self.window, len(self))):
+            self._load(upcoming)
+
+    def _after_block(self, index: int, _block: torch.nn.Module, _args: tuple, _output: object) -> None:
+        if index == len(self) - 1:
+            self.release()
+
+    def _apply(
+        self,
+        fn: Callable[[torch.Tensor], torch.Tensor],
+        recurse: bool = True,  # noqa: ARG002
+    ) -> "StreamedTransformerBlocks":
+        self.release()
+        for block in self._host:
+            for position, (parameter, host) in enumerate(block):
+                # Apply the conversion to an empty tensor to see which dtype and device it targets.
+                converted = fn(host.new_empty(0))
+                if converted.dtype != host.dtype:
+                    block[position] = (parameter, self._to_host(host.to(converted.dtype)))
+                    parameter.data = block[position][1]
+                if converted.device != host.device:
+                    # Only a conversion that moves tensors changes the device: dtype-only ones keep them on the host.
+                    self.device = converted.device
+        return self
+
+
+def stream_transformer_blocks_(
+    model: LTXModel, device: torch.device, window: int = 2, pin_memory: bool | None = None
+) -> LTXModel:
+    """
+    Keep the transformer blocks of ``model`` in host memory and stream them to ``device`` while they run (see
+    :class:`StreamedTransformerBlocks`), in place; the rest of the model is moved to ``device``. Lets a model
+    whose blocks do not fit on the device run with ``window`` blocks resident at a time.
+    """
+    model.transformer_blocks = StreamedTransformerBlocks(model.transformer_blocks, device, window, pin_memory)
+    return model.to(device)
@@ -0,0 +1,150 @@
+from dataclasses import replace
+
+import torch
+import torch.distributed as dist
+
+from ltx_core.model.transformer.attention import AttentionCallable, AttentionFunction
+from ltx_core.model.transformer.modality import Modality
+
+
+class ContextParallel:
+    """
+    Splits the video and audio tokens of a forward across the ranks of a process group (context parallelism).
+    Each rank runs the transformer on its own contiguous shard of the tokens of every sample. Token-wise layers
+    (projections, feed-forwards, AdaLN modulation, rotary embeddings) need nothing from other ranks; attention
+    over video and audio tokens exchanges shards for heads with an all-to-all before and after the attention
+    kernel (DeepSpeed-Ulysses style), so every rank attends over the full sequence for ``heads / world_size``
+    heads. Text cross-attention stays local, the text context being replicated on every rank.
+    The collectives are not differentiable: this is for inference only.
+    ### Constructor parameters
+    group:
+        Process group whose ranks share the tokens; the default group if ``None``. Every rank must run the same
+        forwards with the same inputs.
+    """
+
+    def __init__(self, group: dist.ProcessGroup | None = None):
+        self.group = group
+        self.world_size = dist.get_world_size(group)
+        self.rank = dist.get_rank(group)
+        self._shard_sizes: dict[str, list[int]] = {}
+
+    def shard(self, modality: Modality | None, tokens: str) -> Modality | None:
+        """This rank's shard of the tokens of ``modality``, named ``tokens`` (e.g. ``"video"``)."""
+        if modality is None:
+            self._shard_sizes.pop(tokens, None)
+            return None
+        num_tokens = modality.latent.shape[1]
+        if num_tokens < self.world_size:
+            raise ValueError(f"Cannot split {num_tokens} {tokens} tokens across {self.world_size} ranks")
+        self._shard_sizes[tokens] = [len(chunk) for chunk in torch.arange(num_tokens).tensor_split(self.world_size)]
+        timesteps = modality.timesteps
+        if timesteps.ndim > 1 and timesteps.shape[1] == num_tokens:  # Per-token timesteps, else broadcast.
+            timesteps = timesteps.tensor_split(self.world_size, dim=1)[self.rank]
+        return replace(
+            modality,
+            latent=modality.latent.tensor_split(self.world_size, dim=1)[self.rank],
+            timesteps=timesteps,
+            positions=modality.positions.tensor_split(self.world_size, dim=2)[self.rank],
+        )
+
+    def gather(self, x: torch.Tensor | None, tokens: str) -> torch.Tensor | None:
+        """Concatenate the ``(B, T_shard, ...)`` outputs of every rank along the token dim."""
+        if x is None:
+            return None
+        sizes = self._shard_sizes[tokens]
+        padded = x.new_zeros((x.shape[0], max(sizes), *x.shape[2:]))
+        padded[:, : x.shape[1]] = x
+        shards = [torch.empty_like(padded) for _ in range(self.world_size)]
+        dist.all_gather(shards, padded, group=self.group)
+        return torch.cat([shard[:, :size] for shard, size in zip(shards, sizes, strict=True)], dim=1)
+
+    def sequence_to_heads(self, x: torch.Tensor, tokens: str) -> torch.Tensor:
+        """``(B, T_shard, H * D)`` of this rank's tokens to ``(B, T, H / world_size * D)`` of its heads."""
+        b, t, inner_dim = x.shape
+        sizes = self._shard_sizes[tokens]
+        x = x.view(b, t, self.world_size, inner_dim // self.world_size).permute(2, 1, 0, 3)
+        x = self._all_to_all(x.reshape(self.world_size * t, b, -1), sizes, [t] * self.world_size)
+        return x.transpose(0, 1).contiguous()
+
+    def heads_to_sequence(self, x: torch.Tensor, tokens: str) -> torch.Tensor:
+        """Inverse of :meth:`sequence_to_heads`."""
+        b, _, head_dim = x.shape
+        sizes = self._shard_sizes[tokens]
+        t = sizes[self.rank]
+        x = self._all_to_all(x.transpose(0, 1).contiguous(), [t] * self.world_size, sizes)
+        return x.view(self.world_size, t, b, head_dim).permute(2, 1, 0, 3).reshape(b, t, self.world_size * head_dim)
+
+    def _all_to_all(self, x: torch.Tensor, output_sizes: list[int], input_sizes: list[int]) -> torch.Tensor:
+        output = x.new_empty((sum(output_sizes), *x.shape[1:]))
+        dist.all_to_all_single(output, x, output_sizes, input_sizes, group=self.group)
+        return output
+
+
+class ContextParallelAttention:
+    """
+    Attention function attending over the tokens of every rank of a :class:`ContextParallel` group.
+    Queries, keys and values are exchanged for a slice of the heads, ``attention_function`` runs on the full
+    sequence for those heads, and the output is exchanged back to this rank's query tokens.
+    ### Constructor parameters
+    attention_function:
+        Attention kernel wrapped, called with ``heads / world_size`` heads.
+    context_parallel:
+        Group sharing the tokens.
+    query_tokens:
+        Name of the sequence the queries come from (``"video"`` or ``"audio"``).
+    key_tokens:
+        Name of the sequence the keys and values come from.
+    """
+
+    def __init__(
+        self,
+        attention_function: AttentionCallable | AttentionFunction,
+        context_parallel: ContextParallel,
+        query_tokens: str,
+        key_tokens: str,
+    ):
+        self.attention_function = attention_function
+        self.context_parallel = context_parallel
+        self.query_tokens = query_tokens
+        self.key_tokens = key_tokens
+
+    def __call__(
+        self, q: torch.Tensor, k: torch.Tensor, v: torch.Tensor, heads: int, mask: torch.Tensor | None = None
+    ) -> torch.Tensor:
+        if mask is not None:
+            raise ValueError("Masked attention is not supported with context parallelism")
+        cp = self.context_parallel
+        if heads % cp.world_size != 0:
+            raise ValueError(f"Cannot split {heads} attention heads across {cp.world_size} ranks")
+        q = cp.sequence_to_heads(q, self.query_tokens)
+        k = cp.sequence_to_heads(k, self.key_tokens)
+        v = cp.sequence_to_heads(v, self.key_tokens)
+        out = self.attention_function(q, k, v, heads // cp.world_size, None)
+        return cp.heads_to_sequence(out, self.query_tokens)
+
+
+# Attention modules of a transformer block over video/audio tokens: module name, query tokens, key tokens.
+CONTEXT_PARALLEL_ATTENTIONS = (
+    ("attn1", "video", "video"),
+    ("audio_attn1", "audio", "audio"),
+    ("audio_to_video_attn", "video", "audio"),
+    ("video_to_audio_attn", "audio", "video"),
+)
+
+
+def enable_context_parallel_(model: torch.nn.Module, group: dist.ProcessGroup | None = None) -> torch.nn.Module:
+    """
+    Split the tokens of every forward of the :class:`~ltx_core.model.transformer.model.LTXModel` ``model``
+    across the ranks of ``group`` (see :class:`ContextParallel`), in place. Outputs are gathered, so every rank
+    returns the full output.
+    """
+    context_parallel = ContextParallel(group)
+    for block in model.transformer_blocks:
+        for name, query_tokens, key_tokens in CONTEXT_PARALLEL_ATTENTIONS:
+            attention = getattr(block, name, None)
+            if attention is not None:
+                attention.attention_function = ContextParallelAttention(
+                    attention.attention_function, context_parallel, query_tokens, key_tokens
+                )
+    model.context_parallel = context_parallel
+    return model
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import torch
+
+from ltx_core.model.transformer.attention import Attention
+
+
+@dataclass
+class CachedContext:
+    """
+    Projected text context of one modality and the cross-attention keys/values derived from it.
+    Keys/values are computed lazily, the first time a block attends to the context.
+    """
+
+    context: torch.Tensor
+    projected: torch.Tensor
+    key_values: dict[int, tuple[torch.Tensor, torch.Tensor]] = field(default_factory=dict)
+    selections: dict[tuple[int, ...], "CachedContext"] = field(default_factory=dict)
+
+    def select(self, index: list[int], device: torch.device) -> "CachedContext":
+        """
+        Cached context of the samples at ``index`` (along the batch dimension), with its own lazily computed
+        keys/values. Selections are kept, so a batch forked the same way on every step reuses them.
+        """
+        selection = self.selections.get(tuple(index))
+        if selection is None:
+            rows = torch.tensor(index, device=device)
+            selection = CachedContext(context=self.context[rows], projected=self.projected[rows])
+            self.selections[tuple(index)] = selection
+        return selection
+
+    def key_value(self, block_idx: int, attention: Attention) -> tuple[torch.Tensor, torch.Tensor]:
+        key_value = self.key_values.get(block_idx)
+        if key_value is None:
+            key_value = attention.project_key_value(self.projected)
+            self.key_values[block_idx] = key_value
+        return key_value
+
+
+class CrossAttentionCache:
+    """
+    Step-invariant inputs of the text cross-attention.
+    The text context of a generation does not change between denoising steps, so the caption projection and the
+    ``to_k``/``to_v`` projections of every ``attn2``/``audio_attn2`` block only need to be computed once per
+    context. Pass the same cache to every transformer forward of a denoising loop; contexts are matched by value,
+    so a batched guidance context rebuilt on every step still hits the cache.
+    Cached keys/values take ``2 * num_layers`` times the memory of the projected context, so the cache should
+    only live as long as the denoising loop using it.
+    ### Constructor parameters
+    max_contexts:
+        Number of distinct contexts kept, least recently used first out.
+    """
+
+    def __init__(self, max_contexts: int = 8):
+        self.max_contexts = max_contexts
+        self._entries: OrderedDict[int, tuple[object, CachedContext]] = OrderedDict()
+        self._next_id = 0
+
+    def lookup(
+        self, owner: object, context: torch.Tensor, project: Callable[[torch.Tensor], torch.Tensor]
+    ) -> CachedContext:
+        """
+        Cached projection of ``context`` for ``owner`` (the preprocessor projecting it), computed with ``project``
+        on a miss.
+        """
+        for entry_id, (entry_owner, entry) in self._entries.items():
+            if entry_owner is owner and _same_tensor(entry.context, context):
+                self._entries.move_to_end(entry_id)
+                return entry
+
+        entry = CachedContext(context=context, projected=project(context))
+        self._entries[self._next_id] = (owner, entry)
+        self._next_id += 1
+        while len(self._entries) > self.max_contexts:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _same_tensor(a: torch.Tensor, b: torch.Tensor) -> bool:
+    if a is b:
+        return True
+    return a.shape == b.shape and a.dtype == b.dtype and a.device == b.device and torch.equal(a, b)
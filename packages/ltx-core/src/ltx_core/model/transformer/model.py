@@ -1,20 +1,25 @@
+from dataclasses import replace
 from enum import Enum
 
 import torch
 
-from ltx_core.guidance.perturbations import BatchedPerturbationConfig
+from ltx_core.guidance.perturbations import BatchedPerturbationConfig, PerturbationConfig
 from ltx_core.model.transformer.adaln import AdaLayerNormSingle
 from ltx_core.model.transformer.attention import AttentionCallable, AttentionFunction
+from ltx_core.model.transformer.context_parallel import ContextParallel
+from ltx_core.model.transformer.cross_attention_cache import CrossAttentionCache
 from ltx_core.model.transformer.modality import Modality
+from ltx_core.model.transformer.residual_cache import ResidualCache
 from ltx_core.model.transformer.rope import LTXRopeType
 from ltx_core.model.transformer.text_projection import PixArtAlphaTextProjection
-from ltx_core.model.transformer.transformer import BasicAVTransformerBlock, TransformerConfig
+from ltx_core.model.transformer.transformer import BasicAVTransformerBlock, TransformerConfig, modulate
 from ltx_core.model.transformer.transformer_args import (
     MultiModalTransformerArgsPreprocessor,
     TransformerArgs,
     TransformerArgsPreprocessor,
+    select_samples,
 )
-from ltx_core.utils import to_denoised
+from ltx_core.utils import rms_norm, to_denoised
 
 
 class LTXModelType(Enum):
@@ -64,6 +69,7 @@ class LTXModel(torch.nn.Module):
     ):
         super().__init__()
         self._enable_gradient_checkpointing = False
+        self.context_parallel: ContextParallel | None = None
         self.use_middle_indices_grid = use_middle_indices_grid
         self.rope_type = rope_type
         self.double_precision_rope = double_precision_rope
@@ -323,31 +329,117 @@ class LTXModel(torch.nn.Module):
         video: TransformerArgs | None,
         audio: TransformerArgs | None,
         perturbations: BatchedPerturbationConfig,
+        residual_cache: ResidualCache | None = None,
+        sample_sources: list[int] | None = None,
     ) -> tuple[TransformerArgs, TransformerArgs]:
         """Process transformer blocks for LTXAV."""
-
-        # Process transformer blocks
-        for block in self.transformer_blocks:
-            if self._enable_gradient_checkpointing and self.training:
-                # Use gradient checkpointing to save memory during training.
-                # With use_reentrant=False, we can pass dataclasses directly -
-                # PyTorch will track all tensor leaves in the computation graph.
-                video, audio = torch.utils.checkpoint.checkpoint(
-                    block,
-                    video,
-                    audio,
-                    perturbations,
-                    use_reentrant=False,
-                )
+        if residual_cache is not None:
+            signature = (
+                *((args.x.shape, args.enabled) if args is not None else None for args in (video, audio)),
+                perturbations,
+                tuple(sample_sources) if sample_sources is not None else None,
+            )
+            indicators = [
+                self._modulated_input(video, "scale_shift_table"),
+                self._modulated_input(audio, "audio_scale_shift_table"),
+            ]
+            residuals = residual_cache.lookup(signature, indicators)
+            if sample_sources is not None:
+                inputs = (select_samples(video, sample_sources), select_samples(audio, sample_sources))
             else:
-                video, audio = block(
-                    video=video,
-                    audio=audio,
-                    perturbations=perturbations,
+                inputs = (video, audio)
+            if residuals is not None:
+                return tuple(
+                    replace(args, x=args.x + residual) if args is not None else None
+                    for args, residual in zip(inputs, residuals, strict=True)
                 )
 
+        if sample_sources is None:
+            for block in self.transformer_blocks:
+                video, audio = self._process_transformer_block(block, video, audio, perturbations)
+        else:
+            video, audio = self._process_forked_transformer_blocks(video, audio, perturbations, sample_sources)
+
+        if residual_cache is not None:
+            residual_cache.store(
+                tuple(
+                    args.x - input_args.x if args is not None else None
+                    for args, input_args in zip((video, audio), inputs, strict=True)
+                )
+            )
         return video, audio
 
+    def _process_forked_transformer_blocks(
+        self,
+        video: TransformerArgs | None,
+        audio: TransformerArgs | None,
+        perturbations: BatchedPerturbationConfig,
+        sample_sources: list[int],
+    ) -> tuple[TransformerArgs, TransformerArgs]:
+        """
+        Process transformer blocks for a batch whose samples share inputs (see :meth:`forward`).
+        Blocks run on one unperturbed row per input sample while it is needed; a sample with perturbations forks
+        off its input's row at the first block it perturbs, so the blocks before it run once for all samples
+        sharing the input.
+        """
+        num_blocks = len(self.transformer_blocks)
+        forks = [config.first_perturbed_block(num_blocks) for config in perturbations.perturbations]
+        # Rows of the running batch: ``-1 - source`` for an unperturbed input row, the sample index once forked.
+        rows = [-1 - source for source in range((video or audio).x.shape[0])]
+        for block_idx, block in enumerate(self.transformer_blocks):
+            block_rows = self._forked_rows(block_idx, forks, sample_sources)
+            if block_rows != rows:
+                index = [rows.index(row if row in rows else -1 - sample_sources[row]) for row in block_rows]
+                video, audio = select_samples(video, index), select_samples(audio, index)
+                rows = block_rows
+            block_perturbations = BatchedPerturbationConfig(
+                [perturbations.perturbations[row] if row >= 0 else PerturbationConfig.empty() for row in rows]
+            )
+            video, audio = self._process_transformer_block(block, video, audio, block_perturbations)
+
+        index = [rows.index(sample if sample in rows else -1 - source) for sample, source in enumerate(sample_sources)]
+        return select_samples(video, index), select_samples(audio, index)
+
+    @staticmethod
+    def _forked_rows(block_idx: int, forks: list[int], sample_sources: list[int]) -> list[int]:
+        """Rows of the running batch at ``block_idx``: input rows still shared by a sample, then forked samples."""
+        shared = sorted({source for source, fork in zip(sample_sources, forks, strict=True) if fork > block_idx})
+        return [-1 - source for source in shared] + [sample for sample, fork in enumerate(forks) if fork <= block_idx]
+
+    def _process_transformer_block(
+        self,
+        block: BasicAVTransformerBlock,
+        video: TransformerArgs | None,
+        audio: TransformerArgs | None,
+        perturbations: BatchedPerturbationConfig,
+    ) -> tuple[TransformerArgs, TransformerArgs]:
+        if self._enable_gradient_checkpointing and self.training:
+            # Use gradient checkpointing to save memory during training.
+            # With use_reentrant=False, we can pass dataclasses directly -
+            # PyTorch will track all tensor leaves in the computation graph.
+            return torch.utils.checkpoint.checkpoint(
+                block,
+                video,
+                audio,
+                perturbations,
+                use_reentrant=False,
+            )
+        return block(
+            video=video,
+            audio=audio,
+            perturbations=perturbations,
+        )
+
+    def _modulated_input(self, args: TransformerArgs | None, table_name: str) -> torch.Tensor | None:
+        """Input of the first block's self-attention, normalized and modulated by the timestep embedding."""
+        if args is None or not args.enabled:
+            return None
+        block = self.transformer_blocks[0]
+        shift, scale = block.get_ada_values(
+            getattr(block, table_name), args.timesteps, args.timestep_index, slice(0, 2)
+        )
+        return modulate(rms_norm(args.x, eps=block.norm_eps), scale, shift, args.token_groups)
+
     def _process_output(
         self,
         scale_shift_table: torch.Tensor,
@@ -355,24 +447,39 @@ class LTXModel(torch.nn.Module):
         proj_out: torch.nn.Linear,
         x: torch.Tensor,
         embedded_timestep: torch.Tensor,
+        timestep_index: torch.Tensor,
+        token_groups: torch.Tensor | None,
     ) -> torch.Tensor:
         """Process output for LTXV."""
-        # Apply scale-shift modulation
-        scale_shift_values = (
-            scale_shift_table[None, None].to(device=x.device, dtype=x.dtype) + embedded_timestep[:, :, None]
-        )
-        shift, scale = scale_shift_values[:, :, 0], scale_shift_values[:, :, 1]
+        # Apply scale-shift modulation, computed per timestep group and applied to the tokens of each group
+        scale_shift_values = scale_shift_table[None].to(device=x.device, dtype=x.dtype) + embedded_timestep[:, None]
+        shift, scale = scale_shift_values[:, 0][timestep_index], scale_shift_values[:, 1][timestep_index]
 
         x = norm_out(x)
-        x = x * (1 + scale) + shift
+        x = modulate(x, scale, shift, token_groups)
         x = proj_out(x)
         return x
 
     def forward(
-        self, video: Modality | None, audio: Modality | None, perturbations: BatchedPerturbationConfig
+        self,
+        video: Modality | None,
+        audio: Modality | None,
+        perturbations: BatchedPerturbationConfig,
+        cross_attention_cache: CrossAttentionCache | None = None,
+        residual_cache: ResidualCache | None = None,
+        sample_sources: list[int] | None = None,
     ) -> tuple[torch.Tensor, torch.Tensor]:
         """
         Forward pass for LTX models.
+        Pass the same ``cross_attention_cache`` to every forward of a denoising loop to compute the text
+        context projections and cross-attention keys/values once instead of on every step. Pass the same
+        ``residual_cache`` to reuse the block stack residual on steps whose input barely changed.
+        With ``sample_sources``, ``video`` and ``audio`` hold the distinct inputs of a batch whose samples share
+        them (e.g. a positive and an STG pass), and ``perturbations`` holds one config per sample: sample ``i``
+        computes input ``sample_sources[i]``. The blocks before the first one a sample perturbs run once per input,
+        and the outputs are returned per sample.
+        With context parallelism enabled (``enable_context_parallel_``), each rank computes a shard of the tokens
+        and the outputs are gathered.
         Returns:
             Processed output tensors
         """
@@ -380,20 +487,35 @@ class LTXModel(torch.nn.Module):
             raise ValueError("Video is not enabled for this model")
         if not self.model_type.is_audio_enabled() and audio is not None:
             raise ValueError("Audio is not enabled for this model")
-
-        video_args = self.video_args_preprocessor.prepare(video) if video is not None else None
-        audio_args = self.audio_args_preprocessor.prepare(audio) if audio is not None else None
+        if self.context_parallel is not None:
+            if residual_cache is not None:
+                # Each rank would decide to skip the blocks from its own shard, and ranks skipping the attention
+                # collectives of the others deadlock.
+                raise ValueError("Residual caching is not supported with context parallelism")
+            video = self.context_parallel.shard(video, "video")
+            audio = self.context_parallel.shard(audio, "audio")
+
+        video_args = self.video_args_preprocessor.prepare(video, cross_attention_cache) if video is not None else None
+        audio_args = self.audio_args_preprocessor.prepare(audio, cross_attention_cache) if audio is not None else None
         # Process transformer blocks
         video_out, audio_out = self._process_transformer_blocks(
             video=video_args,
             audio=audio_args,
             perturbations=perturbations,
+            residual_cache=residual_cache,
+            sample_sources=sample_sources,
         )
 
         # Process output
         vx = (
             self._process_output(
-                self.scale_shift_table, self.norm_out, self.proj_out, video_out.x, video_out.embedded_timestep
+                self.scale_shift_table,
+                self.norm_out,
+                self.proj_out,
+                video_out.x,
+                video_out.embedded_timestep,
+                video_out.timestep_index,
+                video_out.token_groups,
             )
             if video_out is not None
             else None
@@ -405,10 +527,15 @@ class LTXModel(torch.nn.Module):
                 self.audio_proj_out,
                 audio_out.x,
                 audio_out.embedded_timestep,
+                audio_out.timestep_index,
+                audio_out.token_groups,
             )
             if audio_out is not None
             else None
         )
+        if self.context_parallel is not None:
+            vx = self.context_parallel.gather(vx, "video")
+            ax = self.context_parallel.gather(ax, "audio")
         return vx, ax
 
 
@@ -428,13 +555,17 @@ class LegacyX0Model(torch.nn.Module):
         audio: Modality | None,
         perturbations: BatchedPerturbationConfig,
         sigma: float,
+        cross_attention_cache: CrossAttentionCache | None = None,
+        residual_cache: ResidualCache | None = None,
+        sample_sources: list[int] | None = None,
     ) -> tuple[torch.Tensor | None, torch.Tensor | None]:
         """
         Denoise the video and audio according to the sigma.
         Returns:
             Denoised video and audio
         """
-        vx, ax = self.velocity_model(video, audio, perturbations)
+        vx, ax = self.velocity_model(video, audio, perturbations, cross_attention_cache, residual_cache, sample_sources)
+        video, audio = _select_samples(video, sample_sources), _select_samples(audio, sample_sources)
         denoised_video = to_denoised(video.latent, vx, sigma) if vx is not None else None
         denoised_audio = to_denoised(audio.latent, ax, sigma) if ax is not None else None
         return denoised_video, denoised_audio
@@ -456,13 +587,25 @@ class X0Model(torch.nn.Module):
         video: Modality | None,
         audio: Modality | None,
         perturbations: BatchedPerturbationConfig,
+        cross_attention_cache: CrossAttentionCache | None = None,
+        residual_cache: ResidualCache | None = None,
+        sample_sources: list[int] | None = None,
     ) -> tuple[torch.Tensor | None, torch.Tensor | None]:
         """
         Denoise the video and audio according to the sigma.
         Returns:
             Denoised video and audio
         """
-        vx, ax = self.velocity_model(video, audio, perturbations)
+        vx, ax = self.velocity_model(video, audio, perturbations, cross_attention_cache, residual_cache, sample_sources)
+        video, audio = _select_samples(video, sample_sources), _select_samples(audio, sample_sources)
         denoised_video = to_denoised(video.latent, vx, video.timesteps) if vx is not None else None
         denoised_audio = to_denoised(audio.latent, ax, audio.timesteps) if ax is not None else None
         return denoised_video, denoised_audio
+
+
+def _select_samples(modality: Modality | None, sample_sources: list[int] | None) -> Modality | None:
+    """Latents and timesteps of the samples of a batch with shared inputs (see :meth:`LTXModel.forward`)."""
+    if modality is None or sample_sources is None:
+        return modality
+    rows = torch.tensor(sample_sources, device=modality.latent.device)
+    return replace(modality, latent=modality.latent[rows], timesteps=modality.timesteps[rows])
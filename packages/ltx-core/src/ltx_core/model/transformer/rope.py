@@ -1,5 +1,7 @@
 import functools
 import math
+import threading
+from collections import OrderedDict
 from enum import Enum
 from typing import Callable, Tuple
 
@@ -202,3 +204,99 @@ def precompute_freqs_cis(
         n_elem = 2 * indices_grid.shape[1]
         cos_freq, sin_freq = interleaved_freqs_cis(freqs, dim % n_elem)
     return cos_freq.to(out_dtype), sin_freq.to(out_dtype)
+
+
+class FreqsCisCache:
+    """
+    Bounded LRU cache of :func:`precompute_freqs_cis` outputs.
+    Positions are the same on every denoising step and guidance pass of a generation (and across generations
+    with the same resolution, frame count and frame rate), so their rotary embeddings only need to be computed
+    once. Entries are matched by the rope parameters and the position values. When all batch rows share their
+    positions, as for batched guidance passes, the embedding is computed and stored for a single row and
+    expanded to the batch, so entries do not grow with the number of passes.
+    Embeddings of long videos take hundreds of megabytes, so entries are bounded by their size as well as their
+    count, and pipelines :meth:`clear` the cache between stages (see ``cleanup_memory``).
+    ### Constructor parameters
+    maxsize:
+        Maximum number of cached embeddings, least recently used first out.
+    max_bytes:
+        Maximum total size in bytes of the cached embeddings and positions, least recently used first out.
+        Embeddings larger than this are computed without being cached.
+    """
+
+    def __init__(self, maxsize: int = 16, max_bytes: int = 2 * 1024**3):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[int, tuple[tuple, torch.Tensor, tuple[torch.Tensor, torch.Tensor]]] = OrderedDict()
+        self._nbytes = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, indices_grid: torch.Tensor, **kwargs) -> tuple[torch.Tensor, torch.Tensor]:
+        """Cached ``precompute_freqs_cis(indices_grid, **kwargs)``."""
+        batch_size = indices_grid.shape[0]
+        positions = indices_grid[:1]
+        if batch_size > 1 and not torch.equal(indices_grid, positions.expand_as(indices_grid)):
+            positions = indices_grid
+        key = (
+            tuple((name, tuple(value) if isinstance(value, list) else value) for name, value in sorted(kwargs.items())),
+            tuple(positions.shape),
+            positions.dtype,
+            positions.device,
+        )
+
+        with self._lock:
+            freqs_cis = self._lookup(key, positions)
+        if freqs_cis is None:
+            positions = positions.clone()
+            freqs_cis = precompute_freqs_cis(positions, **kwargs)
+            nbytes = _entry_nbytes(positions, freqs_cis)
+            if nbytes <= self.max_bytes:
+                with self._lock:
+                    self._entries[self._next_id] = (key, positions, freqs_cis)
+                    self._nbytes += nbytes
+                    self._next_id += 1
+                    while len(self._entries) > self.maxsize or self._nbytes > self.max_bytes:
+                        _, evicted_positions, evicted = self._entries.popitem(last=False)[1]
+                        self._nbytes -= _entry_nbytes(evicted_positions, evicted)
+
+        if positions.shape[0] != batch_size:
+            freqs_cis = tuple(freqs.expand(batch_size, *freqs.shape[1:]) for freqs in freqs_cis)
+        return freqs_cis
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Total size in bytes of the cached embeddings and positions."""
+        return self._nbytes
+
+    def _lookup(self, key: tuple, positions: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor] | None:
+        for entry_id, (entry_key, entry_positions, freqs_cis) in self._entries.items():
+            if entry_key == key and torch.equal(entry_positions, positions):
+                self._entries.move_to_end(entry_id)
+                return freqs_cis
+        return None
+
+
+def _entry_nbytes(positions: torch.Tensor, freqs_cis: tuple[torch.Tensor, torch.Tensor]) -> int:
+    return positions.nbytes + sum(freqs.nbytes for freqs in freqs_cis)
+
+
+FREQS_CIS_CACHE = FreqsCisCache()
+
+
+def cached_precompute_freqs_cis(indices_grid: torch.Tensor, **kwargs) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    :func:`precompute_freqs_cis` through :data:`FREQS_CIS_CACHE`. The cache is bypassed when autograd is enabled
+    (training), where positions change every batch.
+    """
+    if torch.is_grad_enabled():
+        return precompute_freqs_cis(indices_grid, **kwargs)
+    return FREQS_CIS_CACHE.get_or_compute(indices_grid, **kwargs)
@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from dataclasses import dataclass, replace
 
 import torch
@@ -10,6 +11,37 @@ from ltx_core.model.transformer.transformer_args import TransformerArgs
 from ltx_core.utils import rms_norm
 
 
+def modulate(
+    x: torch.Tensor, scale: torch.Tensor, shift: torch.Tensor, token_groups: torch.Tensor | None
+) -> torch.Tensor:
+    """``x * (1 + scale) + shift`` with per-group ``scale`` and ``shift`` (see :func:`per_group`)."""
+    return per_group(lambda group_scale, group_shift: x * (1 + group_scale) + group_shift, token_groups, scale, shift)
+
+
+def gate(x: torch.Tensor, gate_values: torch.Tensor, token_groups: torch.Tensor | None) -> torch.Tensor:
+    """``x * gate_values`` with per-group ``gate_values`` (see :func:`per_group`)."""
+    return per_group(lambda group_gate: x * group_gate, token_groups, gate_values)
+
+
+def per_group(
+    fn: Callable[..., torch.Tensor], token_groups: torch.Tensor | None, *values: torch.Tensor
+) -> torch.Tensor:
+    """
+    ``fn`` applied to per-token values without gathering them per token: ``values`` hold the modulation values of
+    each sample's timestep groups (shape ``(B, G, dim)``), and each token takes the result of its group in
+    ``token_groups`` (see :class:`~ltx_core.model.transformer.transformer_args.TransformerArgs`). With a single
+    group the values broadcast over the tokens; otherwise ``fn`` runs once per group on ``(B, 1, dim)`` values, so
+    no ``(B, T, dim)`` shift, scale or gate tensor outlives the call.
+    """
+    if token_groups is None:
+        return fn(*values)
+    result = fn(*(value[:, :1] for value in values))
+    for group in range(1, values[0].shape[1]):
+        in_group = (token_groups == group)[None, :, None]
+        result = torch.where(in_group, fn(*(value[:, group : group + 1] for value in values)), result)
+    return result
+
+
 @dataclass
 class TransformerConfig:
     dim: int
@@ -104,29 +136,33 @@ class BasicAVTransformerBlock(torch.nn.Module):
         self.norm_eps = norm_eps
 
     def get_ada_values(
-        self, scale_shift_table: torch.Tensor, batch_size: int, timestep: torch.Tensor, indices: slice
+        self, scale_shift_table: torch.Tensor, timestep: torch.Tensor, timestep_index: torch.Tensor, indices: slice
     ) -> tuple[torch.Tensor, ...]:
+        """
+        Modulation values computed once per timestep group (rows of ``timestep``), of shape ``(B, G, dim)``: the
+        values of each sample's groups, applied to the tokens with :func:`modulate` and :func:`gate`.
+        """
         num_ada_params = scale_shift_table.shape[0]
 
         ada_values = (
-            scale_shift_table[indices].unsqueeze(0).unsqueeze(0).to(device=timestep.device, dtype=timestep.dtype)
-            + timestep.reshape(batch_size, timestep.shape[1], num_ada_params, -1)[:, :, indices, :]
-        ).unbind(dim=2)
-        return ada_values
+            scale_shift_table[indices].unsqueeze(0).to(device=timestep.device, dtype=timestep.dtype)
+            + timestep.reshape(timestep.shape[0], num_ada_params, -1)[:, indices, :]
+        ).unbind(dim=1)
+        return tuple(values[timestep_index] for values in ada_values)
 
     def get_av_ca_ada_values(
         self,
         scale_shift_table: torch.Tensor,
-        batch_size: int,
+        timestep_index: torch.Tensor,
         scale_shift_timestep: torch.Tensor,
         gate_timestep: torch.Tensor,
         num_scale_shift_values: int = 4,
     ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
         scale_shift_ada_values = self.get_ada_values(
-            scale_shift_table[:num_scale_shift_values, :], batch_size, scale_shift_timestep, slice(None, None)
+            scale_shift_table[:num_scale_shift_values, :], scale_shift_timestep, timestep_index, slice(None, None)
         )
         gate_ada_values = self.get_ada_values(
-            scale_shift_table[num_scale_shift_values:, :], batch_size, gate_timestep, slice(None, None)
+            scale_shift_table[num_scale_shift_values:, :], gate_timestep, timestep_index, slice(None, None)
         )
 
         scale_shift_chunks = [t.squeeze(2) for t in scale_shift_ada_values]
@@ -134,6 +170,13 @@ class BasicAVTransformerBlock(torch.nn.Module):
 
         return (*scale_shift_chunks, *gate_ada_values)
 
+    def _cached_key_value(
+        self, args: TransformerArgs, attention: Attention
+    ) -> tuple[torch.Tensor, torch.Tensor] | None:
+        if args.context_cache is None:
+            return None
+        return args.context_cache.key_value(self.idx, attention)
+
     def forward(  # noqa: PLR0915
         self,
         video: TransformerArgs | None,
@@ -159,28 +202,45 @@ class BasicAVTransformerBlock(torch.nn.Module):
 
         if run_vx:
             vshift_msa, vscale_msa, vgate_msa = self.get_ada_values(
-                self.scale_shift_table, vx.shape[0], video.timesteps, slice(0, 3)
+                self.scale_shift_table, video.timesteps, video.timestep_index, slice(0, 3)
             )
             if not perturbations.all_in_batch(PerturbationType.SKIP_VIDEO_SELF_ATTN, self.idx):
-                norm_vx = rms_norm(vx, eps=self.norm_eps) * (1 + vscale_msa) + vshift_msa
+                norm_vx = modulate(rms_norm(vx, eps=self.norm_eps), vscale_msa, vshift_msa, video.token_groups)
                 v_mask = perturbations.mask_like(PerturbationType.SKIP_VIDEO_SELF_ATTN, self.idx, vx)
-                vx = vx + self.attn1(norm_vx, pe=video.positional_embeddings) * vgate_msa * v_mask
+                vx = (
+                    vx
+                    + gate(self.attn1(norm_vx, pe=video.positional_embeddings), vgate_msa, video.token_groups) * v_mask
+                )
 
-            vx = vx + self.attn2(rms_norm(vx, eps=self.norm_eps), context=video.context, mask=video.context_mask)
+            vx = vx + self.attn2(
+                rms_norm(vx, eps=self.norm_eps),
+                context=video.context,
+                mask=video.context_mask,
+                key_value=self._cached_key_value(video, self.attn2),
+            )
 
             del vshift_msa, vscale_msa, vgate_msa
 
         if run_ax:
             ashift_msa, ascale_msa, agate_msa = self.get_ada_values(
-                self.audio_scale_shift_table, ax.shape[0], audio.timesteps, slice(0, 3)
+                self.audio_scale_shift_table, audio.timesteps, audio.timestep_index, slice(0, 3)
             )
 
             if not perturbations.all_in_batch(PerturbationType.SKIP_AUDIO_SELF_ATTN, self.idx):
-                norm_ax = rms_norm(ax, eps=self.norm_eps) * (1 + ascale_msa) + ashift_msa
+                norm_ax = modulate(rms_norm(ax, eps=self.norm_eps), ascale_msa, ashift_msa, audio.token_groups)
                 a_mask = perturbations.mask_like(PerturbationType.SKIP_AUDIO_SELF_ATTN, self.idx, ax)
-                ax = ax + self.audio_attn1(norm_ax, pe=audio.positional_embeddings) * agate_msa * a_mask
+                ax = (
+                    ax
+                    + gate(self.audio_attn1(norm_ax, pe=audio.positional_embeddings), agate_msa, audio.token_groups)
+                    * a_mask
+                )
 
-            ax = ax + self.audio_attn2(rms_norm(ax, eps=self.norm_eps), context=audio.context, mask=audio.context_mask)
+            ax = ax + self.audio_attn2(
+                rms_norm(ax, eps=self.norm_eps),
+                context=audio.context,
+                mask=audio.context_mask,
+                key_value=self._cached_key_value(audio, self.audio_attn2),
+            )
 
             del ashift_msa, ascale_msa, agate_msa
 
@@ -197,7 +257,7 @@ class BasicAVTransformerBlock(torch.nn.Module):
                 gate_out_v2a,
             ) = self.get_av_ca_ada_values(
                 self.scale_shift_table_a2v_ca_audio,
-                ax.shape[0],
+                audio.timestep_index,
                 audio.cross_scale_shift_timestep,
                 audio.cross_gate_timestep,
             )
@@ -210,38 +270,52 @@ class BasicAVTransformerBlock(torch.nn.Module):
                 gate_out_a2v,
             ) = self.get_av_ca_ada_values(
                 self.scale_shift_table_a2v_ca_video,
-                vx.shape[0],
+                video.timestep_index,
                 video.cross_scale_shift_timestep,
                 video.cross_gate_timestep,
             )
 
             if run_a2v and not perturbations.all_in_batch(PerturbationType.SKIP_A2V_CROSS_ATTN, self.idx):
-                vx_scaled = vx_norm3 * (1 + scale_ca_video_hidden_states_a2v) + shift_ca_video_hidden_states_a2v
-                ax_scaled = ax_norm3 * (1 + scale_ca_audio_hidden_states_a2v) + shift_ca_audio_hidden_states_a2v
+                vx_scaled = modulate(
+                    vx_norm3, scale_ca_video_hidden_states_a2v, shift_ca_video_hidden_states_a2v, video.token_groups
+                )
+                ax_scaled = modulate(
+                    ax_norm3, scale_ca_audio_hidden_states_a2v, shift_ca_audio_hidden_states_a2v, audio.token_groups
+                )
                 a2v_mask = perturbations.mask_like(PerturbationType.SKIP_A2V_CROSS_ATTN, self.idx, vx)
                 vx = vx + (
-                    self.audio_to_video_attn(
-                        vx_scaled,
-                        context=ax_scaled,
-                        pe=video.cross_positional_embeddings,
-                        k_pe=audio.cross_positional_embeddings,
+                    gate(
+                        self.audio_to_video_attn(
+                            vx_scaled,
+                            context=ax_scaled,
+                            pe=video.cross_positional_embeddings,
+                            k_pe=audio.cross_positional_embeddings,
+                        ),
+                        gate_out_a2v,
+                        video.token_groups,
                     )
-                    * gate_out_a2v
                     * a2v_mask
                 )
 
             if run_v2a and not perturbations.all_in_batch(PerturbationType.SKIP_V2A_CROSS_ATTN, self.idx):
-                ax_scaled = ax_norm3 * (1 + scale_ca_audio_hidden_states_v2a) + shift_ca_audio_hidden_states_v2a
-                vx_scaled = vx_norm3 * (1 + scale_ca_video_hidden_states_v2a) + shift_ca_video_hidden_states_v2a
+                ax_scaled = modulate(
+                    ax_norm3, scale_ca_audio_hidden_states_v2a, shift_ca_audio_hidden_states_v2a, audio.token_groups
+                )
+                vx_scaled = modulate(
+                    vx_norm3, scale_ca_video_hidden_states_v2a, shift_ca_video_hidden_states_v2a, video.token_groups
+                )
                 v2a_mask = perturbations.mask_like(PerturbationType.SKIP_V2A_CROSS_ATTN, self.idx, ax)
                 ax = ax + (
-                    self.video_to_audio_attn(
-                        ax_scaled,
-                        context=vx_scaled,
-                        pe=audio.cross_positional_embeddings,
-                        k_pe=video.cross_positional_embeddings,
+                    gate(
+                        self.video_to_audio_attn(
+                            ax_scaled,
+                            context=vx_scaled,
+                            pe=audio.cross_positional_embeddings,
+                            k_pe=video.cross_positional_embeddings,
+                        ),
+                        gate_out_v2a,
+                        audio.token_groups,
                     )
-                    * gate_out_v2a
                     * v2a_mask
                 )
 
@@ -259,19 +333,19 @@ class BasicAVTransformerBlock(torch.nn.Module):
 
         if run_vx:
             vshift_mlp, vscale_mlp, vgate_mlp = self.get_ada_values(
-                self.scale_shift_table, vx.shape[0], video.timesteps, slice(3, None)
+                self.scale_shift_table, video.timesteps, video.timestep_index, slice(3, None)
             )
-            vx_scaled = rms_norm(vx, eps=self.norm_eps) * (1 + vscale_mlp) + vshift_mlp
-            vx = vx + self.ff(vx_scaled) * vgate_mlp
+            vx_scaled = modulate(rms_norm(vx, eps=self.norm_eps), vscale_mlp, vshift_mlp, video.token_groups)
+            vx = vx + gate(self.ff(vx_scaled), vgate_mlp, video.token_groups)
 
             del vshift_mlp, vscale_mlp, vgate_mlp
 
         if run_ax:
             ashift_mlp, ascale_mlp, agate_mlp = self.get_ada_values(
-                self.audio_scale_shift_table, ax.shape[0], audio.timesteps, slice(3, None)
+                self.audio_scale_shift_table, audio.timesteps, audio.timestep_index, slice(3, None)
             )
-            ax_scaled = rms_norm(ax, eps=self.norm_eps) * (1 + ascale_mlp) + ashift_mlp
-            ax = ax + self.audio_ff(ax_scaled) * agate_mlp
+            ax_scaled = modulate(rms_norm(ax, eps=self.norm_eps), ascale_mlp, ashift_mlp, audio.token_groups)
+            ax = ax + gate(self.audio_ff(ax_scaled), agate_mlp, audio.token_groups)
 
             del ashift_mlp, ascale_mlp, agate_mlp
 
@@ -3,18 +3,27 @@ from dataclasses import dataclass, replace
 import torch
 
 from ltx_core.model.transformer.adaln import AdaLayerNormSingle
+from ltx_core.model.transformer.cross_attention_cache import CachedContext, CrossAttentionCache
 from ltx_core.model.transformer.modality import Modality
 from ltx_core.model.transformer.rope import (
     LTXRopeType,
+    cached_precompute_freqs_cis,
     generate_freq_grid_np,
     generate_freq_grid_pytorch,
-    precompute_freqs_cis,
 )
 from ltx_core.model.transformer.text_projection import PixArtAlphaTextProjection
 
 
 @dataclass(frozen=True)
 class TransformerArgs:
+    """
+    Inputs of the transformer blocks for one modality.
+    Timestep embeddings (``timesteps``, ``embedded_timestep`` and the cross-attention ones) hold one row per
+    timestep group (see :func:`unique_timesteps`): ``timestep_index`` (shape ``(B, G)``) holds the rows of the
+    ``G`` groups of each sample and ``token_groups`` (shape ``(T,)``, shared by all samples) the group of each
+    token, or is ``None`` when every sample has a single timestep.
+    """
+
     x: torch.Tensor
     context: torch.Tensor
     context_mask: torch.Tensor
@@ -25,6 +34,63 @@ class TransformerArgs:
     cross_scale_shift_timestep: torch.Tensor | None
     cross_gate_timestep: torch.Tensor | None
     enabled: bool
+    timestep_index: torch.Tensor
+    token_groups: torch.Tensor | None = None
+    context_cache: CachedContext | None = None
+
+
+def unique_timesteps(timesteps: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor | None]:
+    """
+    Group per-token timesteps, so AdaLN embeddings and modulation values are computed per group instead of per
+    token.
+    ``timesteps_from_mask`` yields one timestep per token, but the tokens of a denoising step only follow a
+    handful of distinct timestep patterns across the batch (e.g. conditioned and noised tokens), so tokens are
+    grouped by their column of timesteps: every sample has one group per distinct column, and a token is in the
+    same group in all samples. This takes a single host sync (for the number of groups), once per forward.
+    Returns:
+        The timestep of each group (``B * G`` values), the rows of the groups of each sample (shape ``(B, G)``)
+        and the group of each token (shape ``(T,)``), or ``None`` when all tokens of every sample share a timestep.
+    """
+    timesteps = timesteps.reshape(timesteps.shape[0], -1)
+    columns, token_groups = torch.unique(timesteps, dim=1, return_inverse=True)
+    batch_size, num_groups = columns.shape
+    index = torch.arange(batch_size * num_groups, device=timesteps.device).reshape(batch_size, num_groups)
+    return columns.flatten(), index, token_groups if num_groups > 1 else None
+
+
+def select_samples(args: TransformerArgs | None, index: list[int]) -> TransformerArgs | None:
+    """
+    Transformer args of the samples at ``index`` along the batch dimension (indices may repeat).
+    Timestep embeddings are per timestep group and shared by all samples, as are the ``token_groups``, so only
+    ``timestep_index`` is selected.
+    """
+    if args is None:
+        return None
+    rows = torch.tensor(index, device=args.x.device)
+    return replace(
+        args,
+        x=args.x[rows],
+        context=_select_rows(args.context, rows),
+        context_mask=_select_rows(args.context_mask, rows) if args.context_mask is not None else None,
+        positional_embeddings=tuple(_select_rows(pe, rows) for pe in args.positional_embeddings),
+        cross_positional_embeddings=(
+            tuple(_select_rows(pe, rows) for pe in args.cross_positional_embeddings)
+            if args.cross_positional_embeddings is not None
+            else None
+        ),
+        timestep_index=args.timestep_index[rows],
+        context_cache=args.context_cache.select(index, args.x.device) if args.context_cache is not None else None,
+    )
+
+
+def _select_rows(tensor: torch.Tensor, rows: torch.Tensor) -> torch.Tensor:
+    """
+    ``tensor[rows]``, as a view of the first row when ``tensor`` is expanded along the batch (like the rotary
+    embeddings shared by all samples), instead of copying the same row ``len(rows)`` times.
+    """
+    if tensor.shape[0] > 0 and tensor.stride(0) == 0:
+        return tensor[:1].expand(len(rows), *tensor.shape[1:])
+    return tensor[rows]
 
 
 class TransformerArgsPreprocessor:
@@ -54,22 +120,15 @@ class TransformerArgsPreprocessor:
         self.positional_embedding_theta = positional_embedding_theta
         self.rope_type = rope_type
 
-    def _prepare_timestep(
-        self, timestep: torch.Tensor, batch_size: int, hidden_dtype: torch.dtype
-    ) -> tuple[torch.Tensor, torch.Tensor]:
-        """Prepare timestep embeddings."""
+    def _prepare_timestep(self, timestep: torch.Tensor, hidden_dtype: torch.dtype) -> tuple[torch.Tensor, torch.Tensor]:
+        """Prepare timestep embeddings, one row per timestep group."""
 
         timestep = timestep * self.timestep_scale_multiplier
-        timestep, embedded_timestep = self.adaln(
+        return self.adaln(
             timestep.flatten(),
             hidden_dtype=hidden_dtype,
         )
 
-        # Second dimension is 1 or number of tokens (if timestep_per_token)
-        timestep = timestep.view(batch_size, -1, timestep.shape[-1])
-        embedded_timestep = embedded_timestep.view(batch_size, -1, embedded_timestep.shape[-1])
-        return timestep, embedded_timestep
-
     def _prepare_context(
         self,
         context: torch.Tensor,
@@ -103,7 +162,7 @@ class TransformerArgsPreprocessor:
     ) -> torch.Tensor:
         """Prepare positional embeddings."""
         freq_grid_generator = generate_freq_grid_np if self.double_precision_rope else generate_freq_grid_pytorch
-        pe = precompute_freqs_cis(
+        pe = cached_precompute_freqs_cis(
             positions,
             dim=inner_dim,
             out_dtype=x_dtype,
@@ -119,10 +178,26 @@ class TransformerArgsPreprocessor:
     def prepare(
         self,
         modality: Modality,
+        cross_attention_cache: CrossAttentionCache | None = None,
+        grouped_timesteps: tuple[torch.Tensor, torch.Tensor, torch.Tensor | None] | None = None,
     ) -> TransformerArgs:
+        """
+        Transformer args of ``modality``. ``grouped_timesteps`` are its :func:`unique_timesteps`, if the caller
+        already grouped them.
+        """
         x = self.patchify_proj(modality.latent)
-        timestep, embedded_timestep = self._prepare_timestep(modality.timesteps, x.shape[0], modality.latent.dtype)
-        context, attention_mask = self._prepare_context(modality.context, x, modality.context_mask)
+        if grouped_timesteps is None:
+            grouped_timesteps = unique_timesteps(modality.timesteps)
+        timestep_values, timestep_index, token_groups = grouped_timesteps
+        timestep, embedded_timestep = self._prepare_timestep(timestep_values, modality.latent.dtype)
+        context_cache = None
+        if cross_attention_cache is None:
+            context, attention_mask = self._prepare_context(modality.context, x, modality.context_mask)
+        else:
+            context_cache = cross_attention_cache.lookup(
+                self, modality.context, lambda context: self._prepare_context(context, x)[0]
+            )
+            context, attention_mask = context_cache.projected, modality.context_mask
         attention_mask = self._prepare_attention_mask(attention_mask, modality.latent.dtype)
         pe = self._prepare_positional_embeddings(
             positions=modality.positions,
@@ -143,6 +218,9 @@ class TransformerArgsPreprocessor:
             cross_scale_shift_timestep=None,
             cross_gate_timestep=None,
             enabled=modality.enabled,
+            timestep_index=timestep_index,
+            token_groups=token_groups,
+            context_cache=context_cache,
         )
 
 
@@ -188,8 +266,11 @@ class MultiModalTransformerArgsPreprocessor:
     def prepare(
         self,
         modality: Modality,
+        cross_attention_cache: CrossAttentionCache | None = None,
     ) -> TransformerArgs:
-        transformer_args = self.simple_preprocessor.prepare(modality)
+        # Grouped once, for the self-attention and the cross-attention AdaLNs alike.
+        grouped_timesteps = unique_timesteps(modality.timesteps)
+        transformer_args = self.simple_preprocessor.prepare(modality, cross_attention_cache, grouped_timesteps)
         cross_pe = self.simple_preprocessor._prepare_positional_embeddings(
             positions=modality.positions[:, 0:1, :],
             inner_dim=self.audio_cross_attention_dim,
@@ -200,9 +281,8 @@ class MultiModalTransformerArgsPreprocessor:
         )
 
         cross_scale_shift_timestep, cross_gate_timestep = self._prepare_cross_attention_timestep(
-            timestep=modality.timesteps,
+            timestep=grouped_timesteps[0],
             timestep_scale_multiplier=self.simple_preprocessor.timestep_scale_multiplier,
-            batch_size=transformer_args.x.shape[0],
             hidden_dtype=modality.latent.dtype,
         )
 
@@ -217,10 +297,9 @@ class MultiModalTransformerArgsPreprocessor:
         self,
         timestep: torch.Tensor,
         timestep_scale_multiplier: int,
-        batch_size: int,
         hidden_dtype: torch.dtype,
     ) -> tuple[torch.Tensor, torch.Tensor]:
-        """Prepare cross attention timestep embeddings."""
+        """Prepare cross attention timestep embeddings, one row per timestep group."""
         timestep = timestep * timestep_scale_multiplier
 
         av_ca_factor = self.av_ca_timestep_scale_multiplier / timestep_scale_multiplier
@@ -229,11 +308,9 @@ class MultiModalTransformerArgsPreprocessor:
             timestep.flatten(),
             hidden_dtype=hidden_dtype,
         )
-        scale_shift_timestep = scale_shift_timestep.view(batch_size, -1, scale_shift_timestep.shape[-1])
         gate_noise_timestep, _ = self.cross_gate_adaln(
             timestep.flatten() * av_ca_factor,
             hidden_dtype=hidden_dtype,
         )
-        gate_noise_timestep = gate_noise_timestep.view(batch_size, -1, gate_noise_timestep.shape[-1])
 
         return scale_shift_timestep, gate_noise_timestep
@@ -7,7 +7,10 @@ from ltx_core.text_encoders.gemma.encoders.av_encoder import (
     AVGemmaTextEncoderModelConfigurator,
 )
 from ltx_core.text_encoders.gemma.encoders.base_encoder import (
+    TEXT_MAX_LENGTH,
+    TEXT_PADDING_MULTIPLE,
     GemmaTextEncoderModelBase,
+    default_enhancement_system_prompt,
     encode_text,
     module_ops_from_gemma_root,
 )
@@ -19,6 +22,8 @@ from ltx_core.text_encoders.gemma.encoders.video_only_encoder import (
 
 __all__ = [
     "AV_GEMMA_TEXT_ENCODER_KEY_OPS",
+    "TEXT_MAX_LENGTH",
+    "TEXT_PADDING_MULTIPLE",
     "AVGemmaEncoderOutput",
     "AVGemmaTextEncoderModel",
     "AVGemmaTextEncoderModelConfigurator",
@@ -26,6 +31,7 @@ __all__ = [
     "VideoGemmaEncoderOutput",
     "VideoGemmaTextEncoderModel",
     "VideoGemmaTextEncoderModelConfigurator",
+    "default_enhancement_system_prompt",
     "encode_text",
     "module_ops_from_gemma_root",
 ]
@@ -1,15 +1,25 @@
+import copy
 import functools
 from pathlib import Path
 
 import torch
 from einops import rearrange
 from transformers import AutoImageProcessor, Gemma3ForConditionalGeneration, Gemma3Processor
+from transformers.cache_utils import Cache
 
 from ltx_core.loader.module_ops import ModuleOps
 from ltx_core.text_encoders.gemma.feature_extractor import GemmaFeaturesExtractorProjLinear
 from ltx_core.text_encoders.gemma.tokenizer import LTXVGemmaTokenizer
 from ltx_core.utils import find_matching_file
 
+# Maximum number of prompt tokens fed to Gemma.
+TEXT_MAX_LENGTH = 1024
+# Number of learnable registers of the embeddings connectors, which replace the padding tokens and require the
+# sequence length to be divisible by their count. Padding prompts to a multiple of it instead of to TEXT_MAX_LENGTH
+# is opt-in: with fewer padding tokens, fewer registers enter the context and the outputs differ from the ones the
+# models were trained with.
+TEXT_PADDING_MULTIPLE = 128
+
 
 class GemmaTextEncoderModelBase(torch.nn.Module):
     """
@@ -37,6 +47,8 @@ class GemmaTextEncoderModelBase(torch.nn.Module):
         self.model = model
         self.processor = img_processor
         self.feature_extractor_linear = feature_extractor_linear.to(dtype=dtype)
+        # (system prompt, device) -> (chat prefix token ids, KV cache of the prefix), see _system_prompt_key_values
+        self._system_prompt_cache: tuple[tuple[str, str], torch.Tensor, Cache] | None = None
 
     def _run_feature_extractor(
         self, hidden_states: torch.Tensor, attention_mask: torch.Tensor, padding_side: str = "right"
@@ -89,11 +101,15 @@ class GemmaTextEncoderModelBase(torch.nn.Module):
         ).to(self.model.device)
         pad_token_id = self.processor.tokenizer.pad_token_id if self.processor.tokenizer.pad_token_id is not None else 0
         model_inputs = _pad_inputs_for_attention_alignment(model_inputs, pad_token_id=pad_token_id)
+        # Gemma only embeds images on the first forward of generate, which a prefilled cache skips.
+        past_key_values = self._system_prompt_key_values(messages, model_inputs.input_ids) if image is None else None
 
-        with torch.inference_mode(), torch.random.fork_rng(devices=[self.model.device]):
+        rng_devices = [self.model.device] if self.model.device.type == "cuda" else []
+        with torch.inference_mode(), torch.random.fork_rng(devices=rng_devices):
             torch.manual_seed(seed)
             outputs = self.model.generate(
                 **model_inputs,
+                past_key_values=past_key_values,
                 max_new_tokens=max_new_tokens,
                 do_sample=True,
                 temperature=0.7,
@@ -103,6 +119,36 @@ class GemmaTextEncoderModelBase(torch.nn.Module):
 
         return enhanced_prompt
 
+    def _system_prompt_key_values(self, messages: list[dict[str, str]], input_ids: torch.Tensor) -> Cache | None:
+        """
+        KV cache of the chat prefix holding the system prompt, to start generation from.
+        Enhancement calls share a long, fixed system prompt, so its prefill is computed once per system prompt and
+        device and a copy is handed to every call. Returns ``None`` when ``input_ids`` does not start with the prefix.
+        """
+        if messages[0]["role"] != "system":
+            return None
+        key = (messages[0]["content"], str(self.model.device))
+        if self._system_prompt_cache is None or self._system_prompt_cache[0] != key:
+            prefix_ids = self._chat_prefix_ids(messages[0]["content"]).to(self.model.device)
+            with torch.inference_mode():
+                outputs = self.model(input_ids=prefix_ids, attention_mask=torch.ones_like(prefix_ids), use_cache=True)
+            self._system_prompt_cache = (key, prefix_ids, outputs.past_key_values)
+
+        _, prefix_ids, key_values = self._system_prompt_cache
+        prefix_length = prefix_ids.shape[1]
+        if input_ids.shape[1] <= prefix_length or not torch.equal(input_ids[:, :prefix_length], prefix_ids):
+            return None
+        return copy.deepcopy(key_values)
+
+    def _chat_prefix_ids(self, system_prompt: str) -> torch.Tensor:
+        """Token ids of a chat-templated conversation with ``system_prompt``, up to the user message."""
+        marker = "<ltx-user-message>"
+        messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": marker}]
+        text = self.processor.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+        prefix_ids = self.processor(text=text[: text.index(marker)], return_tensors="pt").input_ids
+        # The last prefix token may be merged with the start of the user message when tokenizing the full chat.
+        return prefix_ids[:, :-1]
+
     def enhance_t2v(
         self,
         prompt: str,
@@ -145,11 +191,11 @@ class GemmaTextEncoderModelBase(torch.nn.Module):
 
     @functools.cached_property
     def default_gemma_i2v_system_prompt(self) -> str:
-        return _load_system_prompt("gemma_i2v_system_prompt.txt")
+        return default_enhancement_system_prompt(with_image=True)
 
     @functools.cached_property
     def default_gemma_t2v_system_prompt(self) -> str:
-        return _load_system_prompt("gemma_t2v_system_prompt.txt")
+        return default_enhancement_system_prompt(with_image=False)
 
     def forward(self, text: str, padding_side: str = "left") -> tuple[torch.Tensor, torch.Tensor]:
         raise NotImplementedError("This method is not implemented for the base class")
@@ -220,12 +266,23 @@ def _load_system_prompt(prompt_name: str) -> str:
         return f.read()
 
 
-def module_ops_from_gemma_root(gemma_root: str) -> tuple[ModuleOps, ...]:
+def default_enhancement_system_prompt(with_image: bool) -> str:
+    """Default system prompt of :meth:`GemmaTextEncoderModelBase.enhance_i2v` or ``enhance_t2v``."""
+    return _load_system_prompt("gemma_i2v_system_prompt.txt" if with_image else "gemma_t2v_system_prompt.txt")
+
+
+def module_ops_from_gemma_root(gemma_root: str, pad_to_multiple_of: int | None = None) -> tuple[ModuleOps, ...]:
+    """
+    Module operations loading the tokenizer and image processor of a Gemma text encoder from ``gemma_root``.
+    Prompts are padded to ``TEXT_MAX_LENGTH`` tokens, or with ``pad_to_multiple_of`` (e.g.
+    ``TEXT_PADDING_MULTIPLE``) to the smallest multiple of it that fits them, which is faster but changes the
+    outputs slightly (see ``TEXT_PADDING_MULTIPLE``).
+    """
     tokenizer_root = str(find_matching_file(gemma_root, "tokenizer.model").parent)
     processor_root = str(find_matching_file(gemma_root, "preprocessor_config.json").parent)
 
     def load_tokenizer(module: GemmaTextEncoderModelBase) -> GemmaTextEncoderModelBase:
-        module.tokenizer = LTXVGemmaTokenizer(tokenizer_root, 1024)
+        module.tokenizer = LTXVGemmaTokenizer(tokenizer_root, TEXT_MAX_LENGTH, pad_to_multiple_of=pad_to_multiple_of)
         return module
 
     def load_processor(module: GemmaTextEncoderModelBase) -> GemmaTextEncoderModelBase:
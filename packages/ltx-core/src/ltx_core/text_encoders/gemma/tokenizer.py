@@ -8,12 +8,14 @@ class LTXVGemmaTokenizer:
     ensuring correct settings and output formatting for downstream consumption.
     """
 
-    def __init__(self, tokenizer_path: str, max_length: int = 256):
+    def __init__(self, tokenizer_path: str, max_length: int = 256, pad_to_multiple_of: int | None = None):
         """
         Initialize the tokenizer.
         Args:
             tokenizer_path (str): Path to the pretrained tokenizer files or model directory.
             max_length (int, optional): Max sequence length for encoding. Defaults to 256.
+            pad_to_multiple_of (int | None, optional): If set, pad to the smallest multiple of this value that fits
+                the (truncated) text instead of always padding to ``max_length``. Defaults to None.
         """
         self.tokenizer = AutoTokenizer.from_pretrained(
             tokenizer_path, local_files_only=True, model_max_length=max_length
@@ -24,6 +26,7 @@ class LTXVGemmaTokenizer:
             self.tokenizer.pad_token = self.tokenizer.eos_token
 
         self.max_length = max_length
+        self.pad_to_multiple_of = pad_to_multiple_of
 
     def tokenize_with_weights(self, text: str, return_word_ids: bool = False) -> dict[str, list[tuple[int, int]]]:
         """
@@ -45,8 +48,9 @@ class LTXVGemmaTokenizer:
         text = text.strip()
         encoded = self.tokenizer(
             text,
-            padding="max_length",
+            padding="max_length" if self.pad_to_multiple_of is None else "longest",
             max_length=self.max_length,
+            pad_to_multiple_of=self.pad_to_multiple_of,
             truncation=True,
             return_tensors="pt",
         )
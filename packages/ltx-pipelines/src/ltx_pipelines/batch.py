@@ -0,0 +1,163 @@
+"""
+Batch generation.
+Runs a JSONL file of generation jobs in a single process. Every line is a job: ``pipeline`` selects the
+subcommand and the remaining keys are its options, using the same names as ``ltx <pipeline>`` (or pass a raw
+``argv`` list), e.g. ``{"pipeline": "distilled", "prompt": "A cat", "seed": 3, "output_path": "cat.mp4"}``.
+Options from ``ltx --config`` are used as defaults for every job. Models are shared between jobs through a
+:class:`ModelCache`, so successive jobs with the same checkpoint, LoRAs and dtype reuse the loaded models.
+A failing job is recorded in the manifest and the batch continues with the next one.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from ltx_pipelines.cli import parse_pipeline_args, pipeline_arg_names, pipeline_argv_names, run_pipeline
+from ltx_pipelines.utils.config import _flatten, config_to_argv
+from ltx_pipelines.utils.model_cache import ModelCache, model_cache_from_args
+from ltx_pipelines.utils.model_resolve import resolve_args_paths
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """A single line of a batch file."""
+
+    index: int
+    id: str
+    pipeline: str
+    argv: list[str]
+
+
+@dataclass
+class BatchJobResult:
+    """Outcome of a batch job, written as one manifest line."""
+
+    index: int
+    id: str
+    pipeline: str
+    status: str
+    output_path: str | None = None
+    error: str | None = None
+    started_at: float | None = None
+    duration_s: float | None = None
+    argv: list[str] | None = None
+
+
+def load_jobs(path: Path, defaults: dict | None = None) -> list[BatchJob]:
+    """
+    Read batch jobs from a JSONL file. Blank lines and lines starting with ``#`` are ignored.
+    ``defaults`` (e.g. a flattened ``--config``) fill in options a job does not set, also for jobs given as a raw
+    ``argv``; defaults the job's pipeline does not accept are ignored, as with ``ltx --config``.
+    """
+    jobs = []
+    arg_names: dict[str, set[str]] = {}
+    for line_number, line in enumerate(Path(path).read_text().splitlines(), start=1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        try:
+            spec = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}:{line_number}: invalid JSON: {e}") from e
+        if not isinstance(spec, dict) or "pipeline" not in spec:
+            raise ValueError(f"{path}:{line_number}: each job must be an object with a 'pipeline' key")
+
+        spec = dict(spec)
+        pipeline = spec.pop("pipeline")
+        job_id = str(spec.pop("id", len(jobs)))
+        if pipeline not in arg_names:
+            try:
+                arg_names[pipeline] = pipeline_arg_names(pipeline)
+            except ValueError:
+                arg_names[pipeline] = set()
+        job_defaults = {k: v for k, v in (defaults or {}).items() if k in arg_names[pipeline]}
+        if "argv" in spec:
+            argv = [str(a) for a in spec.pop("argv")]
+            # Options the job gives replace their defaults, so append options (e.g. --lora) are not collected twice.
+            given = pipeline_argv_names(pipeline, argv) if arg_names[pipeline] else set()
+            argv = config_to_argv({k: v for k, v in job_defaults.items() if k not in given}) + argv
+        else:
+            argv = config_to_argv({**job_defaults, **_flatten(spec)})
+        jobs.append(BatchJob(index=len(jobs), id=job_id, pipeline=pipeline, argv=argv))
+    return jobs
+
+
+def run_batch(
+    jobs: list[BatchJob],
+    manifest_path: Path,
+    run: Callable[[argparse.Namespace], None],
+    skip_existing: bool = False,
+) -> list[BatchJobResult]:
+    """
+    Run ``jobs`` in order with ``run``, appending one :class:`BatchJobResult` per job to ``manifest_path``.
+    Failures (including invalid arguments) are recorded and do not stop the batch.
+    """
+    results = []
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with manifest_path.open("w") as manifest:
+        for job in jobs:
+            result = _run_job(job, run, skip_existing)
+            results.append(result)
+            manifest.write(json.dumps(asdict(result)) + "\n")
+            manifest.flush()
+            logger.info("Batch job %d/%d (%s): %s", job.index + 1, len(jobs), job.id, result.status)
+    return results
+
+
+def _run_job(job: BatchJob, run: Callable[[argparse.Namespace], None], skip_existing: bool) -> BatchJobResult:
+    result = BatchJobResult(index=job.index, id=job.id, pipeline=job.pipeline, status="failed", argv=job.argv)
+    try:
+        args = parse_pipeline_args(job.pipeline, job.argv)
+    except ValueError as e:
+        result.error = str(e)
+        return result
+
+    result.output_path = args.output_path
+    if skip_existing and Path(args.output_path).exists():
+        result.status = "skipped"
+        return result
+
+    result.started_at = time.time()
+    try:
+        run(args)
+        result.status = "succeeded"
+    except Exception as e:
+        logger.exception("Batch job %s failed", job.id)
+        result.error = f"{type(e).__name__}: {e}"
+    result.duration_s = time.time() - result.started_at
+    return result
+
+
+def pipeline_batch_runner(
+    model_cache: ModelCache, cache_dir: str | None = None
+) -> Callable[[argparse.Namespace], None]:
+    """Run parsed pipeline arguments with models shared through ``model_cache``."""
+
+    def run(args: argparse.Namespace) -> None:
+        args.cache_dir = cache_dir
+        resolve_args_paths(args, cache_dir=cache_dir)
+        try:
+            run_pipeline(args, model_cache=model_cache)
+        finally:
+            # The job is done with every model it checked out, so the next one may evict them.
+            model_cache.release_all()
+
+    return run
+
+
+def _run_batch(args: argparse.Namespace, config: dict) -> None:
+    jobs = load_jobs(args.jobs_file, defaults=config)
+    manifest_path = args.manifest or args.jobs_file.with_suffix(".manifest.jsonl")
+    runner = pipeline_batch_runner(model_cache_from_args(args), cache_dir=args.cache_dir)
+    results = run_batch(jobs, manifest_path, runner, skip_existing=args.skip_existing)
+
+    failed = sum(result.status == "failed" for result in results)
+    logger.info("Batch finished: %d jobs, %d failed. Manifest: %s", len(results), failed, manifest_path)
+    if failed:
+        sys.exit(1)
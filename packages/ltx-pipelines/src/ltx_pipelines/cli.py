@@ -2,6 +2,7 @@ import argparse
 import logging
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from ltx_pipelines.utils.args import (
     VideoConditioningAction,
@@ -17,6 +18,11 @@ from ltx_pipelines.utils.config import (
 )
 from ltx_pipelines.utils.model_resolve import resolve_args_paths
 
+if TYPE_CHECKING:
+    from ltx_pipelines.utils.model_cache import ModelCache
+
+PIPELINE_SUBCOMMANDS = ("one-stage", "two-stages", "distilled", "ic-lora", "keyframe-interp")
+
 
 def _subparser_one_stage(
     subparsers: argparse._SubParsersAction,
@@ -90,8 +96,132 @@ def _subparser_keyframe_interp(
     return parser
 
 
-def _build_root_parser() -> argparse.ArgumentParser:
-    root = argparse.ArgumentParser(
+def _add_model_cache_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--gpu-memory-budget",
+        type=float,
+        default=None,
+        help="GiB of accelerator memory warm models may occupy (default: 60%% of the GPU memory).",
+    )
+    parser.add_argument(
+        "--cpu-memory-budget",
+        type=float,
+        default=None,
+        help="GiB of host memory for models parked on CPU (default: unbounded).",
+    )
+    parser.add_argument(
+        "--no-park-on-cpu",
+        dest="park_on_cpu",
+        action="store_false",
+        help="Drop models evicted from the accelerator instead of parking them on CPU.",
+    )
+
+
+def _subparser_serve(
+    subparsers: argparse._SubParsersAction,
+) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(
+        "serve",
+        help="Run a local generation server with a persistent job queue and warm models.",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on (default: 8765).")
+    parser.add_argument(
+        "--unix-socket",
+        type=Path,
+        default=None,
+        help="Listen on this Unix domain socket instead of TCP.",
+    )
+    parser.add_argument(
+        "--state-dir",
+        type=Path,
+        default=Path("~/.cache/ltx/serve").expanduser(),
+        help="Directory where the job queue is persisted (default: ~/.cache/ltx/serve).",
+    )
+    _add_model_cache_args(parser)
+    parser.set_defaults(_run="serve")
+    return parser
+
+
+def _subparser_batch(
+    subparsers: argparse._SubParsersAction,
+) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(
+        "batch",
+        help="Run a JSONL file of generation jobs in one process, reusing models between jobs.",
+    )
+    parser.add_argument(
+        "jobs_file",
+        type=Path,
+        help='JSONL file with one job per line, e.g. {"pipeline": "distilled", "prompt": ..., "seed": 1}.',
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help="Where to write per-job results as JSONL (default: <jobs_file>.manifest.jsonl).",
+    )
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Skip jobs whose output file already exists.",
+    )
+    _add_model_cache_args(parser)
+    parser.set_defaults(_run="batch")
+    return parser
+
+
+def _subparser_repack(
+    subparsers: argparse._SubParsersAction,
+) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(
+        "repack",
+        help="Write the checkpoint components to per-component files that load without key remapping.",
+    )
+    parser.add_argument(
+        "--checkpoint-path",
+        type=str,
+        required=True,
+        help="LTX-2 checkpoint: local path or HuggingFace repo (e.g. repo_id or repo_id:filename).",
+    )
+    parser.add_argument(
+        "--gemma-root",
+        type=str,
+        default=None,
+        help="Gemma text encoder root directory or HuggingFace repo ID. Without it the text encoder is not repacked.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        required=True,
+        help="Directory to write the repacked files to. Pass it as --checkpoint-path to the pipelines.",
+    )
+    parser.add_argument(
+        "--enable-fp8",
+        action="store_true",
+        help="Store the transformer linear weights in FP8, for pipelines run with --enable-fp8.",
+    )
+    parser.add_argument(
+        "--load-workers",
+        type=int,
+        default=8,
+        help="Number of threads reading the checkpoint concurrently (default: 8).",
+    )
+    parser.set_defaults(_run="repack")
+    return parser
+
+
+class _RaisingArgumentParser(argparse.ArgumentParser):
+    """Argument parser that raises :class:`ValueError` instead of exiting on bad arguments."""
+
+    def error(self, message: str) -> None:
+        raise ValueError(f"{self.prog}: {message}")
+
+
+def _build_root_parser(
+    parser_class: type[argparse.ArgumentParser] = argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    root = parser_class(
         prog="ltx",
         description="LTX-2 video generation CLI. Use subcommands to choose a pipeline.",
     )
@@ -113,9 +243,87 @@ def _build_root_parser() -> argparse.ArgumentParser:
     _subparser_distilled(subparsers)
     _subparser_ic_lora(subparsers)
     _subparser_keyframe_interp(subparsers)
+    _subparser_serve(subparsers)
+    _subparser_batch(subparsers)
+    _subparser_repack(subparsers)
     return root
 
 
+def _subcommand_parser(root: argparse.ArgumentParser, subcommand: str) -> argparse.ArgumentParser:
+    subparsers_action = next(a for a in root._actions if getattr(a, "choices", None) is not None)
+    return subparsers_action.choices[subcommand]
+
+
+def parse_pipeline_args(subcommand: str, argv: list[str]) -> argparse.Namespace:
+    """
+    Parse the arguments of one pipeline subcommand (e.g. ``"two-stages"``) without exiting on errors.
+    Model paths are left unresolved; call :func:`resolve_args_paths` before running the pipeline.
+    Raises :class:`ValueError` for unknown subcommands or invalid arguments.
+    """
+    if subcommand not in PIPELINE_SUBCOMMANDS:
+        raise ValueError(f"Unknown pipeline {subcommand!r}, expected one of {', '.join(PIPELINE_SUBCOMMANDS)}")
+    sub_parser = _subcommand_parser(_build_root_parser(_RaisingArgumentParser), subcommand)
+    try:
+        args = sub_parser.parse_args(argv)
+    except SystemExit as e:
+        raise ValueError(f"Invalid arguments for {subcommand}: {argv}") from e
+    args.subcommand = subcommand
+    args.config = None
+    args.cache_dir = None
+    return args
+
+
+def pipeline_arg_names(subcommand: str) -> set[str]:
+    """Destination names of the options accepted by a pipeline subcommand."""
+    if subcommand not in PIPELINE_SUBCOMMANDS:
+        raise ValueError(f"Unknown pipeline {subcommand!r}, expected one of {', '.join(PIPELINE_SUBCOMMANDS)}")
+    return set(_parser_defaults(_subcommand_parser(_build_root_parser(), subcommand)))
+
+
+def pipeline_argv_names(subcommand: str, argv: list[str]) -> set[str]:
+    """Destination names of the options given in ``argv`` for a pipeline subcommand."""
+    if subcommand not in PIPELINE_SUBCOMMANDS:
+        raise ValueError(f"Unknown pipeline {subcommand!r}, expected one of {', '.join(PIPELINE_SUBCOMMANDS)}")
+    actions = _subcommand_parser(_build_root_parser(), subcommand)._option_string_actions
+    options = (arg.split("=", 1)[0] for arg in argv if arg.startswith("-"))
+    return {actions[option].dest for option in options if option in actions}
+
+
+def run_pipeline(args: argparse.Namespace, model_cache: "ModelCache | None" = None) -> None:
+    """Run the pipeline selected by parsed subcommand arguments, optionally reusing models from ``model_cache``."""
+    if getattr(args, "compile", False):
+        from ltx_core.model.compile import configure_compile_cache
+
+        configure_compile_cache(args.compile_cache_dir)
+    if getattr(args, "context_parallel", False):
+        from ltx_pipelines.utils.helpers import init_distributed
+
+        init_distributed()
+    run_name = args._run
+    if run_name == "one_stage":
+        from ltx_pipelines.ti2vid_one_stage import _run_one_stage
+
+        _run_one_stage(args, model_cache=model_cache)
+    elif run_name == "two_stages":
+        from ltx_pipelines.ti2vid_two_stages import _run_two_stages
+
+        _run_two_stages(args, model_cache=model_cache)
+    elif run_name == "distilled":
+        from ltx_pipelines.distilled import _run_distilled
+
+        _run_distilled(args, model_cache=model_cache)
+    elif run_name == "ic_lora":
+        from ltx_pipelines.ic_lora import _run_ic_lora
+
+        _run_ic_lora(args, model_cache=model_cache)
+    elif run_name == "keyframe_interp":
+        from ltx_pipelines.keyframe_interpolation import _run_keyframe_interp
+
+        _run_keyframe_interp(args, model_cache=model_cache)
+    else:
+        raise ValueError(f"Unknown pipeline run {run_name!r}")
+
+
 def main() -> None:
     logging.getLogger().setLevel(logging.INFO)
     root = _build_root_parser()
@@ -123,8 +331,7 @@ def main() -> None:
     config_path = getattr(args, "config", None)
     cache_dir = getattr(args, "cache_dir", None)
     subcommand = args.subcommand
-    subparsers_action = next(a for a in root._actions if getattr(a, "choices", None) is not None)
-    sub_parser = subparsers_action.choices[subcommand]
+    sub_parser = _subcommand_parser(root, subcommand)
     defaults_before = _parser_defaults(sub_parser)
     config = load_config(config_path) if config_path is not None else None
     if config is not None:
@@ -134,23 +341,23 @@ def main() -> None:
         apply_config_to_namespace(sub_parser, full_args, config, defaults_before)
     full_args.config = config_path
     full_args.cache_dir = cache_dir
-    resolve_args_paths(full_args, cache_dir=cache_dir)
     run_name = full_args._run
-    if run_name == "one_stage":
-        from ltx_pipelines.ti2vid_one_stage import _run_one_stage
-        _run_one_stage(full_args)
-    elif run_name == "two_stages":
-        from ltx_pipelines.ti2vid_two_stages import _run_two_stages
-        _run_two_stages(full_args)
-    elif run_name == "distilled":
-        from ltx_pipelines.distilled import _run_distilled
-        _run_distilled(full_args)
-    elif run_name == "ic_lora":
-        from ltx_pipelines.ic_lora import _run_ic_lora
-        _run_ic_lora(full_args)
-    elif run_name == "keyframe_interp":
-        from ltx_pipelines.keyframe_interpolation import _run_keyframe_interp
-        _run_keyframe_interp(full_args)
+    if run_name == "serve":
+        from ltx_pipelines.serve import _run_serve
+
+        _run_serve(full_args)
+    elif run_name == "batch":
+        from ltx_pipelines.batch import _run_batch
+
+        _run_batch(full_args, config or {})
+    elif run_name == "repack":
+        from ltx_pipelines.repack import _run_repack
+
+        resolve_args_paths(full_args, cache_dir=cache_dir)
+        _run_repack(full_args)
+    elif subcommand in PIPELINE_SUBCOMMANDS:
+        resolve_args_paths(full_args, cache_dir=cache_dir)
+        run_pipeline(full_args)
     else:
         root.print_help()
         sys.exit(1)
@@ -6,12 +6,11 @@ import torch
 from ltx_core.components.diffusion_steps import EulerDiffusionStep
 from ltx_core.components.noisers import GaussianNoiser
 from ltx_core.components.protocols import DiffusionStepProtocol
-from ltx_core.loader import LoraPathStrengthAndSDOps
+from ltx_core.loader import FusedWeightCache, LoraPathStrengthAndSDOps, StateDictPrefetcher
 from ltx_core.model.audio_vae import decode_audio as vae_decode_audio
 from ltx_core.model.upsampler import upsample_video
 from ltx_core.model.video_vae import TilingConfig, get_video_chunks_number
 from ltx_core.model.video_vae import decode_video as vae_decode_video
-from ltx_core.text_encoders.gemma import encode_text
 from ltx_core.types import LatentState, VideoPixelShape
 from ltx_pipelines.utils import ModelLedger
 from ltx_pipelines.utils.args import default_2_stage_distilled_arg_parser
@@ -25,12 +24,20 @@ from ltx_pipelines.utils.helpers import (
     cleanup_memory,
     denoise_audio_video,
     euler_denoising_loop,
-    generate_enhanced_prompt,
     get_device,
     image_conditionings_by_replacing_latent,
+    is_main_process,
     simple_denoising_func,
 )
 from ltx_pipelines.utils.media_io import encode_video
+from ltx_pipelines.utils.model_cache import ModelCache
+from ltx_pipelines.utils.model_ledger import fused_lora_cache_from_args
+from ltx_pipelines.utils.text_cache import (
+    TextEmbeddingCache,
+    encode_prompts,
+    enhance_prompt_cached,
+    text_cache_from_args,
+)
 from ltx_pipelines.utils.types import PipelineComponents
 
 device = get_device()
@@ -43,7 +50,7 @@ class DistilledPipeline:
     by 2x and refines with additional denoising steps for higher quality output.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         checkpoint_path: str,
         gemma_root: str,
@@ -51,8 +58,19 @@ class DistilledPipeline:
         loras: list[LoraPathStrengthAndSDOps],
         device: torch.device = device,
         fp8transformer: bool = False,
+        model_cache: ModelCache | None = None,
+        text_cache: TextEmbeddingCache | None = None,
+        prefetch_weights: bool = False,
+        compile_models: bool = False,
+        context_parallel: bool = False,
+        stream_blocks: int = 0,
+        load_workers: int = 0,
+        fused_lora_cache: FusedWeightCache | None = None,
+        runtime_loras: bool = False,
+        text_padding_multiple: int | None = None,
     ):
         self.device = device
+        self.text_cache = text_cache
         self.dtype = torch.bfloat16
 
         self.model_ledger = ModelLedger(
@@ -63,6 +81,15 @@ class DistilledPipeline:
             gemma_root_path=gemma_root,
             loras=loras,
             fp8transformer=fp8transformer,
+            model_cache=model_cache,
+            compile_models=compile_models,
+            context_parallel=context_parallel,
+            stream_blocks=stream_blocks,
+            load_workers=load_workers,
+            fused_lora_cache=fused_lora_cache,
+            runtime_loras=runtime_loras,
+            text_padding_multiple=text_padding_multiple,
+            registry=StateDictPrefetcher() if prefetch_weights else None,
         )
 
         self.pipeline_components = PipelineComponents(
@@ -81,6 +108,7 @@ class DistilledPipeline:
         images: list[tuple[str, int, float]],
         tiling_config: TilingConfig | None = None,
         enhance_prompt: bool = False,
+        residual_cache_threshold: float = 0.0,
     ) -> tuple[Iterator[torch.Tensor], torch.Tensor]:
         assert_resolution(height=height, width=width, is_two_stage=True)
 
@@ -89,19 +117,23 @@ class DistilledPipeline:
         stepper = EulerDiffusionStep()
         dtype = torch.bfloat16
 
-        text_encoder = self.model_ledger.text_encoder()
+        self.model_ledger.prefetch("video_encoder", "transformer")
+        text_encoder = None
         if enhance_prompt:
-            prompt = generate_enhanced_prompt(text_encoder, prompt, images[0][0] if len(images) > 0 else None)
-        context_p = encode_text(text_encoder, prompts=[prompt])[0]
+            prompt, text_encoder = enhance_prompt_cached(
+                self.model_ledger, prompt, images[0][0] if len(images) > 0 else None, text_cache=self.text_cache
+            )
+        context_p = encode_prompts(self.model_ledger, [prompt], self.text_cache, text_encoder)[0]
         video_context, audio_context = context_p
 
         torch.cuda.synchronize()
+        self.model_ledger.release(text_encoder)
         del text_encoder
         cleanup_memory()
 
         # Stage 1: Initial low resolution video generation.
-        video_encoder = self.model_ledger.video_encoder()
-        transformer = self.model_ledger.transformer()
+        video_encoder, transformer = self.model_ledger.models("video_encoder", "transformer")
+        self.model_ledger.prefetch("spatial_upsampler", "video_decoder", "audio_decoder", "vocoder")
         stage_1_sigmas = torch.Tensor(DISTILLED_SIGMA_VALUES).to(self.device)
 
         def denoising_loop(
@@ -116,6 +148,7 @@ class DistilledPipeline:
                     video_context=video_context,
                     audio_context=audio_context,
                     transformer=transformer,  # noqa: F821
+                    residual_cache_threshold=residual_cache_threshold,
                 ),
             )
 
@@ -181,6 +214,7 @@ class DistilledPipeline:
         )
 
         torch.cuda.synchronize()
+        self.model_ledger.release(transformer, video_encoder)
         del transformer
         del video_encoder
         cleanup_memory()
@@ -188,20 +222,28 @@ class DistilledPipeline:
         decoded_video = vae_decode_video(
             video_state.latent, self.model_ledger.video_decoder(), tiling_config, generator
         )
-        decoded_audio = vae_decode_audio(
-            audio_state.latent, self.model_ledger.audio_decoder(), self.model_ledger.vocoder()
-        )
+        decoded_audio = vae_decode_audio(audio_state.latent, *self.model_ledger.models("audio_decoder", "vocoder"))
         return decoded_video, decoded_audio
 
 
 @torch.inference_mode()
-def _run_distilled(args: object) -> None:
+def _run_distilled(args: object, model_cache: ModelCache | None = None) -> None:
     pipeline = DistilledPipeline(
         checkpoint_path=args.checkpoint_path,
         spatial_upsampler_path=args.spatial_upsampler_path,
         gemma_root=args.gemma_root,
         loras=args.lora,
         fp8transformer=args.enable_fp8,
+        model_cache=model_cache,
+        text_cache=text_cache_from_args(args),
+        prefetch_weights=getattr(args, "prefetch_weights", False),
+        compile_models=getattr(args, "compile", False),
+        context_parallel=getattr(args, "context_parallel", False),
+        stream_blocks=getattr(args, "stream_blocks", 0),
+        load_workers=getattr(args, "load_workers", 0),
+        fused_lora_cache=fused_lora_cache_from_args(args),
+        runtime_loras=getattr(args, "runtime_loras", False),
+        text_padding_multiple=getattr(args, "text_padding_multiple", None),
     )
     tiling_config = TilingConfig.default()
     video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
@@ -215,15 +257,17 @@ def _run_distilled(args: object) -> None:
         images=args.images,
         tiling_config=tiling_config,
         enhance_prompt=getattr(args, "enhance_prompt", False),
+        residual_cache_threshold=getattr(args, "residual_cache_threshold", 0.0),
     )
-    encode_video(
-        video=video,
-        fps=args.frame_rate,
-        audio=audio,
-        audio_sample_rate=AUDIO_SAMPLE_RATE,
-        output_path=args.output_path,
-        video_chunks_number=video_chunks_number,
-    )
+    if is_main_process():
+        encode_video(
+            video=video,
+            fps=args.frame_rate,
+            audio=audio,
+            audio_sample_rate=AUDIO_SAMPLE_RATE,
+            output_path=args.output_path,
+            video_chunks_number=video_chunks_number,
+        )
 
 
 @torch.inference_mode()
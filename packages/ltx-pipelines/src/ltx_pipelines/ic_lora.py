@@ -8,12 +8,11 @@ from ltx_core.components.diffusion_steps import EulerDiffusionStep
 from ltx_core.components.noisers import GaussianNoiser
 from ltx_core.components.protocols import DiffusionStepProtocol
 from ltx_core.conditioning import ConditioningItem, VideoConditionByReferenceLatent
-from ltx_core.loader import LoraPathStrengthAndSDOps
+from ltx_core.loader import FusedWeightCache, LoraPathStrengthAndSDOps, StateDictPrefetcher
 from ltx_core.model.audio_vae import decode_audio as vae_decode_audio
 from ltx_core.model.upsampler import upsample_video
 from ltx_core.model.video_vae import TilingConfig, VideoEncoder, get_video_chunks_number
 from ltx_core.model.video_vae import decode_video as vae_decode_video
-from ltx_core.text_encoders.gemma import encode_text
 from ltx_core.types import LatentState, VideoPixelShape
 from ltx_pipelines.utils import ModelLedger
 from ltx_pipelines.utils.args import VideoConditioningAction, default_2_stage_distilled_arg_parser
@@ -27,12 +26,20 @@ from ltx_pipelines.utils.helpers import (
     cleanup_memory,
     denoise_audio_video,
     euler_denoising_loop,
-    generate_enhanced_prompt,
     get_device,
     image_conditionings_by_replacing_latent,
+    is_main_process,
     simple_denoising_func,
 )
 from ltx_pipelines.utils.media_io import encode_video, load_video_conditioning
+from ltx_pipelines.utils.model_cache import ModelCache
+from ltx_pipelines.utils.model_ledger import fused_lora_cache_from_args
+from ltx_pipelines.utils.text_cache import (
+    TextEmbeddingCache,
+    encode_prompts,
+    enhance_prompt_cached,
+    text_cache_from_args,
+)
 from ltx_pipelines.utils.types import PipelineComponents
 
 device = get_device()
@@ -48,7 +55,7 @@ class ICLoraPipeline:
     by 2x and refines with additional denoising steps for higher quality output.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         checkpoint_path: str,
         spatial_upsampler_path: str,
@@ -56,8 +63,20 @@ class ICLoraPipeline:
         loras: list[LoraPathStrengthAndSDOps],
         device: torch.device = device,
         fp8transformer: bool = False,
+        model_cache: ModelCache | None = None,
+        text_cache: TextEmbeddingCache | None = None,
+        prefetch_weights: bool = False,
+        compile_models: bool = False,
+        context_parallel: bool = False,
+        stream_blocks: int = 0,
+        load_workers: int = 0,
+        fused_lora_cache: FusedWeightCache | None = None,
+        runtime_loras: bool = False,
+        text_padding_multiple: int | None = None,
     ):
         self.dtype = torch.bfloat16
+        # Both stages share the prefetcher, so stage 2 weights can be read while stage 1 runs.
+        registry = StateDictPrefetcher() if prefetch_weights else None
         self.stage_1_model_ledger = ModelLedger(
             dtype=self.dtype,
             device=device,
@@ -66,6 +85,15 @@ class ICLoraPipeline:
             gemma_root_path=gemma_root,
             loras=loras,
             fp8transformer=fp8transformer,
+            model_cache=model_cache,
+            compile_models=compile_models,
+            context_parallel=context_parallel,
+            stream_blocks=stream_blocks,
+            load_workers=load_workers,
+            fused_lora_cache=fused_lora_cache,
+            runtime_loras=runtime_loras,
+            text_padding_multiple=text_padding_multiple,
+            registry=registry,
         )
         self.stage_2_model_ledger = ModelLedger(
             dtype=self.dtype,
@@ -75,12 +103,22 @@ class ICLoraPipeline:
             gemma_root_path=gemma_root,
             loras=[],
             fp8transformer=fp8transformer,
+            model_cache=model_cache,
+            compile_models=compile_models,
+            context_parallel=context_parallel,
+            stream_blocks=stream_blocks,
+            load_workers=load_workers,
+            fused_lora_cache=fused_lora_cache,
+            runtime_loras=runtime_loras,
+            text_padding_multiple=text_padding_multiple,
+            registry=registry,
         )
         self.pipeline_components = PipelineComponents(
             dtype=self.dtype,
             device=device,
         )
         self.device = device
+        self.text_cache = text_cache
 
         # Read reference downscale factor from LoRA metadata.
         # IC-LoRAs trained with low-resolution reference videos store this factor
@@ -98,7 +136,7 @@ class ICLoraPipeline:
                 self.reference_downscale_factor = scale
 
     @torch.inference_mode()
-    def __call__(
+    def __call__(  # noqa: PLR0913
         self,
         prompt: str,
         seed: int,
@@ -109,6 +147,7 @@ class ICLoraPipeline:
         images: list[tuple[str, int, float]],
         video_conditioning: list[tuple[str, float]],
         enhance_prompt: bool = False,
+        residual_cache_threshold: float = 0.0,
         tiling_config: TilingConfig | None = None,
     ) -> tuple[Iterator[torch.Tensor], torch.Tensor]:
         assert_resolution(height=height, width=width, is_two_stage=True)
@@ -118,21 +157,30 @@ class ICLoraPipeline:
         stepper = EulerDiffusionStep()
         dtype = torch.bfloat16
 
-        text_encoder = self.stage_1_model_ledger.text_encoder()
-
+        self.stage_1_model_ledger.prefetch("video_encoder", "transformer")
+        text_encoder = None
         if enhance_prompt:
-            prompt = generate_enhanced_prompt(
-                text_encoder, prompt, images[0][0] if len(images) > 0 else None, seed=seed
+            prompt, text_encoder = enhance_prompt_cached(
+                self.stage_1_model_ledger,
+                prompt,
+                images[0][0] if len(images) > 0 else None,
+                seed=seed,
+                text_cache=self.text_cache,
             )
-        video_context, audio_context = encode_text(text_encoder, prompts=[prompt])[0]
+        video_context, audio_context = encode_prompts(
+            self.stage_1_model_ledger, [prompt], self.text_cache, text_encoder
+        )[0]
 
         torch.cuda.synchronize()
+        self.stage_1_model_ledger.release(text_encoder)
         del text_encoder
         cleanup_memory()
 
         # Stage 1: Initial low resolution video generation.
-        video_encoder = self.stage_1_model_ledger.video_encoder()
-        transformer = self.stage_1_model_ledger.transformer()
+        video_encoder, transformer = self.stage_1_model_ledger.models("video_encoder", "transformer")
+        self.stage_2_model_ledger.prefetch(
+            "spatial_upsampler", "transformer", "video_decoder", "audio_decoder", "vocoder"
+        )
         stage_1_sigmas = torch.Tensor(DISTILLED_SIGMA_VALUES).to(self.device)
 
         def first_stage_denoising_loop(
@@ -147,6 +195,7 @@ class ICLoraPipeline:
                     video_context=video_context,
                     audio_context=audio_context,
                     transformer=transformer,  # noqa: F821
+                    residual_cache_threshold=residual_cache_threshold,
                 ),
             )
 
@@ -178,6 +227,7 @@ class ICLoraPipeline:
         )
 
         torch.cuda.synchronize()
+        self.stage_1_model_ledger.release(transformer)
         del transformer
         cleanup_memory()
 
@@ -235,6 +285,8 @@ class ICLoraPipeline:
         )
 
         torch.cuda.synchronize()
+        self.stage_2_model_ledger.release(transformer)
+        self.stage_1_model_ledger.release(video_encoder)
         del transformer
         del video_encoder
         cleanup_memory()
@@ -243,7 +295,7 @@ class ICLoraPipeline:
             video_state.latent, self.stage_2_model_ledger.video_decoder(), tiling_config, generator
         )
         decoded_audio = vae_decode_audio(
-            audio_state.latent, self.stage_2_model_ledger.audio_decoder(), self.stage_2_model_ledger.vocoder()
+            audio_state.latent, *self.stage_2_model_ledger.models("audio_decoder", "vocoder")
         )
         return decoded_video, decoded_audio
 
@@ -298,13 +350,23 @@ class ICLoraPipeline:
 
 
 @torch.inference_mode()
-def _run_ic_lora(args: object) -> None:
+def _run_ic_lora(args: object, model_cache: ModelCache | None = None) -> None:
     pipeline = ICLoraPipeline(
         checkpoint_path=args.checkpoint_path,
         spatial_upsampler_path=args.spatial_upsampler_path,
         gemma_root=args.gemma_root,
         loras=args.lora,
         fp8transformer=args.enable_fp8,
+        model_cache=model_cache,
+        text_cache=text_cache_from_args(args),
+        prefetch_weights=getattr(args, "prefetch_weights", False),
+        compile_models=getattr(args, "compile", False),
+        context_parallel=getattr(args, "context_parallel", False),
+        stream_blocks=getattr(args, "stream_blocks", 0),
+        load_workers=getattr(args, "load_workers", 0),
+        fused_lora_cache=fused_lora_cache_from_args(args),
+        runtime_loras=getattr(args, "runtime_loras", False),
+        text_padding_multiple=getattr(args, "text_padding_multiple", None),
     )
     tiling_config = TilingConfig.default()
     video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
@@ -318,15 +380,17 @@ def _run_ic_lora(args: object) -> None:
         images=args.images,
         video_conditioning=args.video_conditioning,
         tiling_config=tiling_config,
+        residual_cache_threshold=getattr(args, "residual_cache_threshold", 0.0),
     )
-    encode_video(
-        video=video,
-        fps=args.frame_rate,
-        audio=audio,
-        audio_sample_rate=AUDIO_SAMPLE_RATE,
-        output_path=args.output_path,
-        video_chunks_number=video_chunks_number,
-    )
+    if is_main_process():
+        encode_video(
+            video=video,
+            fps=args.frame_rate,
+            audio=audio,
+            audio_sample_rate=AUDIO_SAMPLE_RATE,
+            output_path=args.output_path,
+            video_chunks_number=video_chunks_number,
+        )
 
 
 @torch.inference_mode()
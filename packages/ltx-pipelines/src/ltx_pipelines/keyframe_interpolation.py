@@ -8,12 +8,11 @@ from ltx_core.components.guiders import MultiModalGuider, MultiModalGuiderParams
 from ltx_core.components.noisers import GaussianNoiser
 from ltx_core.components.protocols import DiffusionStepProtocol
 from ltx_core.components.schedulers import LTX2Scheduler
-from ltx_core.loader import LoraPathStrengthAndSDOps
+from ltx_core.loader import FusedWeightCache, LoraPathStrengthAndSDOps, StateDictPrefetcher
 from ltx_core.model.audio_vae import decode_audio as vae_decode_audio
 from ltx_core.model.upsampler import upsample_video
 from ltx_core.model.video_vae import TilingConfig, get_video_chunks_number
 from ltx_core.model.video_vae import decode_video as vae_decode_video
-from ltx_core.text_encoders.gemma import encode_text
 from ltx_core.types import LatentState, VideoPixelShape
 from ltx_pipelines.utils import ModelLedger
 from ltx_pipelines.utils.args import default_2_stage_arg_parser
@@ -26,13 +25,21 @@ from ltx_pipelines.utils.helpers import (
     cleanup_memory,
     denoise_audio_video,
     euler_denoising_loop,
-    generate_enhanced_prompt,
     get_device,
     image_conditionings_by_adding_guiding_latent,
+    is_main_process,
     multi_modal_guider_denoising_func,
     simple_denoising_func,
 )
 from ltx_pipelines.utils.media_io import encode_video
+from ltx_pipelines.utils.model_cache import ModelCache
+from ltx_pipelines.utils.model_ledger import fused_lora_cache_from_args
+from ltx_pipelines.utils.text_cache import (
+    TextEmbeddingCache,
+    encode_prompts,
+    enhance_prompt_cached,
+    text_cache_from_args,
+)
 from ltx_pipelines.utils.types import PipelineComponents
 
 device = get_device()
@@ -46,7 +53,7 @@ class KeyframeInterpolationPipeline:
     by 2x and refines with additional denoising steps for higher quality output.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         checkpoint_path: str,
         distilled_lora: list[LoraPathStrengthAndSDOps],
@@ -55,8 +62,19 @@ class KeyframeInterpolationPipeline:
         loras: list[LoraPathStrengthAndSDOps],
         device: torch.device = device,
         fp8transformer: bool = False,
+        model_cache: ModelCache | None = None,
+        text_cache: TextEmbeddingCache | None = None,
+        prefetch_weights: bool = False,
+        compile_models: bool = False,
+        context_parallel: bool = False,
+        stream_blocks: int = 0,
+        load_workers: int = 0,
+        fused_lora_cache: FusedWeightCache | None = None,
+        runtime_loras: bool = False,
+        text_padding_multiple: int | None = None,
     ):
         self.device = device
+        self.text_cache = text_cache
         self.dtype = torch.bfloat16
         self.stage_1_model_ledger = ModelLedger(
             dtype=self.dtype,
@@ -66,7 +84,17 @@ class KeyframeInterpolationPipeline:
             gemma_root_path=gemma_root,
             loras=loras,
             fp8transformer=fp8transformer,
+            model_cache=model_cache,
+            compile_models=compile_models,
+            context_parallel=context_parallel,
+            stream_blocks=stream_blocks,
+            load_workers=load_workers,
+            fused_lora_cache=fused_lora_cache,
+            runtime_loras=runtime_loras,
+            text_padding_multiple=text_padding_multiple,
+            registry=StateDictPrefetcher() if prefetch_weights else None,
         )
+        self.distilled_lora = distilled_lora
         self.stage_2_model_ledger = self.stage_1_model_ledger.with_loras(
             loras=distilled_lora,
         )
@@ -91,6 +119,7 @@ class KeyframeInterpolationPipeline:
         images: list[tuple[str, int, float]],
         tiling_config: TilingConfig | None = None,
         enhance_prompt: bool = False,
+        residual_cache_threshold: float = 0.0,
     ) -> tuple[Iterator[torch.Tensor], torch.Tensor]:
         assert_resolution(height=height, width=width, is_two_stage=True)
 
@@ -99,22 +128,32 @@ class KeyframeInterpolationPipeline:
         stepper = EulerDiffusionStep()
         dtype = torch.bfloat16
 
-        text_encoder = self.stage_1_model_ledger.text_encoder()
+        self.stage_1_model_ledger.prefetch("video_encoder", "transformer")
+        text_encoder = None
         if enhance_prompt:
-            prompt = generate_enhanced_prompt(
-                text_encoder, prompt, images[0][0] if len(images) > 0 else None, seed=seed
+            prompt, text_encoder = enhance_prompt_cached(
+                self.stage_1_model_ledger,
+                prompt,
+                images[0][0] if len(images) > 0 else None,
+                seed=seed,
+                text_cache=self.text_cache,
             )
-        context_p, context_n = encode_text(text_encoder, prompts=[prompt, negative_prompt])
+        context_p, context_n = encode_prompts(
+            self.stage_1_model_ledger, [prompt, negative_prompt], self.text_cache, text_encoder
+        )
         v_context_p, a_context_p = context_p
         v_context_n, a_context_n = context_n
 
         torch.cuda.synchronize()
+        self.stage_1_model_ledger.release(text_encoder)
         del text_encoder
         cleanup_memory()
 
         # Stage 1: Initial low resolution video generation.
-        video_encoder = self.stage_1_model_ledger.video_encoder()
-        transformer = self.stage_1_model_ledger.transformer()
+        video_encoder, transformer = self.stage_1_model_ledger.models("video_encoder", "transformer")
+        self.stage_2_model_ledger.prefetch("spatial_upsampler")
+        self.stage_1_model_ledger.prefetch_loras(self.distilled_lora)
+        self.stage_2_model_ledger.prefetch("video_decoder", "audio_decoder", "vocoder")
         sigmas = LTX2Scheduler().execute(steps=num_inference_steps).to(dtype=torch.float32, device=self.device)
 
         def first_stage_denoising_loop(
@@ -137,6 +176,7 @@ class KeyframeInterpolationPipeline:
                     v_context=v_context_p,
                     a_context=a_context_p,
                     transformer=transformer,  # noqa: F821
+                    residual_cache_threshold=residual_cache_threshold,
                 ),
             )
 
@@ -168,7 +208,6 @@ class KeyframeInterpolationPipeline:
         )
 
         torch.cuda.synchronize()
-        del transformer
         cleanup_memory()
 
         # Stage 2: Upsample and refine the video at higher resolution with distilled LORA.
@@ -181,7 +220,6 @@ class KeyframeInterpolationPipeline:
         torch.cuda.synchronize()
         cleanup_memory()
 
-        transformer = self.stage_2_model_ledger.transformer()
         distilled_sigmas = torch.Tensor(STAGE_2_DISTILLED_SIGMA_VALUES).to(self.device)
 
         def second_stage_denoising_loop(
@@ -208,22 +246,25 @@ class KeyframeInterpolationPipeline:
             dtype=dtype,
             device=self.device,
         )
-        video_state, audio_state = denoise_audio_video(
-            output_shape=stage_2_output_shape,
-            conditionings=stage_2_conditionings,
-            noiser=noiser,
-            sigmas=distilled_sigmas,
-            stepper=stepper,
-            denoising_loop_fn=second_stage_denoising_loop,
-            components=self.pipeline_components,
-            dtype=dtype,
-            device=self.device,
-            noise_scale=distilled_sigmas[0],
-            initial_video_latent=upscaled_video_latent,
-            initial_audio_latent=audio_state.latent,
-        )
+        # The stage 1 transformer is reused with the distilled LoRA fused in place, instead of being rebuilt.
+        with self.stage_1_model_ledger.fused_loras(transformer, self.distilled_lora):
+            video_state, audio_state = denoise_audio_video(
+                output_shape=stage_2_output_shape,
+                conditionings=stage_2_conditionings,
+                noiser=noiser,
+                sigmas=distilled_sigmas,
+                stepper=stepper,
+                denoising_loop_fn=second_stage_denoising_loop,
+                components=self.pipeline_components,
+                dtype=dtype,
+                device=self.device,
+                noise_scale=distilled_sigmas[0],
+                initial_video_latent=upscaled_video_latent,
+                initial_audio_latent=audio_state.latent,
+            )
 
         torch.cuda.synchronize()
+        self.stage_1_model_ledger.release(transformer, video_encoder)
         del transformer
         del video_encoder
         cleanup_memory()
@@ -232,13 +273,13 @@ class KeyframeInterpolationPipeline:
             video_state.latent, self.stage_2_model_ledger.video_decoder(), tiling_config, generator
         )
         decoded_audio = vae_decode_audio(
-            audio_state.latent, self.stage_2_model_ledger.audio_decoder(), self.stage_2_model_ledger.vocoder()
+            audio_state.latent, *self.stage_2_model_ledger.models("audio_decoder", "vocoder")
         )
         return decoded_video, decoded_audio
 
 
 @torch.inference_mode()
-def _run_keyframe_interp(args: object) -> None:
+def _run_keyframe_interp(args: object, model_cache: ModelCache | None = None) -> None:
     pipeline = KeyframeInterpolationPipeline(
         checkpoint_path=args.checkpoint_path,
         distilled_lora=args.distilled_lora,
@@ -246,6 +287,16 @@ def _run_keyframe_interp(args: object) -> None:
         gemma_root=args.gemma_root,
         loras=args.lora,
         fp8transformer=args.enable_fp8,
+        model_cache=model_cache,
+        text_cache=text_cache_from_args(args),
+        prefetch_weights=getattr(args, "prefetch_weights", False),
+        compile_models=getattr(args, "compile", False),
+        context_parallel=getattr(args, "context_parallel", False),
+        stream_blocks=getattr(args, "stream_blocks", 0),
+        load_workers=getattr(args, "load_workers", 0),
+        fused_lora_cache=fused_lora_cache_from_args(args),
+        runtime_loras=getattr(args, "runtime_loras", False),
+        text_padding_multiple=getattr(args, "text_padding_multiple", None),
     )
     tiling_config = TilingConfig.default()
     video_chunks_number = get_video_chunks_number(args.num_frames, tiling_config)
@@ -277,15 +328,17 @@ def _run_keyframe_interp(args: object) -> None:
         images=args.images,
         tiling_config=tiling_config,
         enhance_prompt=getattr(args, "enhance_prompt", False),
+        residual_cache_threshold=getattr(args, "residual_cache_threshold", 0.0),
     )
-    encode_video(
-        video=video,
-        fps=args.frame_rate,
-        audio=audio,
-        audio_sample_rate=AUDIO_SAMPLE_RATE,
-        output_path=args.output_path,
-        video_chunks_number=video_chunks_number,
-    )
+    if is_main_process():
+        encode_video(
+            video=video,
+            fps=args.frame_rate,
+            audio=audio,
+            audio_sample_rate=AUDIO_SAMPLE_RATE,
+            output_path=args.output_path,
+            video_chunks_number=video_chunks_number,
+        )
 
 
 @torch.inference_mode()
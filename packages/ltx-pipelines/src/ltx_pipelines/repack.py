@@ -0,0 +1,32 @@
+"""
+Checkpoint repacking.
+Writes the components of an LTX-2 checkpoint (transformer, video VAE encoder and decoder, audio VAE decoder,
+vocoder and the text encoder weights it holds) to one safetensors file each, with final key names, final dtypes
+and the model config embedded. Pass the output directory as ``--checkpoint-path`` to any pipeline: the loaders
+recognize the repacked files and read them as stored, skipping key remapping and dtype or FP8 conversion.
+Repack with ``--enable-fp8`` for pipelines run with ``--enable-fp8``.
+"""
+
+import argparse
+import logging
+import time
+
+import torch
+
+from ltx_pipelines.utils.model_ledger import ModelLedger
+
+logger = logging.getLogger(__name__)
+
+
+def _run_repack(args: argparse.Namespace) -> None:
+    ledger = ModelLedger(
+        dtype=torch.bfloat16,
+        device=torch.device("cpu"),
+        checkpoint_path=args.checkpoint_path,
+        gemma_root_path=args.gemma_root,
+        fp8transformer=args.enable_fp8,
+        load_workers=args.load_workers,
+    )
+    started = time.perf_counter()
+    paths = ledger.repack(args.output_dir)
+    logger.info("Repacked %d components into %s in %.1f s", len(paths), args.output_dir, time.perf_counter() - started)
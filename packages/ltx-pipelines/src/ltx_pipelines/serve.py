@@ -0,0 +1,330 @@
+"""
+Local generation server.
+Runs the LTX-2 pipelines behind a small JSON-over-HTTP API (TCP or Unix socket) with a persistent job
+queue. Jobs are executed one at a time by a worker thread that shares a :class:`ModelCache`, so models
+stay warm between jobs instead of being reloaded per request.
+### Endpoints
+- ``GET /health``: server status and queue length.
+- ``GET /jobs``: all known jobs.
+- ``POST /jobs``: submit ``{"pipeline": "two-stages", "args": {"prompt": "...", ...}}`` or
+  ``{"pipeline": ..., "argv": ["--prompt", "...", ...]}``. Arguments are the same as for ``ltx <pipeline>``.
+- ``GET /jobs/<id>``: job status.
+- ``POST /jobs/<id>/cancel`` or ``DELETE /jobs/<id>``: cancel a queued or running job.
+"""
+
+import argparse
+import json
+import logging
+import queue
+import socketserver
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from ltx_pipelines.cli import parse_pipeline_args, run_pipeline
+from ltx_pipelines.utils.config import config_to_argv
+from ltx_pipelines.utils.helpers import GenerationCancelledError, cancellable
+from ltx_pipelines.utils.model_cache import ModelCache, model_cache_from_args
+from ltx_pipelines.utils.model_resolve import resolve_args_paths
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class Job:
+    """A single generation request and its lifecycle."""
+
+    id: str
+    pipeline: str
+    argv: list[str]
+    output_path: str | None = None
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "status": self.status.value}
+
+    @staticmethod
+    def from_dict(data: dict) -> "Job":
+        return Job(**{**data, "status": JobStatus(data["status"])})
+
+
+JobRunner = Callable[[Job, threading.Event], None]
+
+
+class JobQueue:
+    """
+    FIFO of generation jobs executed one at a time by a background worker.
+    Every state change is written to ``state_dir/jobs/<id>.json``; on start-up, jobs that were queued or
+    running when the previous server stopped are queued again.
+    ### Constructor parameters
+    runner:
+        Callable executing a job. It receives the job and an event that is set when the job is cancelled;
+        raising :class:`GenerationCancelledError` marks the job cancelled, any other exception marks it failed.
+    state_dir:
+        Directory used to persist jobs, or ``None`` to keep them in memory only.
+    """
+
+    def __init__(self, runner: JobRunner, state_dir: Path | None = None):
+        self.runner = runner
+        self.state_dir = state_dir
+        self._jobs: dict[str, Job] = {}
+        self._cancel_events: dict[str, threading.Event] = {}
+        self._pending: queue.Queue[str | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        if state_dir is not None:
+            self._load()
+
+    def submit(self, pipeline: str, argv: list[str], output_path: str | None = None) -> Job:
+        job = Job(id=uuid.uuid4().hex, pipeline=pipeline, argv=list(argv), output_path=output_path)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._cancel_events[job.id] = threading.Event()
+            self._persist(job)
+        self._pending.put(job.id)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(job.status == JobStatus.QUEUED for job in self._jobs.values())
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Cancel a job. Queued jobs are cancelled immediately, running jobs at the next denoising step."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == JobStatus.QUEUED:
+                job.status = JobStatus.CANCELLED
+                job.finished_at = time.time()
+                self._persist(job)
+            elif job.status == JobStatus.RUNNING:
+                self._cancel_events[job_id].set()
+            return job
+
+    def start(self) -> None:
+        self._worker = threading.Thread(target=self._work, name="ltx-serve-worker", daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._pending.put(None)
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def _work(self) -> None:
+        while (job_id := self._pending.get()) is not None:
+            with self._lock:
+                job = self._jobs[job_id]
+                if job.status != JobStatus.QUEUED:
+                    continue
+                job.status = JobStatus.RUNNING
+                job.started_at = time.time()
+                cancel_event = self._cancel_events[job_id]
+                self._persist(job)
+
+            logger.info("Running job %s (%s)", job.id, job.pipeline)
+            try:
+                self.runner(job, cancel_event)
+                status, error = JobStatus.SUCCEEDED, None
+            except GenerationCancelledError:
+                status, error = JobStatus.CANCELLED, None
+            except Exception as e:
+                logger.exception("Job %s failed", job.id)
+                status, error = JobStatus.FAILED, f"{type(e).__name__}: {e}"
+
+            with self._lock:
+                job.status = status
+                job.error = error
+                job.finished_at = time.time()
+                self._persist(job)
+            logger.info("Job %s %s", job.id, job.status.value)
+
+    def _job_path(self, job_id: str) -> Path:
+        return self.state_dir / "jobs" / f"{job_id}.json"
+
+    def _persist(self, job: Job) -> None:
+        if self.state_dir is None:
+            return
+        path = self._job_path(job.id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(job.to_dict()))
+        tmp_path.replace(path)
+
+    def _load(self) -> None:
+        jobs_dir = self.state_dir / "jobs"
+        if not jobs_dir.is_dir():
+            return
+        jobs = []
+        for path in jobs_dir.glob("*.json"):
+            try:
+                jobs.append(Job.from_dict(json.loads(path.read_text())))
+            except (ValueError, TypeError, KeyError):
+                logger.warning("Ignoring unreadable job file %s", path)
+        for job in sorted(jobs, key=lambda job: job.created_at):
+            self._jobs[job.id] = job
+            self._cancel_events[job.id] = threading.Event()
+            if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+                job.status = JobStatus.QUEUED
+                job.started_at = None
+                self._persist(job)
+                self._pending.put(job.id)
+
+
+def pipeline_job_runner(model_cache: ModelCache, cache_dir: str | None = None) -> JobRunner:
+    """Job runner executing the ``ltx`` pipelines with models shared through ``model_cache``."""
+
+    def run(job: Job, cancel_event: threading.Event) -> None:
+        args = parse_pipeline_args(job.pipeline, job.argv)
+        args.cache_dir = cache_dir
+        resolve_args_paths(args, cache_dir=cache_dir)
+        try:
+            with cancellable(cancel_event):
+                run_pipeline(args, model_cache=model_cache)
+        finally:
+            # The job is done with every model it checked out, so the next one may evict them.
+            model_cache.release_all()
+
+    return run
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over a :class:`JobQueue` attached to the server as ``server.job_queue``."""
+
+    server_version = "ltx-serve"
+
+    @property
+    def job_queue(self) -> JobQueue:
+        return self.server.job_queue
+
+    def do_GET(self) -> None:
+        parts = self._path_parts()
+        if parts == ["health"]:
+            self._send_json(HTTPStatus.OK, {"status": "ok", "queued": self.job_queue.pending_count()})
+        elif parts == ["jobs"]:
+            self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in self.job_queue.jobs()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            self._send_job(self.job_queue.get(parts[1]))
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+
+    def do_POST(self) -> None:
+        parts = self._path_parts()
+        if parts == ["jobs"]:
+            self._submit()
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            self._send_job(self.job_queue.cancel(parts[1]))
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+
+    def do_DELETE(self) -> None:
+        parts = self._path_parts()
+        if len(parts) == 2 and parts[0] == "jobs":
+            self._send_job(self.job_queue.cancel(parts[1]))
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _submit(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            pipeline = body["pipeline"]
+            argv = [str(a) for a in body["argv"]] if "argv" in body else config_to_argv(body.get("args", {}))
+            args = parse_pipeline_args(pipeline, argv)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        job = self.job_queue.submit(pipeline, argv, output_path=args.output_path)
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict())
+
+    def _path_parts(self) -> list[str]:
+        return [part for part in self.path.split("?", 1)[0].split("/") if part]
+
+    def _send_job(self, job: Job | None) -> None:
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "Unknown job")
+        else:
+            self._send_json(HTTPStatus.OK, job.to_dict())
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json(status, {"error": message})
+
+    def _send_json(self, status: HTTPStatus, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def create_server(
+    job_queue: JobQueue,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_socket: Path | None = None,
+) -> socketserver.BaseServer:
+    """Create an HTTP server exposing ``job_queue`` on a TCP address or a Unix domain socket."""
+    if unix_socket is not None:
+        unix_socket.unlink(missing_ok=True)
+        server = ThreadingUnixHTTPServer(str(unix_socket), JobRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), JobRequestHandler)
+        server.daemon_threads = True
+    server.job_queue = job_queue
+    return server
+
+
+def _run_serve(args: argparse.Namespace) -> None:
+    model_cache = model_cache_from_args(args)
+    job_queue = JobQueue(runner=pipeline_job_runner(model_cache, cache_dir=args.cache_dir), state_dir=args.state_dir)
+    server = create_server(job_queue, host=args.host, port=args.port, unix_socket=args.unix_socket)
+    job_queue.start()
+    address = args.unix_socket if args.unix_socket is not None else f"http://{args.host}:{args.port}"
+    logger.info("Serving LTX-2 pipelines on %s (state in %s)", address, args.state_dir)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.server_close()
+        job_queue.stop(timeout=0)
+        if args.unix_socket is not None:
+            args.unix_socket.unlink(missing_ok=True)
@@ -8,10 +8,9 @@ from ltx_core.components.guiders import MultiModalGuider, MultiModalGuiderParams
 from ltx_core.components.noisers import GaussianNoiser
 from ltx_core.components.protocols import DiffusionStepProtocol
 from ltx_core.components.schedulers import LTX2Scheduler
-from ltx_core.loader import LoraPathStrengthAndSDOps
+from ltx_core.loader import FusedWeightCache, LoraPathStrengthAndSDOps, StateDictPrefetcher
 from ltx_core.model.audio_vae import decode_audio as vae_decode_audio
 from ltx_core.model.video_vae import decode_video as vae_decode_video
-from ltx_core.text_encoders.gemma import encode_text
 from ltx_core.types import LatentState, VideoPixelShape
 from ltx_pipelines.utils import ModelLedger
 from ltx_pipelines.utils.args import default_1_stage_arg_parser
@@ -21,12 +20,20 @@ from ltx_pipelines.utils.helpers import (
     cleanup_memory,
     denoise_audio_video,
     euler_denoising_loop,
-    generate_enhanced_prompt,
     get_device,
     image_conditionings_by_replacing_latent,
+    is_main_process,
     multi_modal_guider_denoising_func,
 )
 from ltx_pipelines.utils.media_io import encode_video
+from ltx_pipelines.utils.model_cache import ModelCache
+from ltx_pipelines.utils.model_ledger import fused_lora_cache_from_args
+from ltx_pipelines.utils.text_cache import (
+    TextEmbeddingCache,
+    encode_prompts,
+    enhance_prompt_cached,
+    text_cache_from_args,
+)
 from ltx_pipelines.utils.types import PipelineComponents
 
 device = get_device()
@@ -40,16 +47,27 @@ class TI2VidOneStagePipeline:
     the images parameter.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         checkpoint_path: str,
         gemma_root: str,
         loras: list[LoraPathStrengthAndSDOps],
         device: torch.device = device,
         fp8transformer: bool = False,
+        model_cache: ModelCache | None = None,
+        text_cache: TextEmbeddingCache | None = None,
+        prefetch_weights: bool = False,
+        compile_models: bool = False,
+        context_parallel: bool = False,
+        stream_blocks: int = 0,
+        load_workers: int = 0,
+        fused_lora_cache: FusedWeightCache | None = None,
+        runtime_loras: bool = False,
+        text_padding_multiple: int | None = None,
     ):
         self.dtype = torch.bfloat16
         self.device = device
+        self.text_cache = text_cache
         self.model_ledger = ModelLedger(
             dtype=self.dtype,
             device=device,
@@ -57,6 +75,15 @@ class TI2VidOneStagePipeline:
             gemma_root_path=gemma_root,
             loras=loras,
             fp8transformer=fp8transformer,
+            model_cache=model_cache,
+            compile_models=compile_models,
+            context_parallel=context_parallel,
+            stream_blocks=stream_blocks,
+            load_workers=load_workers,
+            fused_lora_cache=fused_lora_cache,
+            runtime_loras=runtime_loras,
+            text_padding_multiple=text_padding_multiple,
+            registry=StateDictPrefetcher() if prefetch_weights else None,
         )
         self.pipeline_components = PipelineComponents(
             dtype=self.dtype,
@@ -77,6 +104,7 @@ class TI2VidOneStagePipeline:
         audio_guider_params: MultiModalGuiderParams,
         images: list[tuple[str, int, float]],
         enhance_prompt: bool = False,
+        residual_cache_threshold: float = 0.0,
     ) -> tuple[Iterator[torch.Tensor], torch.Tensor]:
         assert_resolution(height=height, width=width, is_two_stage=False)
 
@@ -85,22 +113,30 @@ class TI2VidOneStagePipeline:
         stepper = EulerDiffusionStep()
         dtype = torch.bfloat16
 
-        text_encoder = self.model_ledger.text_encoder()
+        self.model_ledger.prefetch("video_encoder", "transformer")
+        text_encoder = None
         if enhance_prompt:
-            prompt = generate_enhanced_prompt(
-                text_encoder, prompt, images[0][0] if len(images) > 0 else None, seed=seed
+            prompt, text_encoder = enhance_prompt_cached(
+                self.model_ledger,
+                prompt,
+                images[0][0] if len(images) > 0 else None,
+                seed=seed,
+                text_cache=self.text_cache,
             )
-        context_p, context_n = encode_text(text_encoder, prompts=[prompt, negative_prompt])
+        context_p, context_n = encode_prompts(
+            self.model_ledger, [prompt, negative_prompt], self.text_cache, text_encoder
+        )
         v_context_p, a_context_p = context_p
         v_context_n, a_context_n = context_n
 
         torch.cuda.synchronize()
+        self.model_ledger.release(text_encoder)
         del text_encoder
         cleanup_memory()
 
         # Stage 1: Initial low resolution video generation.
-        video_encoder = self.model_ledger.video_encoder()
-        transformer = self.model_ledger.transformer()
+        video_encoder, transformer = self.model_ledger.models("video_encoder", "transformer")
+        self.model_ledger.prefetch("video_decoder", "audio_decoder", "vocoder")
         sigmas = LTX2Scheduler().execute(steps=num_inference_steps).to(dtype=torch.float32, device=self.device)
 
         def first_stage_denoising_loop(
@@ -123,6 +159,7 @@ class TI2VidOneStagePipeline:
                     v_context=v_context_p,
                     a_context=a_context_p,
                     transformer=transformer,  # noqa: F821
+                    residual_cache_threshold=residual_cache_threshold,
                 ),
             )
 
@@ -149,24 +186,34 @@ class TI2VidOneStagePipeline:
         )
 
         torch.cuda.synchronize()
+        self.model_ledger.release(transformer, video_encoder)
         del transformer
+        del video_encoder
         cleanup_memory()
 
         decoded_video = vae_decode_video(video_state.latent, self.model_ledger.video_decoder(), generator=generator)
-        decoded_audio = vae_decode_audio(
-            audio_state.latent, self.model_ledger.audio_decoder(), self.model_ledger.vocoder()
-        )
+        decoded_audio = vae_decode_audio(audio_state.latent, *self.model_ledger.models("audio_decoder", "vocoder"))
 
         return decoded_video, decoded_audio
 
 
 @torch.inference_mode()
-def _run_one_stage(args: object) -> None:
+def _run_one_stage(args: object, model_cache: ModelCache | None = None) -> None:
     pipeline = TI2VidOneStagePipeline(
         checkpoint_path=args.checkpoint_path,
         gemma_root=args.gemma_root,
         loras=args.lora,
         fp8transformer=args.enable_fp8,
+        model_cache=model_cache,
+        text_cache=text_cache_from_args(args),
+        prefetch_weights=getattr(args, "prefetch_weights", False),
+        compile_models=getattr(args, "compile", False),
+        context_parallel=getattr(args, "context_parallel", False),
+        stream_blocks=getattr(args, "stream_blocks", 0),
+        load_workers=getattr(args, "load_workers", 0),
+        fused_lora_cache=fused_lora_cache_from_args(args),
+        runtime_loras=getattr(args, "runtime_loras", False),
+        text_padding_multiple=getattr(args, "text_padding_multiple", None),
     )
     video, audio = pipeline(
         prompt=args.prompt,
@@ -195,15 +242,17 @@ def _run_one_stage(args: object) -> None:
         ),
         images=args.images,
         enhance_prompt=getattr(args, "enhance_prompt", False),
+        residual_cache_threshold=getattr(args, "residual_cache_threshold", 0.0),
     )
-    encode_video(
-        video=video,
-        fps=args.frame_rate,
-        audio=audio,
-        audio_sample_rate=AUDIO_SAMPLE_RATE,
-        output_path=args.output_path,
-        video_chunks_number=1,
-    )
+    if is_main_process():
+        encode_video(
+            video=video,
+            fps=args.frame_rate,
+            audio=audio,
+            audio_sample_rate=AUDIO_SAMPLE_RATE,
+            output_path=args.output_path,
+            video_chunks_number=1,
+        )
 
 
 @torch.inference_mode()
@@ -89,7 +89,8 @@ def basic_arg_parser(cli_model_paths_raw: bool = False) -> argparse.ArgumentPars
         "--checkpoint-path",
         type=path_type,
         required=True,
-        help="LTX-2 checkpoint: local path or HuggingFace repo (e.g. repo_id or repo_id:filename).",
+        help="LTX-2 checkpoint: local path (a checkpoint file or a directory written by `ltx repack`) or "
+        "HuggingFace repo (e.g. repo_id or repo_id:filename).",
     )
     parser.add_argument(
         "--gemma-root",
@@ -187,6 +188,95 @@ def basic_arg_parser(cli_model_paths_raw: bool = False) -> argparse.ArgumentPars
         "Note that calculations are still performed in bfloat16 precision.",
     )
     parser.add_argument("--enhance-prompt", action="store_true")
+    parser.add_argument(
+        "--text-cache-dir",
+        type=resolve_path,
+        default=None,
+        help="Directory of a persistent cache of text encoder outputs. Prompts found in the cache are not "
+        "re-encoded, and the text encoder is not loaded when all prompts are cached (default: disabled).",
+    )
+    parser.add_argument(
+        "--residual-cache-threshold",
+        type=float,
+        default=0.0,
+        help="Reuse the transformer block residual of the last computed step while the accumulated relative change "
+        "of the block input stays below this threshold, skipping the blocks on that step. Applies to the first "
+        "stage (both stages of the distilled pipeline, which share a denoising loop). Higher values are faster with "
+        "more quality loss; 0.05 is a conservative start (default: 0, off).",
+    )
+    parser.add_argument(
+        "--prefetch-weights",
+        action="store_true",
+        help="Read the weights of the next pipeline stage into pinned host memory on a background thread while the "
+        "current stage runs. Overlaps disk reads with compute at the cost of host memory for the prefetched weights.",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="Compile the transformer blocks, video decoder and vocoder with torch.compile. Input shapes that vary "
+        "(resolution, frame count, batch) are dynamic, so each part compiles once; the first run takes longer. "
+        "Falls back to eager execution on CPU and for parts that fail to compile.",
+    )
+    parser.add_argument(
+        "--compile-cache-dir",
+        type=resolve_path,
+        default="~/.cache/ltx/compile",
+        help="Directory compiled kernels and graphs are persisted in with --compile, so later runs start warm "
+        "(default: ~/.cache/ltx/compile).",
+    )
+    parser.add_argument(
+        "--context-parallel",
+        action="store_true",
+        help="Split the video and audio tokens of the transformer across the processes of a torchrun launch "
+        "(e.g. torchrun --nproc-per-node 4 -m ltx_pipelines.cli ...), one GPU each, exchanging them around "
+        "attention. Lowers the latency and per-GPU activation memory of long or high-resolution videos; the "
+        "attention head count must be divisible by the number of processes. Rank 0 writes the output.",
+    )
+    parser.add_argument(
+        "--stream-blocks",
+        type=int,
+        default=0,
+        metavar="WINDOW",
+        help="Keep the transformer blocks in pinned host memory and stream them to the GPU with WINDOW blocks "
+        "resident at a time, copying the next ones while a block runs. Runs a transformer that does not fit on "
+        "the GPU at the cost of host-to-device copies; larger windows hide more of them (default: 0, the whole "
+        "transformer stays on the GPU).",
+    )
+    parser.add_argument(
+        "--load-workers",
+        type=int,
+        default=0,
+        help="Number of threads reading checkpoint files concurrently. Coalesces small tensors into larger reads "
+        "and logs the achieved throughput; 0 memory-maps the checkpoint files instead (default: 0).",
+    )
+    parser.add_argument(
+        "--fused-lora-cache-dir",
+        type=resolve_path,
+        default=None,
+        help="Directory of a persistent cache of transformer weights with the LoRAs fused in. Runs with a checkpoint, "
+        "LoRAs, strengths and FP8 mode seen before load the fused weights instead of fusing them (default: disabled).",
+    )
+    parser.add_argument(
+        "--fused-lora-cache-size",
+        type=float,
+        default=200.0,
+        help="GiB the fused LoRA weight cache may occupy; least recently used entries are evicted (default: 200).",
+    )
+    parser.add_argument(
+        "--runtime-loras",
+        action="store_true",
+        help="Apply the LoRAs as low-rank adapters while the transformer runs instead of fusing them into its "
+        "weights. Leaves the base (possibly FP8) weights untouched, so a served transformer switches LoRAs or "
+        "strengths between jobs in milliseconds, at the cost of two small matrix multiplications per adapted layer.",
+    )
+    parser.add_argument(
+        "--text-padding-multiple",
+        type=int,
+        default=None,
+        help="Pad prompts to the smallest multiple of this many tokens that fits them (128, the embeddings "
+        "connectors' register count) instead of to 1024 tokens. Encodes prompts and runs text cross-attention "
+        "faster, but fewer registers enter the context, so outputs differ slightly (default: pad to 1024).",
+    )
     return parser
 
 
@@ -63,3 +63,26 @@ def apply_config_to_namespace(
             continue
         if getattr(namespace, k, None) == defaults_before.get(k):
             setattr(namespace, k, v)
+
+
+def config_to_argv(config: dict) -> list[str]:
+    """
+    Convert a mapping of option names to values into command-line arguments.
+    ``True`` becomes a bare flag, ``False``/``None`` are omitted, a flat list becomes one flag followed by its
+    items and a list of lists repeats the flag per item (e.g. ``{"lora": [["a.safetensors", 0.8]]}``).
+    """
+    argv: list[str] = []
+    for key, value in config.items():
+        flag = "--" + _normalize_key(key).replace("_", "-")
+        if value is None or value is False:
+            continue
+        if value is True:
+            argv.append(flag)
+        elif isinstance(value, (list, tuple)) and value and all(isinstance(v, (list, tuple)) for v in value):
+            for group in value:
+                argv.extend([flag, *(str(v) for v in group)])
+        elif isinstance(value, (list, tuple)):
+            argv.extend([flag, *(str(v) for v in value)])
+        else:
+            argv.extend([flag, str(value)])
+    return argv
@@ -1,8 +1,14 @@
 import gc
 import logging
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import replace
 
 import torch
+import torch.distributed as dist
 from tqdm import tqdm
 
 from ltx_core.components.guiders import MultiModalGuider
@@ -19,7 +25,8 @@ from ltx_core.guidance.perturbations import (
     PerturbationConfig,
     PerturbationType,
 )
-from ltx_core.model.transformer import Modality, X0Model
+from ltx_core.model.transformer import CrossAttentionCache, Modality, ResidualCache, X0Model
+from ltx_core.model.transformer.rope import FREQS_CIS_CACHE
 from ltx_core.model.video_vae import VideoEncoder
 from ltx_core.text_encoders.gemma import GemmaTextEncoderModelBase
 from ltx_core.tools import AudioLatentTools, LatentTools, VideoLatentTools
@@ -39,7 +46,51 @@ def get_device() -> torch.device:
     return torch.device("cpu")
 
 
+def init_distributed() -> None:
+    """
+    Join the process group of a ``torchrun`` launch (``WORLD_SIZE``, ``RANK`` and ``LOCAL_RANK`` environment
+    variables): NCCL with one GPU per local rank, made the current device, or Gloo without CUDA. A no-op for a
+    single process or when the group is already initialized. Call before any model or tensor is placed on CUDA.
+    """
+    if dist.is_initialized() or int(os.environ.get("WORLD_SIZE", "1")) <= 1:
+        return
+    if torch.cuda.is_available():
+        torch.cuda.set_device(int(os.environ.get("LOCAL_RANK", "0")))
+        dist.init_process_group("nccl")
+    else:
+        dist.init_process_group("gloo")
+
+
+def is_main_process() -> bool:
+    """Whether this process writes outputs: always, unless it is a rank other than 0 of a process group."""
+    return not dist.is_initialized() or dist.get_rank() == 0
+
+
+_cancel_event: ContextVar[threading.Event | None] = ContextVar("ltx_cancel_event", default=None)
+
+
+class GenerationCancelledError(RuntimeError):
+    """Raised inside a denoising loop when the surrounding :func:`cancellable` event is set."""
+
+
+@contextmanager
+def cancellable(event: threading.Event) -> Iterator[None]:
+    """Make denoising loops run in this context stop at the next step once ``event`` is set."""
+    token = _cancel_event.set(event)
+    try:
+        yield
+    finally:
+        _cancel_event.reset(token)
+
+
+def raise_if_cancelled() -> None:
+    event = _cancel_event.get()
+    if event is not None and event.is_set():
+        raise GenerationCancelledError("Generation cancelled")
+
+
 def cleanup_memory() -> None:
+    FREQS_CIS_CACHE.clear()
     gc.collect()
     torch.cuda.empty_cache()
     torch.cuda.synchronize()
@@ -137,6 +188,7 @@ def euler_denoising_loop(
         audio latent states after completing the denoising loop.
     """
     for step_idx, _ in enumerate(tqdm(sigmas[:-1])):
+        raise_if_cancelled()
         denoised_video, denoised_audio = denoise_fn(video_state, audio_state, sigmas, step_idx)
 
         denoised_video = post_process_latent(denoised_video, video_state.denoise_mask, video_state.clean_latent)
@@ -187,6 +239,7 @@ def gradient_estimating_euler_denoising_loop(
         return current_velocity, denoised_sample
 
     for step_idx, _ in enumerate(tqdm(sigmas[:-1])):
+        raise_if_cancelled()
         denoised_video, denoised_audio = denoise_fn(video_state, audio_state, sigmas, step_idx)
 
         denoised_video = post_process_latent(denoised_video, video_state.denoise_mask, video_state.clean_latent)
@@ -337,9 +390,27 @@ def timesteps_from_mask(denoise_mask: torch.Tensor, sigma: float | torch.Tensor)
     return denoise_mask * sigma
 
 
+def _residual_cache(threshold: float) -> ResidualCache | None:
+    return ResidualCache(threshold) if threshold > 0 else None
+
+
 def simple_denoising_func(
-    video_context: torch.Tensor, audio_context: torch.Tensor, transformer: X0Model
+    video_context: torch.Tensor,
+    audio_context: torch.Tensor,
+    transformer: X0Model,
+    cache_cross_attention: bool = True,
+    residual_cache_threshold: float = 0.0,
 ) -> DenoisingFunc:
+    """
+    Denoising function running a single conditional pass per step.
+    With ``cache_cross_attention`` the text context projections and cross-attention keys/values are computed on
+    the first step and reused by the following ones (see :class:`CrossAttentionCache`). A positive
+    ``residual_cache_threshold`` skips the transformer blocks on steps whose input barely changed (see
+    :class:`ResidualCache`).
+    """
+    cross_attention_cache = CrossAttentionCache() if cache_cross_attention else None
+    residual_cache = _residual_cache(residual_cache_threshold)
+
     def simple_denoising_step(
         video_state: LatentState, audio_state: LatentState, sigmas: torch.Tensor, step_index: int
     ) -> tuple[torch.Tensor, torch.Tensor]:
@@ -347,7 +418,13 @@ def simple_denoising_func(
         pos_video = modality_from_latent_state(video_state, video_context, sigma)
         pos_audio = modality_from_latent_state(audio_state, audio_context, sigma)
 
-        denoised_video, denoised_audio = transformer(video=pos_video, audio=pos_audio, perturbations=None)
+        denoised_video, denoised_audio = transformer(
+            video=pos_video,
+            audio=pos_audio,
+            perturbations=None,
+            cross_attention_cache=cross_attention_cache,
+            residual_cache=residual_cache,
+        )
         return denoised_video, denoised_audio
 
     return simple_denoising_step
@@ -360,7 +437,13 @@ def guider_denoising_func(
     a_context_p: torch.Tensor,
     a_context_n: torch.Tensor,
     transformer: X0Model,
+    cache_cross_attention: bool = True,
+    residual_cache_threshold: float = 0.0,
 ) -> DenoisingFunc:
+    cross_attention_cache = CrossAttentionCache() if cache_cross_attention else None
+    pos_residual_cache = _residual_cache(residual_cache_threshold)
+    neg_residual_cache = _residual_cache(residual_cache_threshold)
+
     def guider_denoising_step(
         video_state: LatentState, audio_state: LatentState, sigmas: torch.Tensor, step_index: int
     ) -> tuple[torch.Tensor, torch.Tensor]:
@@ -368,12 +451,24 @@ def guider_denoising_func(
         pos_video = modality_from_latent_state(video_state, v_context_p, sigma)
         pos_audio = modality_from_latent_state(audio_state, a_context_p, sigma)
 
-        denoised_video, denoised_audio = transformer(video=pos_video, audio=pos_audio, perturbations=None)
+        denoised_video, denoised_audio = transformer(
+            video=pos_video,
+            audio=pos_audio,
+            perturbations=None,
+            cross_attention_cache=cross_attention_cache,
+            residual_cache=pos_residual_cache,
+        )
         if guider.enabled():
             neg_video = modality_from_latent_state(video_state, v_context_n, sigma)
             neg_audio = modality_from_latent_state(audio_state, a_context_n, sigma)
 
-            neg_denoised_video, neg_denoised_audio = transformer(video=neg_video, audio=neg_audio, perturbations=None)
+            neg_denoised_video, neg_denoised_audio = transformer(
+                video=neg_video,
+                audio=neg_audio,
+                perturbations=None,
+                cross_attention_cache=cross_attention_cache,
+                residual_cache=neg_residual_cache,
+            )
 
             denoised_video = denoised_video + guider.delta(denoised_video, neg_denoised_video)
             denoised_audio = denoised_audio + guider.delta(denoised_audio, neg_denoised_audio)
@@ -383,13 +478,122 @@ def guider_denoising_func(
     return guider_denoising_step
 
 
-def multi_modal_guider_denoising_func(
+def pad_context(modality: Modality, length: int) -> Modality:
+    """Right-pad the text context of a modality to ``length`` tokens.
+    Padding tokens are zeros masked out of cross-attention through ``context_mask`` (created if missing), so the
+    transformer output does not change.
+    """
+    context = modality.context
+    context_mask = modality.context_mask
+    if context_mask is None:
+        context_mask = torch.ones(context.shape[:2], dtype=torch.int64, device=context.device)
+    padding = length - context.shape[1]
+    return replace(
+        modality,
+        context=torch.nn.functional.pad(context, (0, 0, 0, padding)),
+        context_mask=torch.nn.functional.pad(context_mask, (0, padding)),
+    )
+
+
+def concat_modalities(modalities: list[Modality]) -> Modality:
+    """Concatenate modalities along the batch dimension.
+    All modalities must share the same enabled flag and token lengths. Text contexts of different lengths (prompts
+    padded to different multiples of the connector register count) are padded to the longest one with
+    :func:`pad_context`.
+    """
+    context_length = max(m.context.shape[1] for m in modalities)
+    if any(m.context.shape[1] != context_length or m.context_mask is not None for m in modalities):
+        modalities = [pad_context(m, context_length) for m in modalities]
+    first = modalities[0]
+    return replace(
+        first,
+        latent=torch.cat([m.latent for m in modalities], dim=0),
+        timesteps=torch.cat([m.timesteps for m in modalities], dim=0),
+        positions=torch.cat([m.positions for m in modalities], dim=0),
+        context=torch.cat([m.context for m in modalities], dim=0),
+        context_mask=(
+            torch.cat([m.context_mask for m in modalities], dim=0) if first.context_mask is not None else None
+        ),
+    )
+
+
+def batched_guidance_forward(
+    transformer: X0Model,
+    passes: list[tuple[Modality, Modality, PerturbationConfig]],
+    cross_attention_cache: CrossAttentionCache | None = None,
+    residual_cache: ResidualCache | None = None,
+) -> list[tuple[torch.Tensor, torch.Tensor]]:
+    """Run several guidance passes through the transformer as batched forwards.
+    Each pass is a (video, audio, perturbation config) triple. Passes that can share a forward (same enabled
+    flags and context dims) are concatenated along the batch dimension, with the perturbation config
+    repeated for every sample of its pass, so weights are read once per group instead of once per pass.
+    Outputs are split back per pass, in the order the passes were given. Passes given the same modality objects
+    (e.g. the positive and the STG pass) are only concatenated once: the transformer runs the blocks before the
+    first one a pass perturbs once for all of them. ``residual_cache`` is only used when all passes share a
+    single forward, since it follows one batch layout across steps.
+    """
+    groups: dict[tuple, list[int]] = {}
+    for pass_idx, (video, audio, _) in enumerate(passes):
+        key = (
+            video.enabled,
+            audio.enabled,
+            video.context.shape[2:],
+            audio.context.shape[2:],
+        )
+        groups.setdefault(key, []).append(pass_idx)
+
+    if len(groups) > 1:
+        residual_cache = None
+
+    results: list[tuple[torch.Tensor, torch.Tensor] | None] = [None] * len(passes)
+    for indices in groups.values():
+        sizes = [passes[i][0].latent.shape[0] for i in indices]
+        perturbations = BatchedPerturbationConfig(
+            perturbations=[passes[i][2] for i, size in zip(indices, sizes, strict=True) for _ in range(size)]
+        )
+        inputs: list[int] = []
+        offsets: dict[int, int] = {}
+        sample_sources = []
+        for i, size in zip(indices, sizes, strict=True):
+            source = next((j for j in inputs if passes[j][0] is passes[i][0] and passes[j][1] is passes[i][1]), i)
+            if source == i:
+                offsets[i] = sum(sizes[indices.index(j)] for j in inputs)
+                inputs.append(i)
+            sample_sources.extend(range(offsets[source], offsets[source] + size))
+        denoised_video, denoised_audio = transformer(
+            video=concat_modalities([passes[i][0] for i in inputs]),
+            audio=concat_modalities([passes[i][1] for i in inputs]),
+            perturbations=perturbations,
+            cross_attention_cache=cross_attention_cache,
+            residual_cache=residual_cache,
+            sample_sources=sample_sources if len(inputs) < len(indices) else None,
+        )
+        video_chunks = denoised_video.split(sizes) if denoised_video is not None else [None] * len(indices)
+        audio_chunks = denoised_audio.split(sizes) if denoised_audio is not None else [None] * len(indices)
+        for pass_idx, video_chunk, audio_chunk in zip(indices, video_chunks, audio_chunks, strict=True):
+            results[pass_idx] = (video_chunk, audio_chunk)
+
+    return results
+
+
+def multi_modal_guider_denoising_func(  # noqa: PLR0915
     video_guider: MultiModalGuider,
     audio_guider: MultiModalGuider,
     v_context: torch.Tensor,
     a_context: torch.Tensor,
     transformer: X0Model,
+    cache_cross_attention: bool = True,
+    residual_cache_threshold: float = 0.0,
 ) -> DenoisingFunc:
+    """Denoising function applying multi-modal guidance (CFG, STG, modality isolation) to video and audio.
+    The positive, negative, perturbed and modality-isolated passes a step needs are run through
+    :func:`batched_guidance_forward`, so in the common case a step costs a single transformer forward.
+    With ``cache_cross_attention`` the text context projections and cross-attention keys/values of the batched
+    contexts are computed once and reused by the following steps. A positive ``residual_cache_threshold`` skips
+    the transformer blocks of the batched forward on steps whose input barely changed (see :class:`ResidualCache`).
+    """
+    cross_attention_cache = CrossAttentionCache() if cache_cross_attention else None
+    residual_cache = _residual_cache(residual_cache_threshold)
     last_denoised_video = None
     last_denoised_audio = None
 
@@ -409,10 +613,9 @@ def multi_modal_guider_denoising_func(
             audio_state, a_context, sigma, enabled=not audio_guider.should_skip_step(step_index)
         )
 
-        denoised_video, denoised_audio = transformer(
-            video=pos_video_modality, audio=pos_audio_modality, perturbations=None
-        )
-        neg_denoised_video, neg_denoised_audio = 0.0, 0.0
+        passes = [(pos_video_modality, pos_audio_modality, PerturbationConfig.empty())]
+
+        neg_idx = None
         if video_guider.do_unconditional_generation() or audio_guider.do_unconditional_generation():
             if video_guider.do_unconditional_generation() and video_guider.negative_context is None:
                 raise ValueError("Negative context is required for unconditioned denoising")
@@ -432,12 +635,10 @@ def multi_modal_guider_denoising_func(
                 else pos_audio_modality.context,
                 sigma,
             )
+            neg_idx = len(passes)
+            passes.append((neg_video_modality, neg_audio_modality, PerturbationConfig.empty()))
 
-            neg_denoised_video, neg_denoised_audio = transformer(
-                video=neg_video_modality, audio=neg_audio_modality, perturbations=None
-            )
-
-        ptb_denoised_video, ptb_denoised_audio = 0.0, 0.0
+        ptb_idx = None
         if video_guider.do_perturbed_generation() or audio_guider.do_perturbed_generation():
             perturbations = []
             if video_guider.do_perturbed_generation():
@@ -448,25 +649,23 @@ def multi_modal_guider_denoising_func(
                 perturbations.append(
                     Perturbation(type=PerturbationType.SKIP_AUDIO_SELF_ATTN, blocks=audio_guider.params.stg_blocks)
                 )
-            perturbation_config = PerturbationConfig(perturbations=perturbations)
-            ptb_denoised_video, ptb_denoised_audio = transformer(
-                video=pos_video_modality,
-                audio=pos_audio_modality,
-                perturbations=BatchedPerturbationConfig(perturbations=[perturbation_config]),
-            )
+            ptb_idx = len(passes)
+            passes.append((pos_video_modality, pos_audio_modality, PerturbationConfig(perturbations=perturbations)))
 
-        mod_denoised_video, mod_denoised_audio = 0.0, 0.0
+        mod_idx = None
         if video_guider.do_isolated_modality_generation() or audio_guider.do_isolated_modality_generation():
             perturbations = [
                 Perturbation(type=PerturbationType.SKIP_A2V_CROSS_ATTN, blocks=None),
                 Perturbation(type=PerturbationType.SKIP_V2A_CROSS_ATTN, blocks=None),
             ]
-            perturbation_config = PerturbationConfig(perturbations=perturbations)
-            mod_denoised_video, mod_denoised_audio = transformer(
-                video=pos_video_modality,
-                audio=pos_audio_modality,
-                perturbations=BatchedPerturbationConfig(perturbations=[perturbation_config]),
-            )
+            mod_idx = len(passes)
+            passes.append((pos_video_modality, pos_audio_modality, PerturbationConfig(perturbations=perturbations)))
+
+        outputs = batched_guidance_forward(transformer, passes, cross_attention_cache, residual_cache)
+        denoised_video, denoised_audio = outputs[0]
+        neg_denoised_video, neg_denoised_audio = outputs[neg_idx] if neg_idx is not None else (0.0, 0.0)
+        ptb_denoised_video, ptb_denoised_audio = outputs[ptb_idx] if ptb_idx is not None else (0.0, 0.0)
+        mod_denoised_video, mod_denoised_audio = outputs[mod_idx] if mod_idx is not None else (0.0, 0.0)
 
         if video_guider.should_skip_step(step_index):
             denoised_video = last_denoised_video
@@ -1,4 +1,6 @@
 import math
+import queue
+import threading
 from collections.abc import Generator, Iterator
 from fractions import Fraction
 from io import BytesIO
@@ -13,6 +15,9 @@ from tqdm import tqdm
 
 from ltx_pipelines.utils.constants import DEFAULT_IMAGE_CRF
 
+# Decoded chunks waiting to be encoded. Bounds the host memory held when encoding falls behind decoding.
+MAX_QUEUED_VIDEO_CHUNKS = 2
+
 
 def resize_aspect_ratio_preserving(image: torch.Tensor, long_side: int) -> torch.Tensor:
     """
@@ -179,6 +184,32 @@ def _resample_audio(
         container.mux(packet)
 
 
+def _encode_video_chunks(
+    container: av.container.Container,
+    stream: av.video.VideoStream,
+    chunks: queue.Queue[np.ndarray | None],
+    errors: list[BaseException],
+) -> None:
+    """
+    Encode and mux the chunks put on ``chunks`` until ``None`` is received, then flush the encoder.
+    Runs on its own thread; an error is stored in ``errors`` and the remaining chunks are discarded.
+    """
+    try:
+        while (video_chunk := chunks.get()) is not None:
+            for frame_array in video_chunk:
+                frame = av.VideoFrame.from_ndarray(frame_array, format="rgb24")
+                for packet in stream.encode(frame):
+                    container.mux(packet)
+
+        # Flush encoder
+        for packet in stream.encode():
+            container.mux(packet)
+    except BaseException as e:
+        errors.append(e)
+        while chunks.get() is not None:
+            pass
+
+
 def encode_video(
     video: torch.Tensor | Iterator[torch.Tensor],
     fps: int,
@@ -186,7 +217,14 @@ def encode_video(
     audio_sample_rate: int | None,
     output_path: str,
     video_chunks_number: int,
+    max_queued_chunks: int = MAX_QUEUED_VIDEO_CHUNKS,
 ) -> None:
+    """
+    Write ``video`` (a tensor or an iterator of ``[f, h, w, c]`` uint8 chunks, e.g. from
+    :func:`~ltx_core.model.video_vae.decode_video`) and optional ``audio`` to an H.264/AAC file.
+    Chunks are colour-converted and encoded on a background thread while the next chunk is produced, with at most
+    ``max_queued_chunks`` decoded chunks waiting to be encoded.
+    """
     if isinstance(video, torch.Tensor):
         video = iter([video])
 
@@ -212,16 +250,23 @@ def encode_video(
         yield first_chunk
         yield from tiles_generator
 
-    for video_chunk in tqdm(all_tiles(first_chunk, video), total=video_chunks_number):
-        video_chunk_cpu = video_chunk.to("cpu").numpy()
-        for frame_array in video_chunk_cpu:
-            frame = av.VideoFrame.from_ndarray(frame_array, format="rgb24")
-            for packet in stream.encode(frame):
-                container.mux(packet)
-
-    # Flush encoder
-    for packet in stream.encode():
-        container.mux(packet)
+    chunks: queue.Queue[np.ndarray | None] = queue.Queue(maxsize=max_queued_chunks)
+    errors: list[BaseException] = []
+    encoder = threading.Thread(
+        target=_encode_video_chunks, args=(container, stream, chunks, errors), name="ltx-video-encoder"
+    )
+    encoder.start()
+    try:
+        for video_chunk in tqdm(all_tiles(first_chunk, video), total=video_chunks_number):
+            if errors:
+                break
+            chunks.put(video_chunk.to("cpu").numpy())
+    finally:
+        chunks.put(None)
+        encoder.join()
+    if errors:
+        container.close()
+        raise errors[0]
 
     if audio is not None:
         _write_audio(container, audio_stream, audio, audio_sample_rate)
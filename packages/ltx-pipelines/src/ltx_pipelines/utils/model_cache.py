@@ -0,0 +1,211 @@
+import argparse
+import gc
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+from typing import TypeVar
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+ModuleT = TypeVar("ModuleT", bound=torch.nn.Module)
+
+_CPU = torch.device("cpu")
+
+GIB = 1024**3
+
+# Share of a CUDA device's memory cached models may occupy when no budget is given, leaving the rest for
+# activations.
+DEFAULT_GPU_BUDGET_FRACTION = 0.6
+
+
+def module_nbytes(module: torch.nn.Module) -> int:
+    """Number of bytes held by the parameters and buffers of a module."""
+    tensors = [*module.parameters(), *module.buffers()]
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def _release_memory() -> None:
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def _describe(key: Hashable) -> Hashable:
+    return key[0] if isinstance(key, tuple) and key else key
+
+
+@dataclass
+class _ResidentModule:
+    module: torch.nn.Module
+    device: torch.device
+    nbytes: int
+    checkouts: int = 0
+
+
+class ModelCache:
+    """
+    Keeps built models resident across :class:`~ltx_pipelines.utils.ModelLedger` calls and pipeline invocations.
+    Entries are evicted least-recently-used when a device exceeds its byte budget. With ``park_on_cpu``
+    enabled, a model evicted from an accelerator is moved to CPU instead of being dropped, so a later
+    request only pays a host-to-device copy. Every :meth:`get_or_build` checks a model out until it is handed
+    back with :meth:`release` (or :meth:`release_all`); checked-out models (e.g. a transformer used by a running
+    pipeline) are never evicted, and the budget is exceeded instead.
+    ### Constructor parameters
+    device_budgets:
+        Byte budget per device, keyed by device string (``"cuda:1"``) or device type (``"cuda"``, ``"cpu"``).
+        CUDA devices without a budget get ``gpu_budget_fraction`` of their memory, other devices are unbounded.
+    park_on_cpu:
+        If ``True``, evicted accelerator models are moved to CPU (subject to the ``"cpu"`` budget)
+        instead of being deleted.
+    gpu_budget_fraction:
+        Fraction of the total memory of a CUDA device used as its budget when ``device_budgets`` has none.
+        ``None`` leaves such devices unbounded.
+    """
+
+    def __init__(
+        self,
+        device_budgets: Mapping[str, int] | None = None,
+        park_on_cpu: bool = True,
+        gpu_budget_fraction: float | None = DEFAULT_GPU_BUDGET_FRACTION,
+    ):
+        self.device_budgets = dict(device_budgets or {})
+        self.park_on_cpu = park_on_cpu
+        self.gpu_budget_fraction = gpu_budget_fraction
+        self._entries: OrderedDict[Hashable, _ResidentModule] = OrderedDict()
+        self._known_sizes: dict[Hashable, int] = {}
+        self._lock = threading.RLock()
+
+    def get_or_build(
+        self,
+        key: Hashable,
+        build: Callable[[], ModuleT],
+        device: torch.device,
+        expected_nbytes: Callable[[], int] | None = None,
+    ) -> ModuleT:
+        """
+        Check out the model cached under ``key`` on ``device``, building it with ``build`` on a miss. Room is made
+        before building a model seen before, or one whose size ``expected_nbytes`` estimates, so the models it
+        evicts are gone before it is built.
+        """
+        device = torch.device(device)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.device != device:
+                    logger.info("Restoring cached model %s from %s to %s", _describe(key), entry.device, device)
+                    self._make_room(device, entry.nbytes, keep=key)
+                    entry.module.to(device)
+                    entry.device = device
+                entry.checkouts += 1
+                return entry.module
+
+            # Models seen before (and since evicted) have a known size, so room can be made before building.
+            if key in self._known_sizes:
+                self._make_room(device, self._known_sizes[key], keep=key)
+            elif expected_nbytes is not None and self._budget(device) is not None:
+                self._make_room(device, expected_nbytes(), keep=key)
+            module = build()
+            nbytes = module_nbytes(module)
+            self._known_sizes[key] = nbytes
+            self._make_room(device, nbytes, keep=key)
+            self._entries[key] = _ResidentModule(module=module, device=device, nbytes=nbytes, checkouts=1)
+            return module
+
+    def reserve(self, device: torch.device, nbytes: int) -> None:
+        """Evict or park models until ``nbytes`` more fit in the budget of ``device``, e.g. before building outside."""
+        with self._lock:
+            self._make_room(torch.device(device), nbytes, keep=None)
+
+    def release(self, module: torch.nn.Module) -> None:
+        """Hand back a model checked out by :meth:`get_or_build`, so it can be evicted once nothing else holds it."""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.module is module:
+                    entry.checkouts = max(entry.checkouts - 1, 0)
+                    return
+
+    def release_all(self) -> None:
+        """Hand back every checked-out model, e.g. after a job that used the cache finished."""
+        with self._lock:
+            for entry in self._entries.values():
+                entry.checkouts = 0
+
+    def used_bytes(self, device: torch.device) -> int:
+        device = torch.device(device)
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values() if entry.device == device)
+
+    def evict(self, key: Hashable) -> None:
+        """Drop a cached model regardless of budget."""
+        with self._lock:
+            self._entries.pop(key, None)
+        _release_memory()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        _release_memory()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _budget(self, device: torch.device) -> int | None:
+        budget = self.device_budgets.get(str(device), self.device_budgets.get(device.type))
+        if budget is None and device.type == "cuda" and self.gpu_budget_fraction is not None:
+            budget = int(torch.cuda.get_device_properties(device).total_memory * self.gpu_budget_fraction)
+        return budget
+
+    def _make_room(self, device: torch.device, nbytes: int, keep: Hashable) -> None:
+        budget = self._budget(device)
+        if budget is None:
+            return
+
+        for key in list(self._entries):
+            if self.used_bytes(device) + nbytes <= budget:
+                return
+            entry = self._entries.get(key)
+            if entry is None or key == keep or entry.device != device or entry.checkouts:
+                continue
+            if self.park_on_cpu and device != _CPU:
+                logger.info("Parking cached model %s on cpu", _describe(key))
+                self._make_room(_CPU, entry.nbytes, keep=key)
+                entry.module.to(_CPU)
+                entry.device = _CPU
+            else:
+                logger.info("Evicting cached model %s from %s", _describe(key), device)
+                del self._entries[key]
+            del entry
+            _release_memory()
+
+        if self.used_bytes(device) + nbytes > budget:
+            logger.warning(
+                "Model cache over budget on %s (%d + %d > %d bytes); remaining models are checked out",
+                device,
+                self.used_bytes(device),
+                nbytes,
+                budget,
+            )
+
+
+def model_cache_from_args(args: argparse.Namespace) -> ModelCache:
+    """
+    Build a :class:`ModelCache` from the ``--gpu-memory-budget``, ``--cpu-memory-budget`` (GiB) and
+    ``--no-park-on-cpu`` options. Without ``--gpu-memory-budget``, CUDA devices get
+    :data:`DEFAULT_GPU_BUDGET_FRACTION` of their memory.
+    """
+    budgets = {}
+    if args.gpu_memory_budget is not None:
+        budgets["cuda"] = int(args.gpu_memory_budget * GIB)
+    if args.cpu_memory_budget is not None:
+        budgets["cpu"] = int(args.cpu_memory_budget * GIB)
+    return ModelCache(device_budgets=budgets, park_on_cpu=args.park_on_cpu)
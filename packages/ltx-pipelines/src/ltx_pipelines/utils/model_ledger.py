@@ -1,10 +1,31 @@
+import argparse
+import logging
+import math
+from collections.abc import Callable, Hashable, Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import replace
+from functools import partial
+from pathlib import Path
+from typing import TypeVar
 
 import torch
+import torch.distributed as dist
 
-from ltx_core.loader.primitives import LoraPathStrengthAndSDOps
+from ltx_core.loader.fuse_loras import fuse_loras_, restore_weights_
+from ltx_core.loader.fused_cache import FusedWeightCache
+from ltx_core.loader.prefetch import StateDictPrefetcher
+from ltx_core.loader.primitives import LoraPathStrengthAndSDOps, LoraStateDictWithStrength, StateDict
 from ltx_core.loader.registry import DummyRegistry, Registry
+from ltx_core.loader.repack import repack_model
+from ltx_core.loader.runtime_lora import RuntimeLoras
+from ltx_core.loader.sft_loader import (
+    REPACKED_METADATA_KEY,
+    ParallelSafetensorsStateDictLoader,
+    SafetensorsModelStateDictLoader,
+    read_safetensors_header,
+)
 from ltx_core.loader.single_gpu_model_builder import SingleGPUModelBuilder as Builder
+from ltx_core.loader.single_gpu_model_builder import build_models
 from ltx_core.model.audio_vae import (
     AUDIO_VAE_DECODER_COMFY_KEYS_FILTER,
     VOCODER_COMFY_KEYS_FILTER,
@@ -13,12 +34,16 @@ from ltx_core.model.audio_vae import (
     Vocoder,
     VocoderConfigurator,
 )
+from ltx_core.model.compile import compile_transformer_, compile_video_decoder_, compile_vocoder_
 from ltx_core.model.transformer import (
     LTXV_MODEL_COMFY_RENAMING_MAP,
     LTXV_MODEL_COMFY_RENAMING_WITH_TRANSFORMER_LINEAR_DOWNCAST_MAP,
     UPCAST_DURING_INFERENCE,
     LTXModelConfigurator,
+    StreamedTransformerBlocks,
     X0Model,
+    enable_context_parallel_,
+    stream_transformer_blocks_,
 )
 from ltx_core.model.upsampler import LatentUpsampler, LatentUpsamplerConfigurator
 from ltx_core.model.video_vae import (
@@ -37,6 +62,23 @@ from ltx_core.text_encoders.gemma import (
 )
 from ltx_core.text_encoders.gemma.encoders.av_encoder import GEMMA_MODEL_OPS
 from ltx_core.utils import find_matching_file
+from ltx_pipelines.utils.model_cache import ModelCache
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+ModuleT = TypeVar("ModuleT", bound=torch.nn.Module)
+
+_BUILDER_ATTRIBUTES = {
+    "transformer": "transformer_builder",
+    "video_encoder": "vae_encoder_builder",
+    "video_decoder": "vae_decoder_builder",
+    "audio_decoder": "audio_decoder_builder",
+    "vocoder": "vocoder_builder",
+    "text_encoder": "text_encoder_builder",
+    "spatial_upsampler": "upsampler_builder",
+}
+
+_COMPILED_COMPONENTS = ("transformer", "video_decoder", "vocoder")
 
 
 class ModelLedger:
@@ -51,19 +93,21 @@ class ModelLedger:
     :class:`~ltx_core.loader.registry.Registry` to load weights from the checkpoint,
     instantiates the model with the configured ``dtype``, and moves it to ``self.device``.
     .. note::
-        Models are **not cached**. Each call to a model method creates a new instance.
+        By default models are **not cached**. Each call to a model method creates a new instance.
         Callers are responsible for storing references to models they wish to reuse
         and for freeing GPU memory (e.g. by deleting references and calling
-        ``torch.cuda.empty_cache()``).
+        ``torch.cuda.empty_cache()``). Pass a :class:`~ltx_pipelines.utils.model_cache.ModelCache`
+        to keep built models resident across calls, ledgers and pipeline invocations, and hand models back with
+        :meth:`release` once done with them, so the cache can evict them to make room.
     ### Constructor parameters
     dtype:
         Torch dtype used when constructing all models (e.g. ``torch.bfloat16``).
     device:
         Target device to which models are moved after construction (e.g. ``torch.device("cuda")``).
     checkpoint_path:
-        Path to a checkpoint directory or file containing the core model weights
-        (transformer, video VAE, audio VAE, text encoder, vocoder). If ``None``, the
-        corresponding builders are not created and calling those methods will raise
+        Path to a checkpoint file containing the core model weights
+        (transformer, video VAE, audio VAE, text encoder, vocoder), or to a directory written by :meth:`repack`.
+        If ``None``, the corresponding builders are not created and calling those methods will raise
         a :class:`ValueError`.
     gemma_root_path:
         Base path to Gemma-compatible CLIP/text encoder weights. Required to
@@ -78,14 +122,59 @@ class ModelLedger:
     registry:
         Optional :class:`Registry` instance for weight caching across builders.
         Defaults to :class:`DummyRegistry` which performs no cross-builder caching.
+        Pass a :class:`~ltx_core.loader.prefetch.StateDictPrefetcher` to enable :meth:`prefetch`.
     fp8transformer:
         If ``True``, builds the transformer with FP8 quantization and upcasting during inference.
+    model_cache:
+        Optional :class:`~ltx_pipelines.utils.model_cache.ModelCache` holding built models. Entries are
+        keyed by component, weight paths, LoRAs, dtype and FP8 mode, so ledgers sharing a cache (including
+        ones from different pipelines) reuse each other's models when they match.
+    compile_models:
+        If ``True``, compiles the transformer blocks, video decoder and vocoder with ``torch.compile`` after
+        building them (see :mod:`ltx_core.model.compile`). Ignored with a warning on devices other than CUDA.
+    context_parallel:
+        If ``True``, splits the tokens of every transformer forward across the ranks of the default process group
+        (see :class:`~ltx_core.model.transformer.context_parallel.ContextParallel`). Every rank must run the same
+        pipeline with the same inputs. Ignored with a warning unless the process group has several ranks.
+    stream_blocks:
+        If non-zero, the transformer blocks stay in host memory and are streamed to the device with this many
+        blocks resident at a time (see :class:`~ltx_core.model.transformer.StreamedTransformerBlocks`), so a
+        transformer that does not fit on the device can run. ``0`` keeps the whole transformer on the device.
+    load_workers:
+        Number of threads reading checkpoint files concurrently (see
+        :class:`~ltx_core.loader.sft_loader.ParallelSafetensorsStateDictLoader`). ``0`` (the default) or ``1``
+        memory-maps the checkpoint files instead.
+    fused_lora_cache:
+        Optional :class:`~ltx_core.loader.fused_cache.FusedWeightCache` storing transformers built with LoRAs
+        once fused, so later builds with the same checkpoint, LoRAs, strengths and dtype load the fused weights.
+    runtime_loras:
+        If ``True``, LoRAs are not fused into the transformer weights but applied while it runs (see
+        :class:`~ltx_core.loader.runtime_lora.RuntimeLoras`). Transformers then differ only by their adapters, so
+        ledgers sharing a model cache share one transformer and :meth:`transformer` swaps its adapters to this
+        ledger's LoRAs in milliseconds instead of building another one. Works with FP8 transformers.
+    text_padding_multiple:
+        If set (e.g. :data:`~ltx_core.text_encoders.gemma.TEXT_PADDING_MULTIPLE`), the text encoder pads prompts to
+        the smallest multiple of this many tokens that fits them instead of to the full 1024 tokens. Faster, but the
+        contexts differ slightly from the fixed-length padding the models were trained with.
     ### Creating Variants
     Use :meth:`with_loras` to create a new ``ModelLedger`` instance that includes
-    additional LoRA configurations while sharing the same registry for weight caching.
+    additional LoRA configurations while sharing the same registry and model cache.
+    To switch an already built transformer to such a variant without reloading the checkpoint,
+    use :meth:`fused_loras`.
+    With ``runtime_loras``, :meth:`sample_loras` gives every sample of a batch its own LoRAs on one transformer.
+    ### Building Several Models at Once
+    :meth:`models` builds several components in one pass over the checkpoint they share, instead of reading it
+    once per component.
+    ### Repacking
+    :meth:`repack` writes each component of the checkpoint to its own file with final key names and dtypes.
+    A ledger whose ``checkpoint_path`` is the directory of these files reads the weights as stored, without
+    renaming or converting them.
+    ### Prefetching
+    With a :class:`~ltx_core.loader.prefetch.StateDictPrefetcher` registry, :meth:`prefetch` reads the weights of
+    components needed later in the background, so building them overlaps with the current computation.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         dtype: torch.dtype,
         device: torch.device,
@@ -95,7 +184,21 @@ class ModelLedger:
         loras: LoraPathStrengthAndSDOps | None = None,
         registry: Registry | None = None,
         fp8transformer: bool = False,
+        model_cache: ModelCache | None = None,
+        compile_models: bool = False,
+        context_parallel: bool = False,
+        stream_blocks: int = 0,
+        load_workers: int = 0,
+        fused_lora_cache: FusedWeightCache | None = None,
+        runtime_loras: bool = False,
+        text_padding_multiple: int | None = None,
     ):
+        if compile_models and torch.device(device).type != "cuda":
+            logger.warning("Model compilation needs a CUDA device, running the models eagerly on %s", device)
+            compile_models = False
+        if context_parallel and not (dist.is_initialized() and dist.get_world_size() > 1):
+            logger.warning("Context parallelism needs a process group with several ranks, running on a single one")
+            context_parallel = False
         self.dtype = dtype
         self.device = device
         self.checkpoint_path = checkpoint_path
@@ -104,56 +207,76 @@ class ModelLedger:
         self.loras = loras or ()
         self.registry = registry or DummyRegistry()
         self.fp8transformer = fp8transformer
+        self.model_cache = model_cache
+        self.compile_models = compile_models
+        self.context_parallel = context_parallel
+        self.stream_blocks = stream_blocks
+        self.load_workers = load_workers
+        self.fused_lora_cache = fused_lora_cache
+        self.runtime_loras = runtime_loras
+        self.text_padding_multiple = text_padding_multiple
+        self._prebuilt: dict[str, torch.nn.Module] = {}
         self.build_model_builders()
 
     def build_model_builders(self) -> None:
+        if self.load_workers > 1:
+            model_loader = SafetensorsModelStateDictLoader(ParallelSafetensorsStateDictLoader(self.load_workers))
+        else:
+            model_loader = SafetensorsModelStateDictLoader()
         if self.checkpoint_path is not None:
             self.transformer_builder = Builder(
-                model_path=self.checkpoint_path,
+                model_path=self._model_path("transformer_fp8" if self.fp8transformer else "transformer"),
                 model_class_configurator=LTXModelConfigurator,
                 model_sd_ops=LTXV_MODEL_COMFY_RENAMING_MAP,
-                loras=tuple(self.loras),
+                loras=() if self.runtime_loras else tuple(self.loras),
                 registry=self.registry,
+                model_loader=model_loader,
+                fused_cache=self.fused_lora_cache,
             )
 
             self.vae_decoder_builder = Builder(
-                model_path=self.checkpoint_path,
+                model_path=self._model_path("video_decoder"),
                 model_class_configurator=VideoDecoderConfigurator,
                 model_sd_ops=VAE_DECODER_COMFY_KEYS_FILTER,
                 registry=self.registry,
+                model_loader=model_loader,
             )
 
             self.vae_encoder_builder = Builder(
-                model_path=self.checkpoint_path,
+                model_path=self._model_path("video_encoder"),
                 model_class_configurator=VideoEncoderConfigurator,
                 model_sd_ops=VAE_ENCODER_COMFY_KEYS_FILTER,
                 registry=self.registry,
+                model_loader=model_loader,
             )
 
             self.audio_decoder_builder = Builder(
-                model_path=self.checkpoint_path,
+                model_path=self._model_path("audio_decoder"),
                 model_class_configurator=AudioDecoderConfigurator,
                 model_sd_ops=AUDIO_VAE_DECODER_COMFY_KEYS_FILTER,
                 registry=self.registry,
+                model_loader=model_loader,
             )
 
             self.vocoder_builder = Builder(
-                model_path=self.checkpoint_path,
+                model_path=self._model_path("vocoder"),
                 model_class_configurator=VocoderConfigurator,
                 model_sd_ops=VOCODER_COMFY_KEYS_FILTER,
                 registry=self.registry,
+                model_loader=model_loader,
             )
 
             if self.gemma_root_path is not None:
-                module_ops = module_ops_from_gemma_root(self.gemma_root_path)
+                module_ops = module_ops_from_gemma_root(self.gemma_root_path, self.text_padding_multiple)
                 model_folder = find_matching_file(self.gemma_root_path, "model*.safetensors").parent
                 weight_paths = [str(p) for p in model_folder.rglob("*.safetensors")]
 
                 self.text_encoder_builder = Builder(
-                    model_path=(str(self.checkpoint_path), *weight_paths),
+                    model_path=(self._model_path("text_encoder"), *weight_paths),
                     model_class_configurator=AVGemmaTextEncoderModelConfigurator,
                     model_sd_ops=AV_GEMMA_TEXT_ENCODER_KEY_OPS,
                     registry=self.registry,
+                    model_loader=model_loader,
                     module_ops=(GEMMA_MODEL_OPS, *module_ops),
                 )
 
@@ -162,8 +285,47 @@ class ModelLedger:
                 model_path=self.spatial_upsampler_path,
                 model_class_configurator=LatentUpsamplerConfigurator,
                 registry=self.registry,
+                model_loader=model_loader,
             )
 
+    def _model_path(self, component: str) -> str:
+        """The file holding the weights of ``component``: its repacked file or the checkpoint."""
+        if Path(self.checkpoint_path).is_dir():
+            return str(Path(self.checkpoint_path) / f"{component}.safetensors")
+        return str(self.checkpoint_path)
+
+    def repack(self, output_dir: str) -> list[str]:
+        """
+        Write each component of the checkpoint to ``output_dir`` as ``<component>.safetensors`` (see
+        :func:`~ltx_core.loader.repack.repack_model`), with the key operations applied and the weights in the
+        dtype this ledger builds them in. The transformer is written as ``transformer_fp8.safetensors`` with
+        ``fp8transformer``. Passing ``output_dir`` as ``checkpoint_path`` to a ledger then loads the components
+        from these files without remapping them, and the files can be memory-mapped as stored. The text encoder
+        file only holds its weights from the checkpoint and is written if ``gemma_root_path`` is set; LoRAs are
+        not applied. Returns the paths of the written files.
+        """
+        if self.checkpoint_path is None or Path(self.checkpoint_path).is_dir():
+            raise ValueError("Repacking needs the path of a checkpoint file, not of a repacked directory")
+        transformer_builder, _, transformer_dtype = self._transformer_build()
+        builds = {
+            "transformer_fp8" if self.fp8transformer else "transformer": (transformer_builder, transformer_dtype),
+            "video_encoder": (self.vae_encoder_builder, self.dtype),
+            "video_decoder": (self.vae_decoder_builder, self.dtype),
+            "audio_decoder": (self.audio_decoder_builder, self.dtype),
+            "vocoder": (self.vocoder_builder, self.dtype),
+        }
+        if hasattr(self, "text_encoder_builder"):
+            builds["text_encoder"] = (replace(self.text_encoder_builder, model_path=self.checkpoint_path), self.dtype)
+        else:
+            logger.warning("No gemma root path given, the text encoder is not repacked")
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        paths = []
+        for component, (builder, dtype) in builds.items():
+            path = str(Path(output_dir) / f"{component}.safetensors")
+            repack_model(replace(builder, loras=()), path, dtype)
+            paths.append(path)
+        return paths
+
     def _target_device(self) -> torch.device:
         if isinstance(self.registry, DummyRegistry) or self.registry is None:
             return self.device
@@ -180,26 +342,273 @@ class ModelLedger:
             loras=(*self.loras, *loras),
             registry=self.registry,
             fp8transformer=self.fp8transformer,
+            model_cache=self.model_cache,
+            compile_models=self.compile_models,
+            context_parallel=self.context_parallel,
+            stream_blocks=self.stream_blocks,
+            load_workers=self.load_workers,
+            fused_lora_cache=self.fused_lora_cache,
+            runtime_loras=self.runtime_loras,
+            text_padding_multiple=self.text_padding_multiple,
         )
 
+    def _cached(
+        self, name: str, builder: Builder, build: Callable[[], ModuleT] | None = None, variant: Hashable = None
+    ) -> ModuleT:
+        build = build or partial(self._build, builder)
+        if name in self._prebuilt:
+            build = partial(self._prebuilt.pop, name)
+        if self.compile_models and name in _COMPILED_COMPONENTS:
+            build = partial(self._build_compiled, name, build)
+        if self.model_cache is None:
+            return build()
+        key = self._cache_key(name, builder, variant)
+        return self.model_cache.get_or_build(key, build, self.device, partial(self._expected_nbytes, builder))
+
+    def _expected_nbytes(self, builder: Builder) -> int:
+        """Upper bound of the bytes a model built by ``builder`` holds, from the headers of its weight files."""
+        model_paths = list(builder.model_path) if isinstance(builder.model_path, tuple) else [builder.model_path]
+        nbytes = 0
+        for path in model_paths:
+            header, _ = read_safetensors_header(path)
+            metadata = header.pop("__metadata__", None) or {}
+            sd_ops = None if REPACKED_METADATA_KEY in metadata else builder.model_sd_ops
+            for name, info in header.items():
+                if sd_ops is not None and sd_ops.apply_to_key(name) is None:
+                    continue
+                start, end = info["data_offsets"]
+                nbytes += max(end - start, math.prod(info["shape"]) * self.dtype.itemsize)
+        return nbytes
+
+    def release(self, *models: torch.nn.Module) -> None:
+        """
+        Hand ``models`` back to the model cache once the caller is done with them, so they can be parked or evicted
+        to make room for the next models. A no-op without a model cache.
+        """
+        if self.model_cache is not None:
+            for model in models:
+                self.model_cache.release(model)
+
+    def _cache_key(self, name: str, builder: Builder, variant: Hashable = None) -> Hashable:
+        model_path = builder.model_path if isinstance(builder.model_path, str) else tuple(builder.model_path)
+        loras = tuple((lora.path, lora.strength, getattr(lora.sd_ops, "name", None)) for lora in builder.loras)
+        compiled = self.compile_models and name in _COMPILED_COMPONENTS
+        context_parallel = self.context_parallel and name == "transformer"
+        stream_blocks = self.stream_blocks if name == "transformer" else 0
+        return (name, model_path, loras, str(self.dtype), variant, compiled, context_parallel, stream_blocks)
+
+    def _build_compiled(self, name: str, build: Callable[[], ModuleT]) -> ModuleT:
+        model = build()
+        if name == "transformer":
+            compile_transformer_(model.velocity_model)
+        elif name == "video_decoder":
+            compile_video_decoder_(model)
+        elif name == "vocoder":
+            compile_vocoder_(model)
+        return model
+
+    def prefetch(self, *components: str) -> None:
+        """
+        Start reading the weights of ``components`` (e.g. ``"transformer"``, ``"video_decoder"``) into host memory
+        in the background; the next call to the matching model method then only copies them to the device.
+        Transformer LoRAs are prefetched along with the transformer. Components that are not configured or
+        already resident in the model cache are skipped. A no-op unless the registry is a
+        :class:`~ltx_core.loader.prefetch.StateDictPrefetcher`.
+        """
+        if not isinstance(self.registry, StateDictPrefetcher):
+            return
+        for name in components:
+            builder = getattr(self, _BUILDER_ATTRIBUTES[name], None)
+            if builder is None:
+                continue
+            if self._is_cached(name, builder):
+                continue
+            if name == "transformer":
+                builder = self._transformer_builder()
+            model_paths = list(builder.model_path) if isinstance(builder.model_path, tuple) else [builder.model_path]
+            self.registry.prefetch(model_paths, builder.model_sd_ops, builder.model_loader)
+            self.prefetch_loras(self.loras if name == "transformer" else builder.loras)
+
+    def prefetch_loras(self, loras: LoraPathStrengthAndSDOps) -> None:
+        """Start reading transformer LoRAs in the background, e.g. ahead of :meth:`fused_loras`."""
+        if not isinstance(self.registry, StateDictPrefetcher):
+            return
+        for lora in loras:
+            self.registry.prefetch([lora.path], lora.sd_ops, self.transformer_builder.model_loader)
+
+    def _is_cached(self, name: str, builder: Builder) -> bool:
+        return self.model_cache is not None and self._cache_key(name, builder, self._variant(name)) in self.model_cache
+
+    def _variant(self, name: str) -> Hashable:
+        """Ledger setting the model of component ``name`` depends on besides its weights."""
+        if name == "transformer":
+            return self.fp8transformer
+        if name == "text_encoder":
+            return self.text_padding_multiple
+        return None
+
+    def models(self, *components: str) -> tuple[torch.nn.Module, ...]:
+        """
+        Return the models of ``components`` (e.g. ``"video_encoder", "transformer"``) as the matching model
+        methods would, building the ones sharing checkpoint files in a single pass over them (see
+        :func:`~ltx_core.loader.single_gpu_model_builder.build_models`): the checkpoint header is parsed once and
+        each tensor is read once, instead of once per component. Components resident in the model cache are
+        taken from it.
+        """
+        names = []
+        builds = []
+        for name in components:
+            builder = getattr(self, _BUILDER_ATTRIBUTES[name], None)
+            if builder is None or self._is_cached(name, builder) or name in names:
+                continue
+            names.append(name)
+            if name == "transformer":
+                builds.append(self._transformer_build())
+            else:
+                builds.append((builder, self._target_device(), self.dtype))
+        if self.model_cache is not None and builds:
+            self.model_cache.reserve(self.device, sum(self._expected_nbytes(builder) for builder, _, _ in builds))
+        for name, model in zip(names, build_models(builds), strict=True):
+            if name == "transformer":
+                self._prebuilt[name] = self._wrap_transformer(model)
+            else:
+                self._prebuilt[name] = model.to(self.device).eval()
+        try:
+            return tuple(getattr(self, name)() for name in components)
+        finally:
+            self._prebuilt.clear()
+
     def transformer(self) -> X0Model:
         if not hasattr(self, "transformer_builder"):
             raise ValueError(
                 "Transformer not initialized. Please provide a checkpoint path to the ModelLedger constructor."
             )
+        transformer = self._cached(
+            "transformer", self.transformer_builder, self._build_transformer, variant=self._variant("transformer")
+        )
+        if self.runtime_loras:
+            self._swap_runtime_loras(transformer.velocity_model.runtime_loras)
+        return transformer
+
+    def _swap_runtime_loras(self, runtime_loras: RuntimeLoras) -> None:
+        loras = {_runtime_lora_name(lora): lora for lora in self.loras}
+        for name in runtime_loras.strengths.keys() - loras.keys():
+            runtime_loras.remove(name)
+        for name, lora in loras.items():
+            if name in runtime_loras.strengths:
+                runtime_loras.set_strength(name, lora.strength)
+            else:
+                runtime_loras.add(name, self._load_lora(lora), lora.strength)
+
+    def _load_lora(self, lora: LoraPathStrengthAndSDOps) -> StateDict:
+        return self.transformer_builder.load_sd(
+            [lora.path], registry=self.registry, device=self.device, sd_ops=lora.sd_ops
+        )
+
+    def _transformer_builder(self) -> Builder:
         if self.fp8transformer:
-            fp8_builder = replace(
+            return replace(
                 self.transformer_builder,
                 module_ops=(UPCAST_DURING_INFERENCE,),
                 model_sd_ops=LTXV_MODEL_COMFY_RENAMING_WITH_TRANSFORMER_LINEAR_DOWNCAST_MAP,
             )
-            return X0Model(fp8_builder.build(device=self._target_device())).to(self.device).eval()
-        else:
-            return (
-                X0Model(self.transformer_builder.build(device=self._target_device(), dtype=self.dtype))
-                .to(self.device)
-                .eval()
-            )
+        return self.transformer_builder
+
+    def _transformer_build(self) -> tuple[Builder, torch.device, torch.dtype | None]:
+        # Streamed blocks are built in host memory, where they stay.
+        device = torch.device("cpu") if self.stream_blocks else self._target_device()
+        if self.fp8transformer:
+            return self._transformer_builder(), device, None
+        return self.transformer_builder, device, self.dtype
+
+    def _build_transformer(self) -> X0Model:
+        builder, device, dtype = self._transformer_build()
+        return self._wrap_transformer(builder.build(device=device, dtype=dtype))
+
+    def _wrap_transformer(self, velocity_model: torch.nn.Module) -> X0Model:
+        if self.stream_blocks:
+            stream_transformer_blocks_(velocity_model, self.device, window=self.stream_blocks)
+        transformer = X0Model(velocity_model).to(self.device).eval()
+        if self.context_parallel:
+            enable_context_parallel_(transformer.velocity_model)
+        if self.runtime_loras:
+            transformer.velocity_model.runtime_loras = RuntimeLoras(transformer.velocity_model, self.device)
+        return transformer
+
+    @contextmanager
+    def fused_loras(self, transformer: X0Model, loras: LoraPathStrengthAndSDOps) -> Iterator[X0Model]:
+        """
+        Fuse ``loras`` in place into ``transformer`` (built by this ledger) for the duration of the context.
+        This yields the transformer ``with_loras(loras).transformer()`` would build without re-reading the
+        checkpoint or holding a second copy of the weights. When a model cache is configured, the transformer may
+        be shared with later calls, so the original values of the fused weights are kept on CPU and restored
+        exactly on exit; otherwise the fused weights are left in place and the transformer should be discarded
+        afterwards.
+        With ``runtime_loras``, ``loras`` are attached as adapters for the duration of the context instead.
+        """
+        if self.runtime_loras:
+            with self._attached_loras(transformer.velocity_model.runtime_loras, loras):
+                yield transformer
+            return
+        lora_sd_and_strengths = [LoraStateDictWithStrength(self._load_lora(lora), lora.strength) for lora in loras]
+        original_weights = {} if self.model_cache is not None else None
+        if isinstance(transformer.velocity_model.transformer_blocks, StreamedTransformerBlocks):
+            # Fuse into the host weights, not into copies on the device.
+            transformer.velocity_model.transformer_blocks.release()
+        try:
+            fuse_loras_(transformer.velocity_model, lora_sd_and_strengths, original_weights)
+            del lora_sd_and_strengths
+            yield transformer
+        finally:
+            if original_weights is not None:
+                restore_weights_(transformer.velocity_model, original_weights)
+
+    @contextmanager
+    def _attached_loras(self, runtime_loras: RuntimeLoras, loras: LoraPathStrengthAndSDOps) -> Iterator[None]:
+        names = []
+        try:
+            for lora in loras:
+                name = f"{_runtime_lora_name(lora)} (fused_loras)"
+                runtime_loras.add(name, self._load_lora(lora), lora.strength)
+                names.append(name)
+            yield
+        finally:
+            for name in names:
+                if name in runtime_loras.strengths:
+                    runtime_loras.remove(name)
+
+    @contextmanager
+    def sample_loras(self, transformer: X0Model, sample_loras: Sequence[LoraPathStrengthAndSDOps]) -> Iterator[X0Model]:
+        """
+        Give every sample of the batch run through ``transformer`` (built by this ledger with ``runtime_loras``)
+        its own LoRAs for the duration of the context: sample ``i`` runs with the adapters already attached (this
+        ledger's LoRAs and those of an enclosing :meth:`fused_loras`) at their current strengths, plus
+        ``sample_loras[i]`` (see :meth:`~ltx_core.loader.runtime_lora.RuntimeLoras.set_sample_strengths`).
+        LoRAs used by several samples are loaded and attached once, so samples with different LoRAs, such as
+        different IC-LoRA control types or styles, share one base model and one forward.
+        """
+        if not self.runtime_loras:
+            raise ValueError("Per-sample LoRAs need a ModelLedger with runtime_loras=True")
+        runtime_loras = transformer.velocity_model.runtime_loras
+        shared = runtime_loras.strengths
+        attached = []
+        try:
+            strengths = []
+            for loras in sample_loras:
+                sample = dict(shared)
+                for lora in loras:
+                    name = _runtime_lora_name(lora)
+                    if name not in runtime_loras.strengths:
+                        runtime_loras.add(name, self._load_lora(lora), 0.0)
+                        attached.append(name)
+                    sample[name] = sample.get(name, 0.0) + lora.strength
+                strengths.append(sample)
+            runtime_loras.set_sample_strengths(strengths)
+            yield transformer
+        finally:
+            runtime_loras.set_sample_strengths(None)
+            for name in attached:
+                runtime_loras.remove(name)
 
     def video_decoder(self) -> VideoDecoder:
         if not hasattr(self, "vae_decoder_builder"):
@@ -207,7 +616,7 @@ class ModelLedger:
                 "Video decoder not initialized. Please provide a checkpoint path to the ModelLedger constructor."
             )
 
-        return self.vae_decoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached("video_decoder", self.vae_decoder_builder)
 
     def video_encoder(self) -> VideoEncoder:
         if not hasattr(self, "vae_encoder_builder"):
@@ -215,7 +624,7 @@ class ModelLedger:
                 "Video encoder not initialized. Please provide a checkpoint path to the ModelLedger constructor."
             )
 
-        return self.vae_encoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached("video_encoder", self.vae_encoder_builder)
 
     def text_encoder(self) -> AVGemmaTextEncoderModel:
         if not hasattr(self, "text_encoder_builder"):
@@ -224,7 +633,7 @@ class ModelLedger:
                 "ModelLedger constructor."
             )
 
-        return self.text_encoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached("text_encoder", self.text_encoder_builder, variant=self._variant("text_encoder"))
 
     def audio_decoder(self) -> AudioDecoder:
         if not hasattr(self, "audio_decoder_builder"):
@@ -232,7 +641,7 @@ class ModelLedger:
                 "Audio decoder not initialized. Please provide a checkpoint path to the ModelLedger constructor."
             )
 
-        return self.audio_decoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached("audio_decoder", self.audio_decoder_builder)
 
     def vocoder(self) -> Vocoder:
         if not hasattr(self, "vocoder_builder"):
@@ -240,10 +649,29 @@ class ModelLedger:
                 "Vocoder not initialized. Please provide a checkpoint path to the ModelLedger constructor."
             )
 
-        return self.vocoder_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached("vocoder", self.vocoder_builder)
 
     def spatial_upsampler(self) -> LatentUpsampler:
         if not hasattr(self, "upsampler_builder"):
             raise ValueError("Upsampler not initialized. Please provide upsampler path to the ModelLedger constructor.")
 
-        return self.upsampler_builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+        return self._cached("spatial_upsampler", self.upsampler_builder)
+
+    def _build(self, builder: Builder) -> torch.nn.Module:
+        return builder.build(device=self._target_device(), dtype=self.dtype).to(self.device).eval()
+
+
+def _runtime_lora_name(lora: LoraPathStrengthAndSDOps) -> str:
+    return f"{lora.path}:{getattr(lora.sd_ops, 'name', None)}"
+
+
+def fused_lora_cache_from_args(args: argparse.Namespace) -> FusedWeightCache | None:
+    """
+    Fused LoRA weight cache configured by ``--fused-lora-cache-dir`` and ``--fused-lora-cache-size`` (GiB), or
+    ``None`` when caching is disabled.
+    """
+    cache_dir = getattr(args, "fused_lora_cache_dir", None)
+    if not cache_dir:
+        return None
+    size = getattr(args, "fused_lora_cache_size", None)
+    return FusedWeightCache(cache_dir, max_bytes=int(size * 1024**3) if size is not None else None)
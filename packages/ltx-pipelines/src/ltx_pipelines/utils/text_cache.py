@@ -0,0 +1,224 @@
+"""
+On-disk cache of text encoder outputs.
+Encoding a prompt requires building the Gemma text encoder, which dominates the fixed cost of prompt and seed
+sweeps. :class:`TextEmbeddingCache` stores the final video/audio context tensors under a content address derived
+from the prompt, the tokenizer configuration, the Gemma weights and the LTX checkpoint holding the embeddings
+connectors, so :func:`encode_prompts` only builds the text encoder for prompts it has not seen before.
+The same store keeps prompt enhancement results (:func:`enhance_prompt_cached`), keyed by the input prompt, the
+conditioning image, the seed, the system prompt and the Gemma weights.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import uuid
+from pathlib import Path
+
+import torch
+from safetensors import SafetensorError
+from safetensors.torch import load_file, save_file
+
+from ltx_core.loader.fused_cache import weights_fingerprint
+from ltx_core.text_encoders.gemma import (
+    TEXT_MAX_LENGTH,
+    GemmaTextEncoderModelBase,
+    default_enhancement_system_prompt,
+    encode_text,
+)
+from ltx_core.utils import find_matching_file
+from ltx_pipelines.utils.helpers import generate_enhanced_prompt
+from ltx_pipelines.utils.model_ledger import ModelLedger
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored tensors change meaning (e.g. a different encoder output is cached).
+TEXT_CACHE_VERSION = 1
+
+_TOKENIZER_FILES = ("tokenizer.model", "tokenizer.json", "tokenizer_config.json", "special_tokens_map.json")
+
+
+def _tokenizer_fingerprint(gemma_root: str, pad_to_multiple_of: int | None) -> str:
+    tokenizer_root = find_matching_file(gemma_root, "tokenizer.model").parent
+    digest = hashlib.sha256(f"max_length={TEXT_MAX_LENGTH}:pad_to_multiple_of={pad_to_multiple_of}".encode())
+    for name in _TOKENIZER_FILES:
+        path = tokenizer_root / name
+        if path.is_file():
+            digest.update(name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def text_encoder_fingerprint(
+    checkpoint_path: str, gemma_root: str, dtype: torch.dtype, pad_to_multiple_of: int | None = None
+) -> str:
+    """
+    Identify the text encoder built from ``checkpoint_path`` and ``gemma_root``: tokenizer configuration (including
+    the prompt padding, see :func:`~ltx_core.text_encoders.gemma.module_ops_from_gemma_root`), Gemma weights, the
+    checkpoint holding the embeddings connectors and the dtype the encoder runs in.
+    """
+    checkpoint = Path(checkpoint_path)
+    connector_files = [checkpoint] if checkpoint.is_file() else list(checkpoint.rglob("*.safetensors"))
+    gemma_folder = find_matching_file(gemma_root, "model*.safetensors").parent
+    parts = {
+        "version": TEXT_CACHE_VERSION,
+        "tokenizer": _tokenizer_fingerprint(gemma_root, pad_to_multiple_of),
+        "encoder": weights_fingerprint(list(gemma_folder.rglob("*.safetensors"))),
+        "connectors": weights_fingerprint(connector_files),
+        "dtype": str(dtype),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class TextEmbeddingCache:
+    """
+    Content-addressed on-disk store of ``(video_context, audio_context)`` pairs produced by the text encoder.
+    Entries are written atomically as ``<cache_dir>/<key[:2]>/<key>.safetensors`` so concurrent processes can
+    share a cache directory; unreadable entries are treated as misses.
+    ### Constructor parameters
+    cache_dir:
+        Directory holding the cache entries. Created on first write.
+    """
+
+    def __init__(self, cache_dir: Path | str):
+        self.cache_dir = Path(cache_dir).expanduser()
+
+    @staticmethod
+    def key(prompt: str, encoder_fingerprint: str) -> str:
+        return hashlib.sha256(json.dumps([encoder_fingerprint, prompt]).encode()).hexdigest()
+
+    def get(self, key: str, device: torch.device) -> tuple[torch.Tensor, torch.Tensor | None] | None:
+        path = self._path(key)
+        if not path.is_file():
+            return None
+        try:
+            tensors = load_file(path, device=str(device))
+        except (OSError, SafetensorError) as e:
+            logger.warning("Ignoring unreadable text cache entry %s: %s", path, e)
+            return None
+        return tensors["video_context"], tensors.get("audio_context")
+
+    def put(self, key: str, video_context: torch.Tensor, audio_context: torch.Tensor | None) -> None:
+        tensors = {"video_context": video_context}
+        if audio_context is not None:
+            tensors["audio_context"] = audio_context
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        save_file({name: t.detach().contiguous().cpu() for name, t in tensors.items()}, tmp_path)
+        tmp_path.replace(path)
+
+    def get_enhanced_prompt(self, key: str) -> str | None:
+        path = self._path(key, ".json")
+        if not path.is_file():
+            return None
+        try:
+            return json.loads(path.read_text())["enhanced_prompt"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable text cache entry %s: %s", path, e)
+            return None
+
+    def put_enhanced_prompt(self, key: str, enhanced_prompt: str) -> None:
+        path = self._path(key, ".json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps({"enhanced_prompt": enhanced_prompt}))
+        tmp_path.replace(path)
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def _path(self, key: str, suffix: str = ".safetensors") -> Path:
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+
+def encode_prompts(
+    model_ledger: ModelLedger,
+    prompts: list[str],
+    text_cache: TextEmbeddingCache | None = None,
+    text_encoder: GemmaTextEncoderModelBase | None = None,
+) -> list[tuple[torch.Tensor, torch.Tensor]]:
+    """
+    Encode ``prompts`` like :func:`~ltx_core.text_encoders.gemma.encode_text`, reusing outputs stored in
+    ``text_cache``. The ledger's text encoder is only built when a prompt is missing from the cache; pass
+    ``text_encoder`` to encode misses with an already built instance (e.g. the one used for prompt enhancement).
+    A text encoder built here is handed back to the ledger's model cache afterwards.
+    """
+    if text_cache is None:
+        return _encode_text(model_ledger, prompts, text_encoder)
+
+    fingerprint = text_encoder_fingerprint(
+        model_ledger.checkpoint_path,
+        model_ledger.gemma_root_path,
+        model_ledger.dtype,
+        model_ledger.text_padding_multiple,
+    )
+    keys = [text_cache.key(prompt, fingerprint) for prompt in prompts]
+    contexts = [text_cache.get(key, model_ledger.device) for key in keys]
+    missing = [i for i, context in enumerate(contexts) if context is None]
+    logger.info("Text cache: %d of %d prompts cached", len(prompts) - len(missing), len(prompts))
+    if missing:
+        encoded = _encode_text(model_ledger, [prompts[i] for i in missing], text_encoder)
+        for i, context in zip(missing, encoded, strict=True):
+            text_cache.put(keys[i], *context)
+            contexts[i] = context
+    return contexts
+
+
+def _encode_text(
+    model_ledger: ModelLedger, prompts: list[str], text_encoder: GemmaTextEncoderModelBase | None
+) -> list[tuple[torch.Tensor, torch.Tensor]]:
+    if text_encoder is not None:
+        return encode_text(text_encoder, prompts=prompts)
+    text_encoder = model_ledger.text_encoder()
+    try:
+        return encode_text(text_encoder, prompts=prompts)
+    finally:
+        model_ledger.release(text_encoder)
+
+
+def enhance_prompt_cached(
+    model_ledger: ModelLedger,
+    prompt: str,
+    image_path: str | None = None,
+    seed: int = 42,
+    text_cache: TextEmbeddingCache | None = None,
+) -> tuple[str, GemmaTextEncoderModelBase | None]:
+    """
+    Enhance ``prompt`` like :func:`~ltx_pipelines.utils.helpers.generate_enhanced_prompt`, reusing results stored
+    in ``text_cache``. The ledger's text encoder is only built on a miss; it is returned (``None`` on a hit) so the
+    caller can pass it on to :func:`encode_prompts`.
+    """
+    if text_cache is None:
+        text_encoder = model_ledger.text_encoder()
+        return generate_enhanced_prompt(text_encoder, prompt, image_path, seed=seed), text_encoder
+
+    image_hash = hashlib.sha256(Path(image_path).read_bytes()).hexdigest() if image_path else None
+    parts = [
+        "enhance",
+        text_encoder_fingerprint(
+            model_ledger.checkpoint_path,
+            model_ledger.gemma_root_path,
+            model_ledger.dtype,
+            model_ledger.text_padding_multiple,
+        ),
+        hashlib.sha256(default_enhancement_system_prompt(with_image=image_path is not None).encode()).hexdigest(),
+        image_hash,
+        seed,
+    ]
+    key = text_cache.key(prompt, json.dumps(parts))
+    enhanced_prompt = text_cache.get_enhanced_prompt(key)
+    if enhanced_prompt is not None:
+        logger.info("Text cache: reusing enhanced prompt")
+        return enhanced_prompt, None
+
+    text_encoder = model_ledger.text_encoder()
+    enhanced_prompt = generate_enhanced_prompt(text_encoder, prompt, image_path, seed=seed)
+    text_cache.put_enhanced_prompt(key, enhanced_prompt)
+    return enhanced_prompt, text_encoder
+
+
+def text_cache_from_args(args: argparse.Namespace) -> TextEmbeddingCache | None:
+    """Text embedding cache configured by ``--text-cache-dir``, or ``None`` when caching is disabled."""
+    text_cache_dir = getattr(args, "text_cache_dir", None)
+    return TextEmbeddingCache(text_cache_dir) if text_cache_dir else None
@@ -0,0 +1,135 @@
+import argparse
+import json
+from pathlib import Path
+
+import pytest
+import torch
+
+from ltx_pipelines import batch
+from ltx_pipelines.batch import load_jobs, pipeline_batch_runner, run_batch
+from ltx_pipelines.cli import _build_root_parser
+from ltx_pipelines.utils.model_cache import DEFAULT_GPU_BUDGET_FRACTION, ModelCache, model_cache_from_args
+
+
+def _write_jobs(path: Path, jobs: list[dict]) -> Path:
+    path.write_text("\n".join(json.dumps(job) for job in jobs) + "\n")
+    return path
+
+
+def test_load_jobs_applies_defaults_for_pipeline_options(tmp_path: Path) -> None:
+    jobs_file = _write_jobs(
+        tmp_path / "jobs.jsonl",
+        [
+            {"pipeline": "one-stage", "id": "cat", "prompt": "A cat", "seed": 3, "output_path": "cat.mp4"},
+            {"pipeline": "one-stage", "prompt": "A dog", "output_path": "dog.mp4", "checkpoint_path": "other"},
+        ],
+    )
+    defaults = {"checkpoint_path": "ckpt", "gemma_root": "gemma", "distilled_lora": [["lora", 0.8]]}
+
+    jobs = load_jobs(jobs_file, defaults=defaults)
+
+    assert [job.id for job in jobs] == ["cat", "1"]
+    assert jobs[0].argv == [
+        "--checkpoint-path",
+        "ckpt",
+        "--gemma-root",
+        "gemma",
+        "--prompt",
+        "A cat",
+        "--seed",
+        "3",
+        "--output-path",
+        "cat.mp4",
+    ]
+    assert "other" in jobs[1].argv
+    assert "ckpt" not in jobs[1].argv
+    assert "--distilled-lora" not in jobs[0].argv
+
+
+def test_argv_jobs_override_default_options_instead_of_appending(tmp_path: Path) -> None:
+    argv = ["--lora", "job.safetensors", "0.5", "--seed=4", "--prompt", "A cat"]
+    jobs_file = _write_jobs(tmp_path / "jobs.jsonl", [{"pipeline": "one-stage", "argv": argv}])
+    defaults = {"checkpoint_path": "ckpt", "lora": [["default.safetensors", 1.0]], "seed": 1}
+
+    (job,) = load_jobs(jobs_file, defaults=defaults)
+
+    assert job.argv == ["--checkpoint-path", "ckpt", *argv]
+
+
+def test_load_jobs_rejects_lines_without_pipeline(tmp_path: Path) -> None:
+    jobs_file = _write_jobs(tmp_path / "jobs.jsonl", [{"prompt": "p"}])
+    with pytest.raises(ValueError, match="pipeline"):
+        load_jobs(jobs_file)
+
+
+def test_run_batch_continues_past_failures_and_writes_manifest(tmp_path: Path) -> None:
+    base = {"checkpoint_path": "c", "gemma_root": "g"}
+    jobs_file = _write_jobs(
+        tmp_path / "jobs.jsonl",
+        [
+            {"pipeline": "one-stage", "prompt": "boom", "output_path": str(tmp_path / "a.mp4"), **base},
+            {"pipeline": "one-stage", "prompt": "missing output path", **base},
+            {"pipeline": "one-stage", "prompt": "ok", "output_path": str(tmp_path / "b.mp4"), **base},
+        ],
+    )
+    ran = []
+
+    def run(args: argparse.Namespace) -> None:
+        if args.prompt == "boom":
+            raise RuntimeError("boom")
+        ran.append(args.prompt)
+
+    manifest_path = tmp_path / "manifest.jsonl"
+    results = run_batch(load_jobs(jobs_file), manifest_path, run)
+
+    assert [result.status for result in results] == ["failed", "failed", "succeeded"]
+    assert results[0].error == "RuntimeError: boom"
+    assert "required" in results[1].error
+    assert ran == ["ok"]
+    manifest = [json.loads(line) for line in manifest_path.read_text().splitlines()]
+    assert [entry["status"] for entry in manifest] == ["failed", "failed", "succeeded"]
+    assert manifest[2]["output_path"] == str(tmp_path / "b.mp4")
+
+
+def test_run_batch_skips_existing_outputs(tmp_path: Path) -> None:
+    output = tmp_path / "done.mp4"
+    output.touch()
+    argv = [
+        "--checkpoint-path",
+        "c",
+        "--gemma-root",
+        "g",
+        "--spatial-upsampler-path",
+        "u",
+        "--prompt",
+        "p",
+        "--output-path",
+        str(output),
+    ]
+    jobs_file = _write_jobs(tmp_path / "jobs.jsonl", [{"pipeline": "distilled", "argv": argv}])
+
+    results = run_batch(load_jobs(jobs_file), tmp_path / "manifest.jsonl", lambda _: None, skip_existing=True)
+
+    assert results[0].status == "skipped"
+
+
+def test_batch_model_cache_is_bounded_and_released_after_each_job(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    args = _build_root_parser().parse_args(["batch", str(tmp_path / "jobs.jsonl")])
+    assert model_cache_from_args(args).gpu_budget_fraction == DEFAULT_GPU_BUDGET_FRACTION
+
+    cache = ModelCache(device_budgets={"cpu": 0})
+
+    def failing_pipeline(_args: argparse.Namespace, model_cache: ModelCache) -> None:
+        model_cache.get_or_build(("encoder",), lambda: torch.nn.Linear(4, 4), torch.device("cpu"))
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(batch, "run_pipeline", failing_pipeline)
+    monkeypatch.setattr(batch, "resolve_args_paths", lambda *_args, **_kwargs: None)
+    with pytest.raises(RuntimeError, match="boom"):
+        pipeline_batch_runner(cache)(argparse.Namespace())
+
+    # Released although the job failed, so the next job can evict it.
+    cache.reserve(torch.device("cpu"), 1)
+    assert ("encoder",) not in cache
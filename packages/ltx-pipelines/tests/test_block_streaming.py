@@ -0,0 +1,86 @@
+from dataclasses import replace
+
+import torch
+
+from ltx_core.guidance.perturbations import BatchedPerturbationConfig
+from ltx_core.model.transformer import Modality, StreamedTransformerBlocks, X0Model, stream_transformer_blocks_
+from tests.test_helpers import _tiny_transformer
+
+
+def _modalities() -> tuple[Modality, Modality]:
+    generator = torch.Generator().manual_seed(0)
+    video = Modality(
+        latent=torch.randn(2, 6, 8, generator=generator),
+        timesteps=torch.full((2, 6, 1), 0.7),
+        positions=torch.rand(2, 3, 6, 2, generator=generator),
+        context=torch.randn(2, 5, 12, generator=generator),
+    )
+    audio = Modality(
+        latent=torch.randn(2, 4, 4, generator=generator),
+        timesteps=torch.full((2, 4, 1), 0.7),
+        positions=torch.rand(2, 1, 4, 2, generator=generator),
+        context=torch.randn(2, 5, 12, generator=generator),
+    )
+    return video, audio
+
+
+def _forward(transformer: X0Model, dtype: torch.dtype = torch.float32) -> tuple[torch.Tensor, torch.Tensor]:
+    video, audio = (
+        replace(modality, latent=modality.latent.to(dtype), context=modality.context.to(dtype))
+        for modality in _modalities()
+    )
+    with torch.inference_mode():
+        return transformer(video=video, audio=audio, perturbations=BatchedPerturbationConfig.empty(2))
+
+
+def _weight_pointers(blocks: StreamedTransformerBlocks) -> list[int]:
+    return [parameter.data_ptr() for parameter in blocks.parameters()]
+
+
+def test_streamed_blocks_match_resident_blocks_within_the_window() -> None:
+    expected = _forward(_tiny_transformer())
+    transformer = _tiny_transformer()
+    stream_transformer_blocks_(transformer.velocity_model, torch.device("cpu"), window=1)
+    blocks = transformer.velocity_model.transformer_blocks
+    host_weights = _weight_pointers(blocks)
+    resident = []
+    for block in blocks:
+        block.register_forward_pre_hook(lambda _block, _args: resident.append(blocks.resident))
+
+    for _ in range(2):
+        outputs = _forward(transformer)
+        for output, expected_output in zip(outputs, expected, strict=True):
+            torch.testing.assert_close(output, expected_output)
+
+    assert resident == [[0], [1], [0], [1]]
+    # Between forwards, no block is resident and the parameters hold the host weights.
+    assert blocks.resident == []
+    assert _weight_pointers(blocks) == host_weights
+
+
+def test_streamed_blocks_convert_host_weights_in_place_of_moving_them() -> None:
+    expected = _forward(_tiny_transformer().double(), torch.float64)
+    transformer = _tiny_transformer()
+    stream_transformer_blocks_(transformer.velocity_model, torch.device("cpu"), window=2)
+    transformer.double()
+
+    blocks = transformer.velocity_model.transformer_blocks
+    assert blocks.device == torch.device("cpu")
+    assert all(parameter.dtype == torch.float64 for parameter in blocks.parameters())
+    outputs = _forward(transformer, torch.float64)
+    for output, expected_output in zip(outputs, expected, strict=True):
+        torch.testing.assert_close(output, expected_output)
+
+
+def test_dtype_only_conversions_keep_the_streaming_device() -> None:
+    blocks = StreamedTransformerBlocks(_tiny_transformer().velocity_model.transformer_blocks, torch.device("meta"))
+    for convert in (lambda: blocks.to(torch.float16), blocks.half, blocks.float):
+        convert()
+        assert blocks.device == torch.device("meta")
+    assert all(parameter.device.type == "cpu" for parameter in blocks.parameters())
+
+    # A conversion that moves tensors still sets the device the blocks are streamed to.
+    blocks = StreamedTransformerBlocks(_tiny_transformer().velocity_model.transformer_blocks, torch.device("cpu"))
+    blocks.to(torch.device("meta"), torch.float16)
+    assert blocks.device == torch.device("meta")
+    assert all(parameter.dtype == torch.float16 for parameter in blocks.parameters())
@@ -3,7 +3,7 @@ from unittest.mock import patch
 
 import pytest
 
-from ltx_pipelines.cli import _build_root_parser
+from ltx_pipelines.cli import _build_root_parser, parse_pipeline_args
 from ltx_pipelines.utils.config import apply_config_to_parser, load_config
 
 
@@ -16,6 +16,27 @@ def test_build_root_parser_subcommands() -> None:
     assert "distilled" in choices
     assert "ic-lora" in choices
     assert "keyframe-interp" in choices
+    assert "serve" in choices
+    assert "repack" in choices
+
+
+def test_parse_pipeline_args_returns_namespace(tmp_path: Path) -> None:
+    out = tmp_path / "out.mp4"
+    args = parse_pipeline_args(
+        "one-stage",
+        ["--checkpoint-path", "c", "--gemma-root", "g", "--prompt", "p", "--output-path", str(out), "--seed", "3"],
+    )
+    assert args._run == "one_stage"
+    assert args.subcommand == "one-stage"
+    assert args.seed == 3
+    assert args.checkpoint_path == "c"
+
+
+def test_parse_pipeline_args_raises_instead_of_exiting() -> None:
+    with pytest.raises(ValueError, match="required"):
+        parse_pipeline_args("one-stage", ["--prompt", "p"])
+    with pytest.raises(ValueError, match="Unknown pipeline"):
+        parse_pipeline_args("serve", [])
 
 
 def test_two_phase_parse_one_stage(tmp_path: Path) -> None:
@@ -0,0 +1,94 @@
+import gc
+import logging
+import weakref
+from pathlib import Path
+
+import pytest
+import torch
+from safetensors.torch import save_file
+
+from ltx_core.guidance.perturbations import BatchedPerturbationConfig
+from ltx_core.model.compile import compile_module_, compile_transformer_
+from ltx_core.model.transformer import Modality, X0Model
+from ltx_pipelines.utils.model_ledger import ModelLedger
+from tests.test_helpers import _tiny_transformer
+
+
+def _modalities(batch_size: int, video_tokens: int) -> tuple[Modality, Modality]:
+    video = Modality(
+        latent=torch.randn(batch_size, video_tokens, 8),
+        timesteps=torch.full((batch_size, video_tokens, 1), 0.7),
+        positions=torch.rand(batch_size, 3, video_tokens, 2),
+        context=torch.randn(batch_size, 5, 12),
+    )
+    audio = Modality(
+        latent=torch.randn(batch_size, 4, 4),
+        timesteps=torch.full((batch_size, 4, 1), 0.7),
+        positions=torch.rand(batch_size, 1, 4, 2),
+        context=torch.randn(batch_size, 5, 12),
+    )
+    return video, audio
+
+
+def _forward(transformer: X0Model, video: Modality, audio: Modality) -> tuple[torch.Tensor, torch.Tensor]:
+    return transformer(video=video, audio=audio, perturbations=BatchedPerturbationConfig.empty(video.latent.shape[0]))
+
+
+def test_compiled_transformer_shares_graphs_across_blocks_and_shapes() -> None:
+    transformer = _tiny_transformer()
+    graphs = []
+
+    def counting_backend(graph: torch.fx.GraphModule, _example_inputs: list[torch.Tensor]) -> object:
+        graphs.append(graph)
+        return graph.forward
+
+    torch._dynamo.reset()
+    inputs = [_modalities(2, 6), _modalities(2, 10), _modalities(3, 14)]
+    with torch.inference_mode():
+        eager = [_forward(transformer, *modalities) for modalities in inputs]
+        compile_transformer_(transformer.velocity_model, backend=counting_backend)
+        compiled = [_forward(transformer, *modalities) for modalities in inputs]
+
+    # One graph per compiled region of a block (2 blocks here), reused by the other block and every shape.
+    assert len(graphs) == 8
+    for outputs, expected in zip(compiled, eager, strict=True):
+        for output, expected_output in zip(outputs, expected, strict=True):
+            torch.testing.assert_close(output, expected_output)
+
+
+def test_compiled_module_falls_back_to_eager_when_compilation_fails(caplog: pytest.LogCaptureFixture) -> None:
+    torch._dynamo.reset()
+    linear = torch.nn.Linear(4, 3)
+    x = torch.randn(2, 4)
+    expected = linear(x)
+
+    def failing_backend(_graph: torch.fx.GraphModule, _example_inputs: list[torch.Tensor]) -> object:
+        raise RuntimeError("no kernels for you")
+
+    compile_module_(linear, (0,), backend=failing_backend)
+    with caplog.at_level(logging.WARNING):
+        torch.testing.assert_close(linear(x), expected)
+        torch.testing.assert_close(linear(x), expected)
+
+    assert linear.forward.failed
+    assert sum("running it eagerly" in record.message for record in caplog.records) == 1
+
+
+def test_compiled_module_is_freed_without_garbage_collection() -> None:
+    linear = compile_module_(torch.nn.Linear(4, 3), (0,))
+    freed = weakref.ref(linear)
+
+    gc.disable()
+    try:
+        del linear
+        assert freed() is None
+    finally:
+        gc.enable()
+
+
+def test_model_ledger_does_not_compile_on_cpu(tmp_path: Path) -> None:
+    checkpoint = tmp_path / "ltx.safetensors"
+    save_file({"weight": torch.zeros(1)}, checkpoint)
+    ledger = ModelLedger(torch.float32, torch.device("cpu"), checkpoint_path=str(checkpoint), compile_models=True)
+    assert not ledger.compile_models
+    assert not ledger.with_loras(()).compile_models
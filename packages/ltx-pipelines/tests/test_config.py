@@ -9,6 +9,7 @@ from ltx_pipelines.utils.config import (
     _parser_defaults,
     apply_config_to_namespace,
     apply_config_to_parser,
+    config_to_argv,
     load_config,
 )
 
@@ -120,3 +121,33 @@ def test_apply_config_to_namespace_fills_default_only() -> None:
     apply_config_to_namespace(parser, ns, {"seed": 99, "prompt": "from_config"}, defaults_before)
     assert ns.seed == 99
     assert ns.prompt == "cli_prompt"
+
+
+def test_config_to_argv() -> None:
+    argv = config_to_argv(
+        {
+            "prompt": "a cat",
+            "seed": 7,
+            "enable-fp8": True,
+            "enhance_prompt": False,
+            "negative_prompt": None,
+            "video_stg_blocks": [28, 29],
+            "lora": [["a.safetensors", 0.5], ["b.safetensors", 1.0]],
+        }
+    )
+    assert argv == [
+        "--prompt",
+        "a cat",
+        "--seed",
+        "7",
+        "--enable-fp8",
+        "--video-stg-blocks",
+        "28",
+        "29",
+        "--lora",
+        "a.safetensors",
+        "0.5",
+        "--lora",
+        "b.safetensors",
+        "1.0",
+    ]
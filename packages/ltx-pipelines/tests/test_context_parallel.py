@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+
+from ltx_core.guidance.perturbations import BatchedPerturbationConfig
+from ltx_core.model.transformer import Modality, ResidualCache, X0Model, enable_context_parallel_
+from tests.test_helpers import _tiny_transformer
+
+WORLD_SIZE = 2
+
+
+def _modalities() -> tuple[Modality, Modality]:
+    generator = torch.Generator().manual_seed(0)
+    # Token counts not divisible by the world size, so the shards are uneven.
+    video = Modality(
+        latent=torch.randn(2, 7, 8, generator=generator),
+        timesteps=torch.rand(2, 7, 1, generator=generator),
+        positions=torch.rand(2, 3, 7, 2, generator=generator),
+        context=torch.randn(2, 5, 12, generator=generator),
+    )
+    audio = Modality(
+        latent=torch.randn(2, 5, 4, generator=generator),
+        timesteps=torch.rand(2, 5, 1, generator=generator),
+        positions=torch.rand(2, 1, 5, 2, generator=generator),
+        context=torch.randn(2, 5, 12, generator=generator),
+    )
+    return video, audio
+
+
+def _forward(transformer: X0Model) -> tuple[torch.Tensor, torch.Tensor]:
+    video, audio = _modalities()
+    return transformer(video=video, audio=audio, perturbations=BatchedPerturbationConfig.empty(2))
+
+
+def _run_rank(rank: int, store_path: str, output_dir: str) -> None:
+    dist.init_process_group("gloo", init_method=f"file://{store_path}", rank=rank, world_size=WORLD_SIZE)
+    try:
+        transformer = _tiny_transformer()
+        enable_context_parallel_(transformer.velocity_model)
+        with torch.inference_mode():
+            outputs = _forward(transformer)
+        torch.save(outputs, Path(output_dir) / f"rank{rank}.pt")
+    finally:
+        dist.destroy_process_group()
+
+
+def test_context_parallel_forward_matches_single_process(tmp_path: Path) -> None:
+    mp.spawn(_run_rank, args=(str(tmp_path / "store"), str(tmp_path)), nprocs=WORLD_SIZE)
+
+    with torch.inference_mode():
+        expected = _forward(_tiny_transformer())
+    for rank in range(WORLD_SIZE):
+        outputs = torch.load(tmp_path / f"rank{rank}.pt")
+        for output, expected_output in zip(outputs, expected, strict=True):
+            torch.testing.assert_close(output, expected_output)
+
+
+def test_context_parallel_rejects_residual_cache(tmp_path: Path) -> None:
+    dist.init_process_group("gloo", init_method=f"file://{tmp_path / 'store'}", rank=0, world_size=1)
+    try:
+        transformer = _tiny_transformer()
+        enable_context_parallel_(transformer.velocity_model)
+        video, audio = _modalities()
+        with pytest.raises(ValueError, match="Residual caching"):
+            transformer(
+                video=video,
+                audio=audio,
+                perturbations=BatchedPerturbationConfig.empty(2),
+                residual_cache=ResidualCache(0.05),
+            )
+    finally:
+        dist.destroy_process_group()
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import torch
+
+from ltx_core.loader import (
+    LTXV_LORA_COMFY_RENAMING_MAP,
+    LoraPathStrengthAndSDOps,
+    LoraStateDictWithStrength,
+    StateDict,
+    apply_loras,
+    fuse_loras_,
+    restore_weights_,
+)
+from ltx_pipelines.utils.model_cache import ModelCache
+from ltx_pipelines.utils.model_ledger import ModelLedger
+from tests.test_fused_cache import _ltx_checkpoint
+
+
+def _model(dtype: torch.dtype) -> torch.nn.Module:
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(16, 8), torch.nn.Linear(8, 8))
+    return model.to(dtype)
+
+
+def _lora(strength: float) -> LoraStateDictWithStrength:
+    generator = torch.Generator().manual_seed(1)
+    sd = {
+        "0.lora_A.weight": torch.randn(4, 16, generator=generator, dtype=torch.bfloat16),
+        "0.lora_B.weight": torch.randn(8, 4, generator=generator, dtype=torch.bfloat16),
+    }
+    return LoraStateDictWithStrength(StateDict(sd, torch.device("cpu"), 0, {torch.bfloat16}), strength)
+
+
+def _state_dict(model: torch.nn.Module) -> StateDict:
+    sd = {key: value.detach().clone() for key, value in model.state_dict().items()}
+    return StateDict(sd, torch.device("cpu"), 0, {value.dtype for value in sd.values()})
+
+
+def test_fuse_loras_in_place_matches_apply_loras() -> None:
+    for dtype in (torch.bfloat16, torch.float8_e4m3fn):
+        model = _model(torch.bfloat16)
+        if dtype == torch.float8_e4m3fn:
+            for linear in model:
+                linear.weight.data = linear.weight.data.to(dtype)
+        expected = apply_loras(_state_dict(model), [_lora(0.5)], dtype=None)
+
+        fuse_loras_(model, [_lora(0.5)])
+
+        for key, weight in model.state_dict().items():
+            assert weight.dtype == expected.sd[key].dtype
+            torch.testing.assert_close(weight.float(), expected.sd[key].float(), rtol=0, atol=0)
+
+
+def test_restore_weights_undoes_fusion_exactly() -> None:
+    for dtype in (torch.bfloat16, torch.float8_e4m3fn):
+        for strength in (0.01, 8.0):
+            model = _model(torch.bfloat16)
+            model[0].weight.data = model[0].weight.data.to(dtype)
+            original = {key: value.clone() for key, value in model.state_dict().items()}
+
+            original_weights = {}
+            fuse_loras_(model, [_lora(strength)], original_weights)
+            assert list(original_weights) == ["0.weight"]
+            assert not torch.equal(model[0].weight.float(), original["0.weight"].float())
+
+            restore_weights_(model, original_weights)
+            for key, weight in model.state_dict().items():
+                assert weight.dtype == original[key].dtype
+                assert torch.equal(weight.view(torch.uint8), original[key].view(torch.uint8))
+
+
+def test_ledger_fused_loras_restores_a_cached_transformer_exactly(tmp_path: Path) -> None:
+    checkpoint, lora = _ltx_checkpoint(tmp_path)
+    ledger = ModelLedger(torch.bfloat16, torch.device("cpu"), checkpoint_path=checkpoint, model_cache=ModelCache())
+    transformer = ledger.transformer()
+    original = {key: value.clone() for key, value in transformer.state_dict().items()}
+
+    with ledger.fused_loras(transformer, [LoraPathStrengthAndSDOps(lora, 8.0, LTXV_LORA_COMFY_RENAMING_MAP)]):
+        assert any(not torch.equal(value, original[key]) for key, value in transformer.state_dict().items())
+    for key, value in transformer.state_dict().items():
+        assert torch.equal(value.view(torch.uint8), original[key].view(torch.uint8))
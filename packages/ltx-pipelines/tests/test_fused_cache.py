@@ -0,0 +1,183 @@
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+import torch
+from safetensors.torch import save_file
+
+from ltx_core.loader import (
+    LTXV_LORA_COMFY_RENAMING_MAP,
+    FusedWeightCache,
+    LoraPathStrengthAndSDOps,
+    SingleGPUModelBuilder,
+    fused_cache,
+    single_gpu_model_builder,
+)
+from ltx_pipelines.utils.model_ledger import ModelLedger
+from tests.test_helpers import _tiny_transformer
+from tests.test_model_builder import _checkpoint, _RecordingLoader, _TinyConfigurator
+
+CPU = torch.device("cpu")
+
+
+def _builder(tmp_path: Path, cache: FusedWeightCache, strength: float = 0.5) -> SingleGPUModelBuilder:
+    checkpoint, lora = _checkpoint(tmp_path)
+    builder = SingleGPUModelBuilder(model_class_configurator=_TinyConfigurator, model_path=checkpoint)
+    return replace(builder.lora(lora, strength), fused_cache=cache)
+
+
+def _assert_same_weights(model: torch.nn.Module, expected: torch.nn.Module) -> None:
+    for parameter, expected_parameter in zip(model.parameters(), expected.parameters(), strict=True):
+        assert parameter.dtype == expected_parameter.dtype
+        torch.testing.assert_close(parameter, expected_parameter)
+
+
+def test_fused_weights_are_cached_and_reused(tmp_path: Path) -> None:
+    cache = FusedWeightCache(tmp_path / "cache", verify=True)
+    builder = _builder(tmp_path, cache)
+    expected = replace(builder, fused_cache=None).build(CPU, torch.bfloat16)
+
+    first = builder.build(CPU, torch.bfloat16)
+    assert len(list((tmp_path / "cache").glob("*.safetensors"))) == 1
+
+    loader = _RecordingLoader()
+    second = replace(builder, model_loader=loader).build(CPU, torch.bfloat16)
+    # The LoRA is not loaded again, and the cached weights are used as stored.
+    assert loader.loaded_paths == []
+    _assert_same_weights(first, expected)
+    _assert_same_weights(second, expected)
+
+    # A different strength is a different entry.
+    replace(builder, loras=(builder.loras[0]._replace(strength=1.0),)).build(CPU, torch.bfloat16)
+    assert len(list((tmp_path / "cache").glob("*.safetensors"))) == 2
+
+
+def test_invalid_entries_are_dropped(tmp_path: Path) -> None:
+    cache = FusedWeightCache(tmp_path / "cache")
+    builder = _builder(tmp_path, cache)
+    expected = builder.build(CPU, torch.bfloat16)
+    (entry,) = (tmp_path / "cache").glob("*.safetensors")
+    data = bytearray(entry.read_bytes())
+    data[-1] ^= 0xFF
+    entry.write_bytes(bytes(data))
+
+    assert cache.get(entry.stem) is None
+    assert not entry.exists()
+    _assert_same_weights(builder.build(CPU, torch.bfloat16), expected)
+    assert entry.exists()
+
+
+def test_entries_are_verified_once_until_they_change(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = FusedWeightCache(tmp_path / "cache")
+    _builder(tmp_path, cache).build(CPU, torch.bfloat16)
+    (entry,) = (tmp_path / "cache").glob("*.safetensors")
+    checked = []
+    file_sha256 = fused_cache._file_sha256
+    monkeypatch.setattr(fused_cache, "_file_sha256", lambda path: checked.append(path) or file_sha256(path))
+
+    assert cache.get(entry.stem) == str(entry)
+    assert cache.get(entry.stem) == str(entry)
+    assert checked == [entry]
+
+    # Corrupted tensor data of the same size is caught once the file changed.
+    data = bytearray(entry.read_bytes())
+    data[-1] ^= 0xFF
+    entry.write_bytes(bytes(data))
+    assert cache.get(entry.stem) is None
+    assert checked == [entry, entry]
+
+
+def test_least_recently_used_entries_are_evicted_over_the_cap(tmp_path: Path) -> None:
+    cache = FusedWeightCache(tmp_path / "cache")
+    _builder(tmp_path, cache, 0.5).build(CPU, torch.bfloat16)
+    (first,) = (tmp_path / "cache").glob("*.safetensors")
+    cache.max_bytes = first.stat().st_size
+
+    _builder(tmp_path, cache, 1.0).build(CPU, torch.bfloat16)
+    (second,) = (tmp_path / "cache").glob("*.safetensors")
+    assert second != first
+    assert cache.used_bytes() <= cache.max_bytes
+
+    # An entry larger than the cap is not kept.
+    cache.max_bytes = 1
+    _builder(tmp_path, cache, 0.25).build(CPU, torch.bfloat16)
+    assert cache.used_bytes() == 0
+
+
+def _ltx_checkpoint(tmp_path: Path) -> tuple[str, str]:
+    config = {
+        "transformer": {
+            "num_attention_heads": 2,
+            "attention_head_dim": 8,
+            "in_channels": 8,
+            "out_channels": 8,
+            "num_layers": 2,
+            "cross_attention_dim": 16,
+            "caption_channels": 12,
+            "audio_num_attention_heads": 2,
+            "audio_attention_head_dim": 4,
+            "audio_in_channels": 4,
+            "audio_out_channels": 4,
+            "audio_cross_attention_dim": 8,
+            "dropout": 0.0,
+            "attention_bias": True,
+            "num_vector_embeds": None,
+            "activation_fn": "gelu-approximate",
+            "num_embeds_ada_norm": 1000,
+            "use_linear_projection": False,
+            "only_cross_attention": False,
+            "cross_attention_norm": True,
+            "double_self_attention": False,
+            "upcast_attention": False,
+            "standardization_norm": "rms_norm",
+            "norm_elementwise_affine": False,
+            "qk_norm": "rms_norm",
+            "positional_embedding_type": "rope",
+            "use_audio_video_cross_attention": True,
+            "share_ff": False,
+            "av_cross_ada_norm": True,
+            "use_middle_indices_grid": True,
+        }
+    }
+    weights = _tiny_transformer().velocity_model.state_dict()
+    checkpoint = tmp_path / "ltx.safetensors"
+    save_file(
+        {f"model.diffusion_model.{key}": value.bfloat16() for key, value in weights.items()},
+        checkpoint,
+        metadata={"config": json.dumps(config)},
+    )
+    generator = torch.Generator().manual_seed(1)
+    lora = tmp_path / "ltx_lora.safetensors"
+    save_file(
+        {
+            "diffusion_model.transformer_blocks.0.attn1.to_q.lora_A.weight": torch.randn(2, 16, generator=generator),
+            "diffusion_model.transformer_blocks.0.attn1.to_q.lora_B.weight": torch.randn(16, 2, generator=generator),
+        },
+        lora,
+    )
+    return str(checkpoint), str(lora)
+
+
+def test_ledger_models_use_the_fused_weight_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    checkpoint, lora = _ltx_checkpoint(tmp_path)
+    cache = FusedWeightCache(tmp_path / "cache")
+
+    def ledger() -> ModelLedger:
+        return ModelLedger(
+            torch.bfloat16,
+            CPU,
+            checkpoint_path=checkpoint,
+            loras=[LoraPathStrengthAndSDOps(lora, 0.5, LTXV_LORA_COMFY_RENAMING_MAP)],
+            fused_lora_cache=cache,
+        )
+
+    (first,) = ledger().models("transformer")
+    assert len(list((tmp_path / "cache").glob("*.safetensors"))) == 1
+
+    def fail(*_args, **_kwargs) -> None:
+        raise AssertionError("LoRAs fused again instead of loaded from the cache")
+
+    monkeypatch.setattr(single_gpu_model_builder, "apply_loras", fail)
+    (second,) = ledger().models("transformer")
+    _assert_same_weights(second, first)
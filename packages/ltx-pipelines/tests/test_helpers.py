@@ -0,0 +1,319 @@
+import pytest
+import torch
+
+from ltx_core.components.guiders import MultiModalGuider, MultiModalGuiderParams
+from ltx_core.guidance.perturbations import (
+    BatchedPerturbationConfig,
+    Perturbation,
+    PerturbationConfig,
+    PerturbationType,
+)
+from ltx_core.model.transformer import ResidualCache, X0Model, transformer_args
+from ltx_core.model.transformer.model import LTXModel
+from ltx_core.model.transformer.transformer import gate, modulate
+from ltx_core.model.transformer.transformer_args import TransformerArgs, select_samples, unique_timesteps
+from ltx_core.types import LatentState
+from ltx_pipelines.utils.helpers import (
+    batched_guidance_forward,
+    modality_from_latent_state,
+    multi_modal_guider_denoising_func,
+)
+from ltx_pipelines.utils.types import DenoisingFunc
+
+
+def _tiny_transformer() -> X0Model:
+    torch.manual_seed(0)
+    model = LTXModel(
+        num_attention_heads=2,
+        attention_head_dim=8,
+        in_channels=8,
+        out_channels=8,
+        num_layers=2,
+        cross_attention_dim=16,
+        caption_channels=12,
+        audio_num_attention_heads=2,
+        audio_attention_head_dim=4,
+        audio_in_channels=4,
+        audio_out_channels=4,
+        audio_cross_attention_dim=8,
+    )
+    with torch.no_grad():
+        for parameter in model.parameters():
+            parameter.normal_(std=0.2)
+    return X0Model(model).eval()
+
+
+def _states() -> tuple[LatentState, LatentState]:
+    torch.manual_seed(1)
+    video_positions = torch.arange(6.0).expand(1, 3, 6).unsqueeze(-1)
+    video_positions = torch.cat([video_positions, video_positions + 1.0], dim=-1)
+    video = LatentState(
+        latent=torch.randn(1, 6, 8),
+        denoise_mask=torch.ones(1, 6, 1),
+        positions=video_positions,
+        clean_latent=torch.zeros(1, 6, 8),
+    )
+    audio_positions = torch.arange(4.0).view(1, 1, 4, 1)
+    audio_positions = torch.cat([audio_positions, audio_positions + 1.0], dim=-1)
+    audio = LatentState(
+        latent=torch.randn(1, 4, 4),
+        denoise_mask=torch.ones(1, 4, 1),
+        positions=audio_positions,
+        clean_latent=torch.zeros(1, 4, 4),
+    )
+    return video, audio
+
+
+def test_batched_guidance_forward_matches_sequential_passes() -> None:
+    transformer = _tiny_transformer()
+    video_state, audio_state = _states()
+    v_context, a_context = torch.randn(1, 5, 12), torch.randn(1, 5, 12)
+    v_neg, a_neg = torch.randn(1, 5, 12), torch.randn(1, 5, 12)
+    sigma = torch.tensor(0.7)
+    pos = (
+        modality_from_latent_state(video_state, v_context, sigma),
+        modality_from_latent_state(audio_state, a_context, sigma),
+    )
+    neg = (
+        modality_from_latent_state(video_state, v_neg, sigma),
+        modality_from_latent_state(audio_state, a_neg, sigma),
+    )
+    stg = PerturbationConfig([Perturbation(PerturbationType.SKIP_VIDEO_SELF_ATTN, [1])])
+    iso = PerturbationConfig(
+        [
+            Perturbation(PerturbationType.SKIP_A2V_CROSS_ATTN, None),
+            Perturbation(PerturbationType.SKIP_V2A_CROSS_ATTN, None),
+        ]
+    )
+    passes = [(*pos, PerturbationConfig.empty()), (*neg, PerturbationConfig.empty()), (*pos, stg), (*pos, iso)]
+
+    with torch.inference_mode():
+        batched = batched_guidance_forward(transformer, passes)
+        sequential = [
+            transformer(video=video, audio=audio, perturbations=BatchedPerturbationConfig([config]))
+            for video, audio, config in passes
+        ]
+
+    for (batched_video, batched_audio), (video, audio) in zip(batched, sequential, strict=True):
+        torch.testing.assert_close(batched_video, video)
+        torch.testing.assert_close(batched_audio, audio)
+
+
+def test_batched_guidance_forward_runs_unperturbed_blocks_once_for_shared_inputs() -> None:
+    transformer = _tiny_transformer()
+    video_state, audio_state = _states()
+    sigma = torch.tensor(0.7)
+    pos = (
+        modality_from_latent_state(video_state, torch.randn(1, 5, 12), sigma),
+        modality_from_latent_state(audio_state, torch.randn(1, 5, 12), sigma),
+    )
+    neg = (
+        modality_from_latent_state(video_state, torch.randn(1, 5, 12), sigma),
+        modality_from_latent_state(audio_state, torch.randn(1, 5, 12), sigma),
+    )
+    stg = PerturbationConfig([Perturbation(PerturbationType.SKIP_AUDIO_SELF_ATTN, [1])])
+    iso = PerturbationConfig([Perturbation(PerturbationType.SKIP_A2V_CROSS_ATTN, [0])])
+    passes = [(*pos, stg), (*pos, PerturbationConfig.empty()), (*neg, PerturbationConfig.empty()), (*pos, iso)]
+    block_batch_sizes = []
+    for block in transformer.velocity_model.transformer_blocks:
+        block.register_forward_pre_hook(
+            lambda _, __, kwargs: block_batch_sizes.append(kwargs["video"].x.shape[0]), with_kwargs=True
+        )
+
+    with torch.inference_mode():
+        sequential = [
+            transformer(video=video, audio=audio, perturbations=BatchedPerturbationConfig([config]))
+            for video, audio, config in passes
+        ]
+        block_batch_sizes.clear()
+        batched = batched_guidance_forward(transformer, passes)
+
+    # Block 0: shared positive and negative rows, plus the isolated pass perturbing it. Block 1: the STG pass forks.
+    assert block_batch_sizes == [3, 4]
+    for (batched_video, batched_audio), (video, audio) in zip(batched, sequential, strict=True):
+        torch.testing.assert_close(batched_video, video)
+        torch.testing.assert_close(batched_audio, audio)
+
+
+def test_batched_guidance_forward_pads_contexts_of_different_lengths() -> None:
+    transformer = _tiny_transformer()
+    video_state, audio_state = _states()
+    sigma = torch.tensor(0.7)
+    passes = [
+        (
+            modality_from_latent_state(video_state, torch.randn(1, length, 12), sigma),
+            modality_from_latent_state(audio_state, torch.randn(1, length, 12), sigma),
+            PerturbationConfig.empty(),
+        )
+        for length in (8, 3)
+    ]
+    calls = []
+    original_forward = transformer.forward
+
+    def counting_forward(*args, **kwargs) -> tuple[torch.Tensor, torch.Tensor]:
+        calls.append(kwargs["video"].context.shape)
+        return original_forward(*args, **kwargs)
+
+    with torch.inference_mode():
+        sequential = [
+            transformer(video=video, audio=audio, perturbations=BatchedPerturbationConfig([config]))
+            for video, audio, config in passes
+        ]
+        transformer.forward = counting_forward
+        batched = batched_guidance_forward(transformer, passes)
+
+    assert calls == [torch.Size([2, 8, 12])]
+    for (batched_video, batched_audio), (video, audio) in zip(batched, sequential, strict=True):
+        torch.testing.assert_close(batched_video, video)
+        torch.testing.assert_close(batched_audio, audio)
+
+
+def test_multi_modal_guider_denoising_func_runs_single_forward() -> None:
+    transformer = _tiny_transformer()
+    calls = []
+    original_forward = transformer.forward
+
+    def counting_forward(*args, **kwargs) -> tuple[torch.Tensor, torch.Tensor]:
+        calls.append((kwargs["video"].latent.shape[0], len(kwargs["perturbations"].perturbations)))
+        return original_forward(*args, **kwargs)
+
+    transformer.forward = counting_forward
+    video_state, audio_state = _states()
+    params = MultiModalGuiderParams(cfg_scale=3.0, stg_scale=1.0, stg_blocks=[1], modality_scale=3.0)
+    denoise_fn = multi_modal_guider_denoising_func(
+        video_guider=MultiModalGuider(params=params, negative_context=torch.randn(1, 5, 12)),
+        audio_guider=MultiModalGuider(params=params, negative_context=torch.randn(1, 5, 12)),
+        v_context=torch.randn(1, 5, 12),
+        a_context=torch.randn(1, 5, 12),
+        transformer=transformer,
+    )
+
+    with torch.inference_mode():
+        denoised_video, denoised_audio = denoise_fn(video_state, audio_state, torch.tensor([1.0, 0.5, 0.0]), 0)
+
+    # Positive, negative, STG and modality-isolated passes; the last two share the positive inputs.
+    assert calls == [(2, 4)]
+    assert denoised_video.shape == video_state.latent.shape
+    assert denoised_audio.shape == audio_state.latent.shape
+
+
+def test_cross_attention_cache_reuses_context_projections_across_steps() -> None:
+    transformer = _tiny_transformer()
+    video_state, audio_state = _states()
+    params = MultiModalGuiderParams(cfg_scale=3.0, stg_scale=1.0, stg_blocks=[1], modality_scale=3.0)
+    contexts = [torch.randn(1, 5, 12) for _ in range(4)]
+    sigmas = torch.tensor([1.0, 0.5, 0.0])
+    key_projections = []
+    block = transformer.velocity_model.transformer_blocks[0]
+    block.attn2.to_k.register_forward_hook(lambda *_: key_projections.append(1))
+
+    def denoise_fn(cache_cross_attention: bool) -> DenoisingFunc:
+        return multi_modal_guider_denoising_func(
+            video_guider=MultiModalGuider(params=params, negative_context=contexts[0]),
+            audio_guider=MultiModalGuider(params=params, negative_context=contexts[1]),
+            v_context=contexts[2],
+            a_context=contexts[3],
+            transformer=transformer,
+            cache_cross_attention=cache_cross_attention,
+        )
+
+    with torch.inference_mode():
+        cached, uncached = denoise_fn(True), denoise_fn(False)
+        for step_index in range(2):
+            key_projections.clear()
+            cached_video, cached_audio = cached(video_state, audio_state, sigmas, step_index)
+            assert len(key_projections) == (1 if step_index == 0 else 0)
+            video, audio = uncached(video_state, audio_state, sigmas, step_index)
+            torch.testing.assert_close(cached_video, video)
+            torch.testing.assert_close(cached_audio, audio)
+
+
+def test_adaln_values_are_computed_per_timestep_group(monkeypatch: pytest.MonkeyPatch) -> None:
+    model = _tiny_transformer().velocity_model
+    timesteps = torch.tensor([[0.0, 0.7, 0.7, 0.0], [0.7, 0.7, 0.7, 0.7]])
+    values, index, token_groups = unique_timesteps(timesteps)
+    seven = torch.tensor(0.7).item()
+    assert values.tolist() == [0.0, seven, seven, seven]
+    assert index.tolist() == [[0, 1], [2, 3]]
+    assert token_groups.tolist() == [0, 1, 1, 0]
+    uniform_values, uniform_index, uniform_groups = unique_timesteps(torch.tensor([[0.5] * 5, [0.2] * 5]))
+    assert uniform_values.tolist() == [0.5, torch.tensor(0.2).item()]
+    assert uniform_index.tolist() == [[0], [1]]
+    assert uniform_groups is None
+
+    preprocessor = model.video_args_preprocessor.simple_preprocessor
+    per_token, _ = preprocessor._prepare_timestep(timesteps, torch.float32)
+    per_value, _ = preprocessor._prepare_timestep(values, torch.float32)
+    block = model.transformer_blocks[0]
+    shift, scale, gate_values = block.get_ada_values(block.scale_shift_table, per_value, index, slice(0, 3))
+    assert shift.shape == (2, 2, block.scale_shift_table.shape[1])
+    expected_shift, expected_scale, expected_gate = (
+        block.scale_shift_table[None, None] + per_token.view(2, 4, 6, -1)
+    ).unbind(dim=2)[:3]
+    x = torch.randn(2, 4, block.scale_shift_table.shape[1])
+    torch.testing.assert_close(modulate(x, scale, shift, token_groups), x * (1 + expected_scale) + expected_shift)
+    torch.testing.assert_close(gate(x, gate_values, token_groups), x * expected_gate)
+
+    # The multi-modal preprocessor groups the timesteps once for all its AdaLNs.
+    groupings = []
+    monkeypatch.setattr(transformer_args, "unique_timesteps", lambda t: groupings.append(t) or unique_timesteps(t))
+    video_state, _ = _states()
+    model.video_args_preprocessor.prepare(modality_from_latent_state(video_state, torch.randn(1, 5, 12), 0.7))
+    assert len(groupings) == 1
+
+
+def test_residual_cache_skips_blocks_while_input_is_unchanged() -> None:
+    transformer = _tiny_transformer()
+    video_state, audio_state = _states()
+    v_context, a_context = torch.randn(1, 5, 12), torch.randn(1, 5, 12)
+    block_calls = []
+    transformer.velocity_model.transformer_blocks[0].register_forward_hook(lambda *_: block_calls.append(1))
+    cache = ResidualCache(threshold=0.05, max_skipped_steps=2)
+
+    def forward(sigma: float, stg: bool = False) -> tuple[torch.Tensor, torch.Tensor]:
+        video = modality_from_latent_state(video_state, v_context, torch.tensor(sigma))
+        audio = modality_from_latent_state(audio_state, a_context, torch.tensor(sigma))
+        config = PerturbationConfig([Perturbation(PerturbationType.SKIP_VIDEO_SELF_ATTN, [1])] if stg else [])
+        return transformer(
+            video=video, audio=audio, perturbations=BatchedPerturbationConfig([config]), residual_cache=cache
+        )
+
+    with torch.inference_mode():
+        computed = forward(0.7)
+        for _ in range(2):
+            # Same input: the cached residual reproduces the computed output.
+            for cached_output, output in zip(forward(0.7), computed, strict=True):
+                torch.testing.assert_close(cached_output, output)
+        assert len(block_calls) == 1
+
+        forward(0.7)  # max_skipped_steps reached
+        forward(0.1)  # input changed beyond the threshold
+        forward(0.1, stg=True)  # different batch layout
+        assert len(block_calls) == 4
+    assert (cache.computed_steps, cache.skipped_steps) == (4, 2)
+
+
+def test_select_samples_keeps_batch_broadcast_embeddings_as_views() -> None:
+    cos, sin = torch.randn(1, 2, 6, 4).expand(3, -1, -1, -1), torch.randn(1, 2, 6, 4).expand(3, -1, -1, -1)
+    args = TransformerArgs(
+        x=torch.randn(3, 6, 8),
+        context=torch.randn(3, 5, 16),
+        context_mask=None,
+        timesteps=torch.randn(1, 6, 8),
+        embedded_timestep=torch.randn(1, 1, 8),
+        positional_embeddings=(cos, sin),
+        cross_positional_embeddings=None,
+        cross_scale_shift_timestep=None,
+        cross_gate_timestep=None,
+        enabled=True,
+        timestep_index=torch.zeros(3, 1, dtype=torch.long),
+    )
+    selected = select_samples(args, [2, 0, 0, 1])
+
+    for pe, expected in zip(selected.positional_embeddings, (cos, sin), strict=True):
+        assert pe.shape == (4, 2, 6, 4)
+        assert pe.stride(0) == 0
+        assert pe.data_ptr() == expected.data_ptr()
+        torch.testing.assert_close(pe, expected[[2, 0, 0, 1]])
+    torch.testing.assert_close(selected.x, args.x[[2, 0, 0, 1]])
+    torch.testing.assert_close(selected.context, args.context[[2, 0, 0, 1]])
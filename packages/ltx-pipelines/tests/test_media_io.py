@@ -0,0 +1,64 @@
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import av
+import pytest
+import torch
+
+from ltx_pipelines.utils.media_io import decode_video_from_file, encode_video
+
+
+def _chunk(value: int) -> torch.Tensor:
+    return torch.full((4, 32, 48, 3), value, dtype=torch.uint8)
+
+
+def test_encode_video_encodes_while_next_chunk_is_decoded(tmp_path: Path) -> None:
+    values = (40, 120, 200)
+    resumed = [threading.Event() for _ in values]
+    overlapped = []
+    original_from_ndarray = av.VideoFrame.from_ndarray
+    encoder_threads = set()
+
+    def from_ndarray(array: object, format: str) -> av.VideoFrame:  # noqa: A002
+        chunk_index = values.index(int(array[0, 0, 0]))
+        encoder_threads.add(threading.current_thread().name)
+        # Encoding a chunk only completes once decoding of the next chunk has started.
+        overlapped.append(resumed[chunk_index].wait(timeout=5))
+        return original_from_ndarray(array, format=format)
+
+    def chunks() -> Iterator[torch.Tensor]:
+        for index, value in enumerate(values):
+            yield _chunk(value)
+            resumed[index].set()
+
+    output = tmp_path / "out.mp4"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(av.VideoFrame, "from_ndarray", from_ndarray)
+        encode_video(
+            chunks(), fps=24, audio=None, audio_sample_rate=None, output_path=str(output), video_chunks_number=3
+        )
+
+    assert encoder_threads == {"ltx-video-encoder"}
+    assert all(overlapped)
+    frames = list(decode_video_from_file(str(output), frame_cap=-1, device="cpu"))
+    assert len(frames) == 12
+    for index, value in enumerate(values):
+        assert abs(frames[4 * index].float().mean().item() - value) < 8
+
+
+def test_encode_video_propagates_decode_errors(tmp_path: Path) -> None:
+    def chunks() -> Iterator[torch.Tensor]:
+        yield _chunk(0)
+        raise RuntimeError("decode failed")
+
+    with pytest.raises(RuntimeError, match="decode failed"):
+        encode_video(
+            chunks(),
+            fps=24,
+            audio=None,
+            audio_sample_rate=None,
+            output_path=str(tmp_path / "out.mp4"),
+            video_chunks_number=2,
+        )
+    assert not any(thread.name == "ltx-video-encoder" for thread in threading.enumerate())
@@ -0,0 +1,140 @@
+from collections.abc import Iterator, Sequence
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+import torch
+from safetensors.torch import save_file
+
+from ltx_core.loader import (
+    ParallelSafetensorsStateDictLoader,
+    SafetensorsModelStateDictLoader,
+    SafetensorsStateDictLoader,
+    SingleGPUModelBuilder,
+    StateDict,
+    StateDictRegistry,
+    build_models,
+)
+from ltx_core.loader.sd_ops import SDOps
+from ltx_pipelines.utils.model_ledger import ModelLedger
+
+
+class _TinyConfigurator:
+    @classmethod
+    def from_config(cls, config: dict) -> torch.nn.Module:
+        return torch.nn.Sequential(torch.nn.Linear(config["dim"], config["dim"]), torch.nn.LayerNorm(config["dim"]))
+
+
+class _RecordingLoader(SafetensorsModelStateDictLoader):
+    def __init__(self, weight_loader: SafetensorsStateDictLoader | None = None) -> None:
+        super().__init__(weight_loader)
+        self.loaded_paths: list[str | list[str]] = []
+
+    def load(self, path: str | list[str], sd_ops: SDOps | None = None, device: torch.device | None = None) -> StateDict:
+        self.loaded_paths.append(path)
+        return super().load(path, sd_ops, device)
+
+    def iter_routed_tensors(
+        self, path: str | list[str], sd_ops: Sequence[SDOps | None], device: torch.device | None = None
+    ) -> Iterator[tuple[int, str, torch.Tensor]]:
+        self.loaded_paths.append(path)
+        return super().iter_routed_tensors(path, sd_ops, device)
+
+
+def _checkpoint(tmp_path: Path) -> tuple[str, str]:
+    generator = torch.Generator().manual_seed(0)
+    checkpoint = tmp_path / "model.safetensors"
+    weights = {
+        "0.weight": torch.randn(4, 4, generator=generator),
+        "0.bias": torch.randn(4, generator=generator),
+        "1.weight": torch.randn(4, generator=generator),
+        "1.bias": torch.randn(4, generator=generator),
+    }
+    save_file({key: value.bfloat16() for key, value in weights.items()}, checkpoint, metadata={"config": '{"dim": 4}'})
+    lora = tmp_path / "lora.safetensors"
+    save_file(
+        {
+            "0.lora_A.weight": torch.randn(2, 4, generator=generator),
+            "0.lora_B.weight": torch.randn(4, 2, generator=generator),
+        },
+        lora,
+    )
+    return str(checkpoint), str(lora)
+
+
+@pytest.mark.parametrize("lora_strength", [None, 0.5])
+def test_model_is_built_one_tensor_at_a_time_without_a_state_dict(tmp_path: Path, lora_strength: float | None) -> None:
+    checkpoint, lora = _checkpoint(tmp_path)
+    builder = SingleGPUModelBuilder(model_class_configurator=_TinyConfigurator, model_path=checkpoint)
+    if lora_strength is not None:
+        builder = builder.lora(lora, lora_strength)
+    cpu = torch.device("cpu")
+    expected = replace(builder, registry=StateDictRegistry()).build(cpu, torch.bfloat16)
+
+    loader = _RecordingLoader()
+    model = replace(builder, model_loader=loader).build(cpu, torch.bfloat16)
+
+    # Only the LoRA is loaded as a state dict; the checkpoint is streamed.
+    assert loader.loaded_paths == ([] if lora_strength is None else [[lora]])
+    for parameter, expected_parameter in zip(model.parameters(), expected.parameters(), strict=True):
+        assert parameter.dtype == torch.bfloat16
+        torch.testing.assert_close(parameter, expected_parameter)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_models_sharing_a_checkpoint_are_built_in_one_pass(tmp_path: Path, parallel: bool) -> None:
+    generator = torch.Generator().manual_seed(0)
+    checkpoint = tmp_path / "model.safetensors"
+    shapes = {"0.weight": (4, 4), "0.bias": (4,), "1.bias": (4,)}
+    weights = {
+        f"{prefix}.{key}": torch.randn(shape, generator=generator)
+        for prefix in ("encoder", "decoder")
+        for key, shape in shapes.items()
+    }
+    # Stored once, used by both models.
+    weights["shared.1.weight"] = torch.randn(4, generator=generator)
+    save_file(weights, checkpoint, metadata={"config": '{"dim": 4}'})
+    builders = [
+        SingleGPUModelBuilder(
+            model_class_configurator=_TinyConfigurator,
+            model_path=str(checkpoint),
+            model_sd_ops=SDOps(prefix)
+            .with_matching(prefix=f"{prefix}.")
+            .with_matching(prefix="shared.")
+            .with_replacement(f"{prefix}.", "")
+            .with_replacement("shared.", ""),
+        )
+        for prefix in ("encoder", "decoder")
+    ]
+    cpu = torch.device("cpu")
+    expected = [builder.build(cpu, torch.bfloat16) for builder in builders]
+
+    loader = _RecordingLoader(ParallelSafetensorsStateDictLoader(max_workers=2) if parallel else None)
+    builders = [replace(builder, model_loader=loader) for builder in builders]
+    models = build_models([(builder, cpu, torch.bfloat16) for builder in builders])
+
+    assert loader.loaded_paths == [[str(checkpoint)]]
+    for model, expected_model in zip(models, expected, strict=True):
+        for parameter, expected_parameter in zip(model.parameters(), expected_model.parameters(), strict=True):
+            assert parameter.dtype == torch.bfloat16
+            torch.testing.assert_close(parameter, expected_parameter)
+    assert models[0][1].weight.data_ptr() != models[1][1].weight.data_ptr()
+
+
+def test_streamed_build_rejects_tensors_of_the_wrong_shape(tmp_path: Path) -> None:
+    checkpoint = tmp_path / "model.safetensors"
+    save_file({"0.weight": torch.zeros(3, 7), "0.bias": torch.zeros(4)}, checkpoint, metadata={"config": '{"dim": 4}'})
+    builder = SingleGPUModelBuilder(model_class_configurator=_TinyConfigurator, model_path=str(checkpoint))
+
+    with pytest.raises(RuntimeError, match=r"size mismatch for 0\.weight"):
+        builder.build(torch.device("cpu"))
+
+
+def test_ledger_memory_maps_checkpoints_unless_given_load_workers() -> None:
+    def weight_loader(**kwargs: int) -> SafetensorsStateDictLoader:
+        ledger = ModelLedger(torch.bfloat16, torch.device("cpu"), checkpoint_path="model.safetensors", **kwargs)
+        return ledger.transformer_builder.model_loader.weight_loader
+
+    assert type(weight_loader()) is SafetensorsStateDictLoader
+    assert type(weight_loader(load_workers=1)) is SafetensorsStateDictLoader
+    assert isinstance(weight_loader(load_workers=4), ParallelSafetensorsStateDictLoader)
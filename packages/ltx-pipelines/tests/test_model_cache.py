@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from ltx_pipelines.utils.model_cache import DEFAULT_GPU_BUDGET_FRACTION, GIB, ModelCache, module_nbytes
+
+_CPU = torch.device("cpu")
+
+
+def _linear() -> torch.nn.Module:
+    return torch.nn.Linear(16, 16)
+
+
+def test_module_nbytes_counts_parameters_and_buffers() -> None:
+    module = torch.nn.BatchNorm1d(4)
+    expected = sum(t.numel() * t.element_size() for t in [*module.parameters(), *module.buffers()])
+    assert module_nbytes(module) == expected
+
+
+def test_get_or_build_reuses_resident_model() -> None:
+    cache = ModelCache()
+    builds = []
+
+    def build() -> torch.nn.Module:
+        builds.append(1)
+        return _linear()
+
+    first = cache.get_or_build(("a",), build, _CPU)
+    second = cache.get_or_build(("a",), build, _CPU)
+    assert first is second
+    assert len(builds) == 1
+
+
+def test_lru_eviction_under_budget() -> None:
+    size = module_nbytes(_linear())
+    cache = ModelCache(device_budgets={"cpu": 2 * size})
+    for key in ("a", "b", "a", "c"):
+        cache.release(cache.get_or_build((key,), _linear, _CPU))
+
+    assert ("a",) in cache
+    assert ("b",) not in cache
+    assert ("c",) in cache
+    assert cache.used_bytes(_CPU) == 2 * size
+
+
+def test_checked_out_models_are_not_evicted() -> None:
+    size = module_nbytes(_linear())
+    cache = ModelCache(device_budgets={"cpu": size})
+    held = cache.get_or_build(("a",), _linear, _CPU)
+    cache.release(cache.get_or_build(("b",), _linear, _CPU))
+    # Checked out again: the checkout keeps it resident, not references to it.
+    cache.get_or_build(("b",), _linear, _CPU)
+
+    assert ("a",) in cache
+    assert ("b",) in cache
+    cache.release(held)
+    cache.get_or_build(("c",), _linear, _CPU)
+    assert ("a",) not in cache
+    assert ("b",) in cache
+    cache.release_all()
+    cache.get_or_build(("d",), _linear, _CPU)
+    assert ("b",) not in cache
+
+
+def test_room_is_made_before_building_a_model_of_expected_size() -> None:
+    size = module_nbytes(_linear())
+    cache = ModelCache(device_budgets={"cpu": 2 * size})
+    cache.release(cache.get_or_build(("a",), _linear, _CPU))
+    cache.release(cache.get_or_build(("b",), _linear, _CPU))
+    resident_while_building = []
+
+    def build() -> torch.nn.Module:
+        resident_while_building.extend(key for key in (("a",), ("b",)) if key in cache)
+        return torch.nn.Linear(16, 32)
+
+    cache.get_or_build(("c",), build, _CPU, expected_nbytes=lambda: 2 * size)
+    assert resident_while_building == []
+
+
+def test_cuda_budget_defaults_to_a_fraction_of_device_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    properties = SimpleNamespace(total_memory=80 * GIB)
+    monkeypatch.setattr(torch.cuda, "get_device_properties", lambda _device: properties)
+
+    assert ModelCache()._budget(torch.device("cuda:0")) == int(80 * GIB * DEFAULT_GPU_BUDGET_FRACTION)
+    assert ModelCache(device_budgets={"cuda": GIB})._budget(torch.device("cuda:0")) == GIB
+    assert ModelCache(gpu_budget_fraction=None)._budget(torch.device("cuda:0")) is None
+    assert ModelCache()._budget(_CPU) is None
@@ -0,0 +1,110 @@
+import threading
+from pathlib import Path
+
+import pytest
+import torch
+from safetensors.torch import save_file
+
+from ltx_core.loader import (
+    SafetensorsStateDictLoader,
+    SingleGPUModelBuilder,
+    StateDict,
+    StateDictPrefetcher,
+    StateDictRegistry,
+    apply_loras,
+    single_gpu_model_builder,
+)
+from ltx_core.loader.sd_ops import SDOps
+from ltx_pipelines.utils.model_ledger import ModelLedger
+from tests.test_model_builder import _checkpoint, _TinyConfigurator
+
+
+class _BlockingLoader(SafetensorsStateDictLoader):
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.loaded_paths: list[list[str]] = []
+
+    def load(self, path: str | list[str], sd_ops: SDOps, device: torch.device | None = None) -> StateDict:
+        self.release.wait(timeout=10)
+        self.loaded_paths.append(path)
+        return super().load(path, sd_ops, device)
+
+
+def _weights(tmp_path: Path) -> list[str]:
+    path = tmp_path / "model.safetensors"
+    save_file({"weight": torch.arange(6.0).reshape(2, 3)}, path)
+    return [str(path)]
+
+
+def test_prefetched_state_dict_is_handed_over_once(tmp_path: Path) -> None:
+    paths = _weights(tmp_path)
+    loader = _BlockingLoader()
+    prefetcher = StateDictPrefetcher(pin_memory=False)
+
+    prefetcher.prefetch(paths, None, loader)
+    prefetcher.prefetch(paths, None, loader)
+    assert prefetcher.pending() == 1
+    assert loader.loaded_paths == []  # The caller is not blocked while the load is pending.
+
+    loader.release.set()
+    state_dict = prefetcher.get(paths, None)
+    assert torch.equal(state_dict.sd["weight"], torch.arange(6.0).reshape(2, 3))
+    assert state_dict.device == torch.device("cpu")
+    assert loader.loaded_paths == [paths]
+    assert prefetcher.get(paths, None) is None
+    assert prefetcher.pending() == 0
+
+
+def test_prefetcher_delegates_to_registry_and_survives_failed_loads(tmp_path: Path) -> None:
+    paths = _weights(tmp_path)
+    registry = StateDictRegistry()
+    prefetcher = StateDictPrefetcher(registry=registry, pin_memory=False)
+    loader = _BlockingLoader()
+    loader.release.set()
+
+    prefetcher.prefetch([str(tmp_path / "missing.safetensors")], None, loader)
+    assert prefetcher.get([str(tmp_path / "missing.safetensors")], None) is None
+
+    state_dict = loader.load(paths, None)
+    prefetcher.add(paths, None, state_dict)
+    prefetcher.prefetch(paths, None, loader)
+    assert prefetcher.pending() == 0
+    assert prefetcher.get(paths, None) is state_dict
+
+
+def test_model_ledger_prefetches_components_with_their_sd_ops(tmp_path: Path) -> None:
+    checkpoint = tmp_path / "ltx.safetensors"
+    save_file({"vae.decoder.conv_in.weight": torch.zeros(2)}, checkpoint)
+    prefetcher = StateDictPrefetcher(pin_memory=False)
+    ledger = ModelLedger(torch.bfloat16, torch.device("cpu"), checkpoint_path=str(checkpoint), registry=prefetcher)
+
+    ledger.prefetch("video_decoder", "spatial_upsampler")
+    assert prefetcher.pending() == 1
+
+    builder = ledger.vae_decoder_builder
+    state_dict = builder.load_sd([str(checkpoint)], prefetcher, torch.device("cpu"), builder.model_sd_ops)
+    assert list(state_dict.sd) == ["conv_in.weight"]
+    assert prefetcher.pending() == 0
+
+
+def test_prefetched_weights_are_fused_on_the_target_device(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    checkpoint, lora = _checkpoint(tmp_path)
+    prefetcher = StateDictPrefetcher(pin_memory=False)
+    builder = SingleGPUModelBuilder(
+        model_class_configurator=_TinyConfigurator, model_path=checkpoint, registry=prefetcher
+    ).lora(lora, 0.5)
+    prefetcher.prefetch([checkpoint], None, builder.model_loader)
+    prefetcher.prefetch([lora], None, builder.model_loader)
+    fused_on = []
+
+    def recording_apply_loras(model_sd: StateDict, *args, **kwargs) -> StateDict:
+        fused_on.extend(value.device for value in model_sd.sd.values())
+        return apply_loras(model_sd, *args, **kwargs)
+
+    monkeypatch.setattr(single_gpu_model_builder, "apply_loras", recording_apply_loras)
+    model = builder.build(torch.device("meta"), torch.bfloat16)
+
+    # Handed over on the host, fused on the device the model is built for.
+    assert fused_on
+    assert {device.type for device in fused_on} == {"meta"}
+    assert all(parameter.dtype == torch.bfloat16 for parameter in model.parameters())
@@ -0,0 +1,76 @@
+import pytest
+import torch
+from transformers import BatchEncoding, Gemma3Config, Gemma3ForConditionalGeneration
+from transformers.models.gemma3 import Gemma3TextConfig
+from transformers.models.siglip import SiglipVisionConfig
+
+from ltx_core.text_encoders.gemma import GemmaTextEncoderModelBase
+from ltx_core.text_encoders.gemma.feature_extractor import GemmaFeaturesExtractorProjLinear
+
+
+class _CharTokenizer:
+    pad_token_id = 0
+
+    def apply_chat_template(self, messages: list[dict], **_kwargs) -> str:
+        return "".join(f"<{m['role']}>{m['content']}" for m in messages) + "<model>"
+
+    def decode(self, ids: torch.Tensor, **_kwargs) -> str:
+        return "".join(chr(ord("a") + int(i) % 26) for i in ids)
+
+
+class _CharProcessor:
+    tokenizer = _CharTokenizer()
+
+    def __call__(self, text: str, **_kwargs) -> BatchEncoding:
+        input_ids = torch.tensor([[1 + ord(c) % 50 for c in text]])
+        return BatchEncoding({"input_ids": input_ids, "attention_mask": torch.ones_like(input_ids)})
+
+
+def _text_encoder() -> GemmaTextEncoderModelBase:
+    torch.manual_seed(0)
+    config = Gemma3Config(
+        text_config=Gemma3TextConfig(
+            vocab_size=64,
+            hidden_size=32,
+            intermediate_size=64,
+            num_hidden_layers=2,
+            num_attention_heads=2,
+            num_key_value_heads=1,
+            head_dim=16,
+            sliding_window=16,
+        ),
+        vision_config=SiglipVisionConfig(
+            hidden_size=16, intermediate_size=32, num_hidden_layers=1, num_attention_heads=2, image_size=28
+        ),
+    )
+    with torch.device("meta"):
+        feature_extractor = GemmaFeaturesExtractorProjLinear()
+    return GemmaTextEncoderModelBase(
+        feature_extractor_linear=feature_extractor,
+        model=Gemma3ForConditionalGeneration(config).eval(),
+        img_processor=_CharProcessor(),
+        dtype=torch.float32,
+    )
+
+
+def test_enhancement_reuses_system_prompt_key_values(monkeypatch: pytest.MonkeyPatch) -> None:
+    text_encoder = _text_encoder()
+    system_prompt = "You write detailed video prompts. " * 4
+    monkeypatch.setattr(text_encoder, "_system_prompt_key_values", lambda *_: None)
+    expected = text_encoder.enhance_t2v("a cat", max_new_tokens=6, system_prompt=system_prompt)
+    monkeypatch.undo()
+
+    prefill_lengths = []
+    text_encoder.model.register_forward_pre_hook(
+        lambda _, _args, kwargs: prefill_lengths.append(kwargs["input_ids"].shape[1]), with_kwargs=True
+    )
+    first = text_encoder.enhance_t2v("a cat", max_new_tokens=6, system_prompt=system_prompt)
+    second = text_encoder.enhance_t2v("a dog", max_new_tokens=6, system_prompt=system_prompt)
+
+    assert first == expected
+    assert second != first
+    prefix_length = prefill_lengths[0]
+    assert prefix_length > len(system_prompt)
+    # The prefix is prefilled once; each call then only runs its own user message and generated tokens.
+    assert prefill_lengths.count(prefix_length) == 1
+    assert max(prefill_lengths[1:]) < prefix_length
@@ -0,0 +1,65 @@
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+import safetensors
+import torch
+from safetensors.torch import save_file
+
+from ltx_core.loader import (
+    REPACKED_METADATA_KEY,
+    KeyValueOperationResult,
+    ParallelSafetensorsStateDictLoader,
+    SafetensorsModelStateDictLoader,
+    SDOps,
+    SingleGPUModelBuilder,
+    repack_model,
+)
+from tests.test_model_builder import _TinyConfigurator
+
+
+def _double(key: str, value: torch.Tensor) -> list[KeyValueOperationResult]:
+    return [KeyValueOperationResult(key, value * 2)]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_repacked_model_loads_without_reapplying_sd_ops(tmp_path: Path, parallel: bool) -> None:
+    generator = torch.Generator().manual_seed(0)
+    checkpoint = tmp_path / "model.safetensors"
+    save_file(
+        {
+            "model.0.weight": torch.randn(4, 4, generator=generator),
+            "model.0.bias": torch.randn(4, generator=generator),
+            "model.1.weight": torch.randn(4, generator=generator),
+            "model.1.bias": torch.randn(4, generator=generator),
+            "vae.weight": torch.randn(4, generator=generator),
+        },
+        checkpoint,
+        metadata={"config": '{"dim": 4}'},
+    )
+    sd_ops = (
+        SDOps("model").with_matching(prefix="model.").with_replacement("model.", "").with_kv_operation(_double, "0.")
+    )
+    builder = SingleGPUModelBuilder(
+        model_class_configurator=_TinyConfigurator, model_path=str(checkpoint), model_sd_ops=sd_ops
+    )
+    cpu = torch.device("cpu")
+    expected = builder.build(cpu, torch.bfloat16)
+
+    repacked = tmp_path / "repacked" / "model.safetensors"
+    repacked.parent.mkdir()
+    repack_model(builder, repacked, torch.bfloat16)
+
+    with safetensors.safe_open(repacked, framework="pt") as f:
+        assert sorted(f.keys()) == ["0.bias", "0.weight", "1.bias", "1.weight"]
+        assert f.get_tensor("0.weight").dtype == torch.bfloat16
+        assert json.loads(f.metadata()[REPACKED_METADATA_KEY])["sd_ops"] == "model"
+    assert not list(repacked.parent.glob("*.tmp"))
+
+    # The same builder pointed at the repacked file: the renaming and the doubling are not applied again.
+    loader = SafetensorsModelStateDictLoader(ParallelSafetensorsStateDictLoader(max_workers=2) if parallel else None)
+    model = replace(builder, model_path=str(repacked), model_loader=loader).build(cpu, torch.bfloat16)
+    for parameter, expected_parameter in zip(model.parameters(), expected.parameters(), strict=True):
+        assert parameter.dtype == torch.bfloat16
+        torch.testing.assert_close(parameter, expected_parameter)
@@ -0,0 +1,52 @@
+import torch
+
+from ltx_core.model.transformer.rope import FreqsCisCache, LTXRopeType, precompute_freqs_cis
+
+_ROPE_KWARGS = {"dim": 24, "out_dtype": torch.float32, "max_pos": [20, 64, 64], "use_middle_indices_grid": True}
+
+
+def _positions(offset: float = 0.0) -> torch.Tensor:
+    starts = torch.arange(12.0).expand(1, 3, 12) + offset
+    return torch.stack([starts, starts + 1.0], dim=-1)
+
+
+def test_freqs_cis_cache_matches_uncached_embeddings() -> None:
+    cache = FreqsCisCache()
+    for rope_type in (LTXRopeType.INTERLEAVED, LTXRopeType.SPLIT):
+        kwargs = {**_ROPE_KWARGS, "rope_type": rope_type, "num_attention_heads": 2}
+        batched_positions = _positions().repeat(4, 1, 1, 1)
+        cached = cache.get_or_compute(batched_positions, **kwargs)
+        expected = precompute_freqs_cis(batched_positions, **kwargs)
+        for cached_freqs, expected_freqs in zip(cached, expected, strict=True):
+            torch.testing.assert_close(cached_freqs, expected_freqs)
+
+
+def test_freqs_cis_cache_reuses_entries_by_value() -> None:
+    cache = FreqsCisCache(maxsize=2)
+    first = cache.get_or_compute(_positions().repeat(2, 1, 1, 1), **_ROPE_KWARGS)
+    second = cache.get_or_compute(_positions().repeat(3, 1, 1, 1), **_ROPE_KWARGS)
+    assert len(cache) == 1
+    assert second[0].data_ptr() == first[0].data_ptr()
+
+    cache.get_or_compute(_positions(offset=1.0), **_ROPE_KWARGS)
+    cache.get_or_compute(_positions(), **{**_ROPE_KWARGS, "out_dtype": torch.bfloat16})
+    assert len(cache) == 2
+    third = cache.get_or_compute(_positions(), **_ROPE_KWARGS)
+    assert third[0].data_ptr() != first[0].data_ptr()
+
+
+def test_freqs_cis_cache_is_bounded_by_bytes() -> None:
+    entry_nbytes = FreqsCisCache().get_or_compute(_positions(), **_ROPE_KWARGS)[0].nbytes * 2 + _positions().nbytes
+    cache = FreqsCisCache(max_bytes=2 * entry_nbytes)
+    for offset in range(3):
+        cache.get_or_compute(_positions(offset=float(offset)), **_ROPE_KWARGS)
+    assert len(cache) == 2
+    assert cache.nbytes == 2 * entry_nbytes
+
+    small = FreqsCisCache(max_bytes=entry_nbytes - 1)
+    small.get_or_compute(_positions(), **_ROPE_KWARGS)
+    assert len(small) == 0
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
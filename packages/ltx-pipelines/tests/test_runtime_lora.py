@@ -0,0 +1,142 @@
+import shutil
+from pathlib import Path
+
+import pytest
+import torch
+
+from ltx_core.loader import (
+    LTXV_LORA_COMFY_RENAMING_MAP,
+    LoraPathStrengthAndSDOps,
+    LoraStateDictWithStrength,
+    RuntimeLoras,
+    StateDict,
+    fuse_loras_,
+)
+from ltx_core.model.transformer.model_configurator import amend_forward_with_upcast
+from ltx_pipelines.utils.model_ledger import ModelLedger
+from tests.test_fused_cache import _ltx_checkpoint
+
+
+def _model(dtype: torch.dtype = torch.float32) -> torch.nn.Module:
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(16, 8), torch.nn.GELU(), torch.nn.Linear(8, 8))
+    return model.to(dtype)
+
+
+def _lora(seed: int, modules: tuple[str, ...] = ("0", "2")) -> StateDict:
+    generator = torch.Generator().manual_seed(seed)
+    sd = {}
+    for module in modules:
+        in_features = 16 if module == "0" else 8
+        sd[f"{module}.lora_A.weight"] = torch.randn(4, in_features, generator=generator)
+        sd[f"{module}.lora_B.weight"] = torch.randn(8, 4, generator=generator)
+    return StateDict(sd, torch.device("cpu"), 0, {torch.float32})
+
+
+def _fused(loras: list[tuple[int, float]]) -> torch.nn.Module:
+    model = _model()
+    fuse_loras_(model, [LoraStateDictWithStrength(_lora(seed), strength) for seed, strength in loras])
+    return model
+
+
+def test_runtime_loras_match_fused_loras() -> None:
+    x = torch.randn(3, 16, generator=torch.Generator().manual_seed(3))
+    model = _model()
+    runtime_loras = RuntimeLoras(model, torch.device("cpu"), dtype=torch.float32)
+
+    runtime_loras.add("a", _lora(1), 0.5)
+    runtime_loras.add("b", _lora(2), -0.25)
+    with torch.no_grad():
+        torch.testing.assert_close(model(x), _fused([(1, 0.5), (2, -0.25)])(x), rtol=1e-4, atol=1e-4)
+
+        runtime_loras.set_strength("a", 1.5)
+        torch.testing.assert_close(model(x), _fused([(1, 1.5), (2, -0.25)])(x), rtol=1e-4, atol=1e-4)
+
+        runtime_loras.remove("b")
+        torch.testing.assert_close(model(x), _fused([(1, 1.5)])(x), rtol=1e-4, atol=1e-4)
+
+
+def test_runtime_loras_leave_base_weights_untouched() -> None:
+    x = torch.randn(3, 16, generator=torch.Generator().manual_seed(3))
+    model = _model()
+    original = {key: value.clone() for key, value in model.state_dict().items()}
+    with torch.no_grad():
+        expected = model(x)
+    runtime_loras = RuntimeLoras(model, torch.device("cpu"), dtype=torch.float32)
+
+    runtime_loras.add("a", _lora(1, modules=("2",)))
+    assert not model[0]._forward_hooks
+    assert len(model[2]._forward_hooks) == 1
+    runtime_loras.clear()
+
+    assert runtime_loras.strengths == {}
+    assert not model[2]._forward_hooks
+    for key, value in model.state_dict().items():
+        assert torch.equal(value, original[key])
+    with torch.no_grad():
+        assert torch.equal(model(x), expected)
+
+
+def test_runtime_loras_apply_on_top_of_fp8_weights() -> None:
+    x = torch.randn(3, 16, generator=torch.Generator().manual_seed(3)).bfloat16()
+    model = _model(torch.bfloat16)
+    for linear in (model[0], model[2]):
+        linear.weight.data = linear.weight.data.to(torch.float8_e4m3fn)
+    amend_forward_with_upcast(model)
+    lora = _lora(1, modules=("0",))
+    with torch.no_grad():
+        hidden = model[0](x)
+        down, up = lora.sd["0.lora_A.weight"].bfloat16(), lora.sd["0.lora_B.weight"].bfloat16()
+        expected = model[2](model[1](hidden + 0.5 * (x @ down.T @ up.T)))
+
+        RuntimeLoras(model, torch.device("cpu")).add("a", lora, 0.5)
+
+        assert model[0].weight.dtype == torch.float8_e4m3fn
+        torch.testing.assert_close(model(x), expected)
+
+
+def test_sample_strengths_apply_each_sample_its_own_loras() -> None:
+    x = torch.randn(3, 5, 16, generator=torch.Generator().manual_seed(3))
+    model = _model()
+    runtime_loras = RuntimeLoras(model, torch.device("cpu"), dtype=torch.float32)
+    runtime_loras.add("a", _lora(1))
+    runtime_loras.add("b", _lora(2))
+    samples = [{"a": 0.5}, {"b": -0.25}, {"a": 1.5, "b": -0.25}]
+    runtime_loras.set_sample_strengths(samples)
+
+    with torch.no_grad():
+        batched = model(x)
+        # Two passes over the samples stacked in one batch, as in batched guidance.
+        stacked = model(torch.cat([x, x]))
+
+        expected = [_fused([(1, 0.5)])(x[0]), _fused([(2, -0.25)])(x[1]), _fused([(1, 1.5), (2, -0.25)])(x[2])]
+        torch.testing.assert_close(batched, torch.stack(expected), rtol=1e-4, atol=1e-4)
+        torch.testing.assert_close(stacked, torch.cat([batched, batched]))
+        with pytest.raises(ValueError, match="multiple"):
+            model(x[:2])
+
+        runtime_loras.set_sample_strengths(None)
+        torch.testing.assert_close(model(x), _fused([(1, 1.0), (2, 1.0)])(x), rtol=1e-4, atol=1e-4)
+    with pytest.raises(ValueError, match="c"):
+        runtime_loras.set_sample_strengths([{"c": 1.0}])
+
+
+def test_sample_loras_keep_the_adapters_of_an_enclosing_fused_loras(tmp_path: Path) -> None:
+    checkpoint, lora = _ltx_checkpoint(tmp_path)
+    other = tmp_path / "other_lora.safetensors"
+    shutil.copy(lora, other)
+    ledger = ModelLedger(torch.bfloat16, torch.device("cpu"), checkpoint_path=checkpoint, runtime_loras=True)
+    transformer = ledger.transformer()
+    runtime_loras = transformer.velocity_model.runtime_loras
+    fused = LoraPathStrengthAndSDOps(lora, 0.5, LTXV_LORA_COMFY_RENAMING_MAP)
+    per_sample = LoraPathStrengthAndSDOps(str(other), 0.25, LTXV_LORA_COMFY_RENAMING_MAP)
+
+    with ledger.fused_loras(transformer, [fused]), ledger.sample_loras(transformer, [[], [per_sample]]):
+        (fused_name,) = (name for name in runtime_loras.strengths if name.endswith("(fused_loras)"))
+        (sample_name,) = runtime_loras.strengths.keys() - {fused_name}
+        assert runtime_loras.sample_strengths == [
+            {fused_name: 0.5},
+            {fused_name: 0.5, sample_name: 0.25},
+        ]
+    assert runtime_loras.sample_strengths is None
+    assert runtime_loras.strengths == {}
@@ -0,0 +1,136 @@
+import json
+import threading
+import urllib.request
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from ltx_pipelines.serve import Job, JobQueue, JobStatus, create_server
+from ltx_pipelines.utils.helpers import GenerationCancelledError
+
+
+def _wait_for(job_queue: JobQueue, job_id: str, status: JobStatus) -> Job:
+    for _ in range(200):
+        job = job_queue.get(job_id)
+        if job.status == status:
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job {job_id} did not reach {status}, is {job_queue.get(job_id).status}")
+
+
+def test_job_queue_runs_jobs_in_order() -> None:
+    ran = []
+    job_queue = JobQueue(runner=lambda job, _: ran.append(job.argv[0]))
+    first = job_queue.submit("one-stage", ["a"])
+    second = job_queue.submit("one-stage", ["b"])
+    job_queue.start()
+    _wait_for(job_queue, second.id, JobStatus.SUCCEEDED)
+    job_queue.stop()
+
+    assert ran == ["a", "b"]
+    assert job_queue.get(first.id).status == JobStatus.SUCCEEDED
+
+
+def test_job_queue_records_failures_and_continues() -> None:
+    def runner(job: Job, _: threading.Event) -> None:
+        if job.argv == ["bad"]:
+            raise RuntimeError("boom")
+
+    job_queue = JobQueue(runner=runner)
+    bad = job_queue.submit("one-stage", ["bad"])
+    good = job_queue.submit("one-stage", ["good"])
+    job_queue.start()
+    _wait_for(job_queue, good.id, JobStatus.SUCCEEDED)
+    job_queue.stop()
+
+    assert job_queue.get(bad.id).status == JobStatus.FAILED
+    assert job_queue.get(bad.id).error == "RuntimeError: boom"
+
+
+def test_job_queue_cancels_queued_and_running_jobs() -> None:
+    started = threading.Event()
+
+    def runner(_: Job, cancel_event: threading.Event) -> None:
+        started.set()
+        cancel_event.wait(5)
+        raise GenerationCancelledError("cancelled")
+
+    job_queue = JobQueue(runner=runner)
+    running = job_queue.submit("one-stage", ["a"])
+    queued = job_queue.submit("one-stage", ["b"])
+    job_queue.start()
+    started.wait(5)
+    assert job_queue.cancel(queued.id).status == JobStatus.CANCELLED
+    job_queue.cancel(running.id)
+    _wait_for(job_queue, running.id, JobStatus.CANCELLED)
+    job_queue.stop()
+
+
+def test_job_queue_persists_and_requeues_unfinished_jobs(tmp_path: Path) -> None:
+    job_queue = JobQueue(runner=lambda *_: None, state_dir=tmp_path)
+    job = job_queue.submit("two-stages", ["--prompt", "p"], output_path="/tmp/out.mp4")
+
+    ran = []
+    restored = JobQueue(runner=lambda job, _: ran.append(job.id), state_dir=tmp_path)
+    assert restored.get(job.id).output_path == "/tmp/out.mp4"
+    restored.start()
+    _wait_for(restored, job.id, JobStatus.SUCCEEDED)
+    restored.stop()
+    assert ran == [job.id]
+    assert json.loads((tmp_path / "jobs" / f"{job.id}.json").read_text())["status"] == "succeeded"
+
+
+@pytest.fixture
+def http_server() -> Iterator[tuple[str, JobQueue]]:
+    job_queue = JobQueue(runner=lambda *_: None)
+    server = create_server(job_queue, host="127.0.0.1", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", job_queue
+    server.shutdown()
+    server.server_close()
+
+
+def _request(url: str, method: str = "GET", body: dict | None = None) -> tuple[int, dict]:
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        with e:
+            return e.code, json.loads(e.read())
+
+
+def test_http_api_submit_status_and_cancel(http_server: tuple[str, JobQueue], tmp_path: Path) -> None:
+    base_url, job_queue = http_server
+    args = {"checkpoint_path": "c", "gemma_root": "g", "prompt": "p", "output_path": str(tmp_path / "out.mp4")}
+
+    status, job = _request(f"{base_url}/jobs", "POST", {"pipeline": "one-stage", "args": args})
+    assert status == 202
+    assert job["status"] == "queued"
+    assert job["output_path"] == str(tmp_path / "out.mp4")
+
+    status, fetched = _request(f"{base_url}/jobs/{job['id']}")
+    assert status == 200
+    assert fetched["id"] == job["id"]
+
+    status, cancelled = _request(f"{base_url}/jobs/{job['id']}/cancel", "POST")
+    assert status == 200
+    assert cancelled["status"] == "cancelled"
+    assert job_queue.pending_count() == 0
+
+    status, health = _request(f"{base_url}/health")
+    assert status == 200
+    assert health == {"status": "ok", "queued": 0}
+
+
+def test_http_api_rejects_invalid_jobs(http_server: tuple[str, JobQueue]) -> None:
+    base_url, _ = http_server
+    status, body = _request(f"{base_url}/jobs", "POST", {"pipeline": "one-stage", "args": {"prompt": "p"}})
+    assert status == 400
+    assert "required" in body["error"]
+
+    status, _ = _request(f"{base_url}/jobs/unknown")
+    assert status == 404
@@ -0,0 +1,79 @@
+import hashlib
+import logging
+from pathlib import Path
+
+import pytest
+import torch
+from safetensors.torch import save_file
+
+from ltx_core.loader import ParallelSafetensorsStateDictLoader, SafetensorsStateDictLoader, SDOps, save_safetensors
+
+
+def _shards(tmp_path: Path) -> list[str]:
+    generator = torch.Generator().manual_seed(0)
+    shards = [
+        {
+            "model.blocks.0.weight": torch.randn(64, 32, generator=generator),
+            "model.blocks.0.bias": torch.randn(64, generator=generator).bfloat16(),
+            "model.scale": torch.randn((), generator=generator).half(),
+            "vae.conv.weight": torch.randn(8, 8, generator=generator),
+        },
+        {
+            "model.blocks.1.weight": torch.randn(64, 32, generator=generator).bfloat16(),
+            "model.blocks.1.index": torch.arange(7, dtype=torch.int64),
+            "model.blocks.1.mask": torch.rand(5, generator=generator) > 0.5,
+        },
+    ]
+    paths = []
+    for index, shard in enumerate(shards):
+        path = tmp_path / f"model-{index}.safetensors"
+        save_file(shard, path)
+        paths.append(str(path))
+    return paths
+
+
+def test_parallel_loader_matches_sequential_loader(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    paths = _shards(tmp_path)
+    sd_ops = SDOps("model").with_matching(prefix="model.").with_replacement("model.", "")
+    expected = SafetensorsStateDictLoader().load(paths, sd_ops)
+
+    # Reads of at most 1 KiB: small tensors are coalesced, the weights are read on their own.
+    loader = ParallelSafetensorsStateDictLoader(max_workers=3, read_size=1024)
+    with caplog.at_level(logging.INFO):
+        state_dict = loader.load(paths, sd_ops)
+
+    assert state_dict.sd.keys() == expected.sd.keys()
+    assert "vae.conv.weight" not in state_dict.sd
+    for key, value in expected.sd.items():
+        assert state_dict.sd[key].dtype == value.dtype
+        assert torch.equal(state_dict.sd[key], value)
+    assert state_dict.size == expected.size
+    assert any("GiB/s" in record.message for record in caplog.records)
+
+
+def test_save_safetensors_streams_values_in_any_order(tmp_path: Path) -> None:
+    paths = _shards(tmp_path)
+    sd_ops = SDOps("model").with_matching(prefix="model.").with_replacement("model.", "")
+    loader = SafetensorsStateDictLoader()
+    layout = loader.meta_tensors(paths, sd_ops)
+    expected = loader.load(paths, sd_ops).sd
+    assert all(value.is_meta for _, value in layout)
+    assert {key: (value.dtype, value.shape) for key, value in layout} == {
+        key: (value.dtype, value.shape) for key, value in expected.items()
+    }
+
+    output = tmp_path / "out.safetensors"
+    save_safetensors(output, layout, {"config": "{}"}, values=reversed(list(expected.items())))
+    written = loader.load(str(output), None).sd
+    assert written.keys() == expected.keys()
+    for key, value in expected.items():
+        assert torch.equal(written[key], value)
+    assert not list(tmp_path.glob("*.tmp"))
+
+    digest = hashlib.sha256()
+    save_safetensors(output, list(expected.items()), digest=digest)
+    assert digest.hexdigest() == hashlib.sha256(output.read_bytes()).hexdigest()
+    with pytest.raises(ValueError, match="order"):
+        save_safetensors(output, list(expected.items()), values=reversed(list(expected.items())), digest=digest)
+    with pytest.raises(ValueError, match="No data"):
+        save_safetensors(output, list(expected.items()), values=list(expected.items())[1:])
@@ -0,0 +1,146 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import torch
+from safetensors.torch import save_file
+
+from ltx_pipelines.utils.text_cache import (
+    TextEmbeddingCache,
+    encode_prompts,
+    enhance_prompt_cached,
+    text_encoder_fingerprint,
+)
+
+
+def _model_files(tmp_path: Path) -> tuple[Path, Path]:
+    checkpoint = tmp_path / "ltx.safetensors"
+    save_file({"connector.weight": torch.zeros(2)}, checkpoint)
+    gemma_root = tmp_path / "gemma"
+    gemma_root.mkdir()
+    save_file({"layer.weight": torch.zeros(2)}, gemma_root / "model-00001-of-00001.safetensors")
+    (gemma_root / "tokenizer.model").write_bytes(b"tokenizer")
+    (gemma_root / "tokenizer_config.json").write_text('{"padding_side": "left"}')
+    return checkpoint, gemma_root
+
+
+class _TextEncoder:
+    def __init__(self) -> None:
+        self.encoded: list[str] = []
+
+    def __call__(self, prompt: str) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        self.encoded.append(prompt)
+        value = float(len(prompt))
+        return torch.full((1, 4, 8), value), torch.full((1, 4, 2), -value), torch.ones(1, 4)
+
+
+def test_cache_round_trip_and_unreadable_entries(tmp_path: Path) -> None:
+    cache = TextEmbeddingCache(tmp_path)
+    key = cache.key("A cat", "encoder")
+    assert cache.get(key, torch.device("cpu")) is None
+
+    cache.put(key, torch.arange(6.0).reshape(1, 2, 3), torch.ones(1, 2, 1))
+    video_context, audio_context = cache.get(key, torch.device("cpu"))
+    assert torch.equal(video_context, torch.arange(6.0).reshape(1, 2, 3))
+    assert torch.equal(audio_context, torch.ones(1, 2, 1))
+    assert cache.key("A cat", "other encoder") != key
+
+    cache._path(key).write_bytes(b"corrupt")
+    assert cache.get(key, torch.device("cpu")) is None
+
+
+def test_fingerprint_tracks_tokenizer_weights_and_dtype(tmp_path: Path) -> None:
+    checkpoint, gemma_root = _model_files(tmp_path)
+    fingerprint = text_encoder_fingerprint(str(checkpoint), str(gemma_root), torch.bfloat16)
+    assert fingerprint == text_encoder_fingerprint(str(checkpoint), str(gemma_root), torch.bfloat16)
+    assert fingerprint != text_encoder_fingerprint(str(checkpoint), str(gemma_root), torch.float32)
+    assert fingerprint != text_encoder_fingerprint(str(checkpoint), str(gemma_root), torch.bfloat16, 128)
+
+    (gemma_root / "tokenizer_config.json").write_text('{"padding_side": "right"}')
+    retokenized = text_encoder_fingerprint(str(checkpoint), str(gemma_root), torch.bfloat16)
+    assert retokenized != fingerprint
+
+    save_file({"connector.weight": torch.zeros(3)}, checkpoint)
+    assert text_encoder_fingerprint(str(checkpoint), str(gemma_root), torch.bfloat16) != retokenized
+
+
+def test_encode_prompts_only_builds_text_encoder_on_miss(tmp_path: Path) -> None:
+    checkpoint, gemma_root = _model_files(tmp_path)
+    text_encoders = []
+
+    def text_encoder() -> _TextEncoder:
+        text_encoders.append(_TextEncoder())
+        return text_encoders[-1]
+
+    ledger = SimpleNamespace(
+        checkpoint_path=str(checkpoint),
+        gemma_root_path=str(gemma_root),
+        dtype=torch.bfloat16,
+        device=torch.device("cpu"),
+        text_padding_multiple=None,
+        text_encoder=text_encoder,
+        released=[],
+    )
+    ledger.release = ledger.released.append
+    cache = TextEmbeddingCache(tmp_path / "cache")
+
+    first = encode_prompts(ledger, ["a cat", "blurry"], cache)
+    assert text_encoders[0].encoded == ["a cat", "blurry"]
+    # The text encoder built for the misses is handed back to the model cache.
+    assert ledger.released == text_encoders
+
+    second = encode_prompts(ledger, ["a cat", "blurry"], cache)
+    assert len(text_encoders) == 1
+    for (video, audio), (cached_video, cached_audio) in zip(first, second, strict=True):
+        assert torch.equal(video, cached_video)
+        assert torch.equal(audio, cached_audio)
+
+    encode_prompts(ledger, ["a dog", "blurry"], cache)
+    assert text_encoders[1].encoded == ["a dog"]
+
+
+class _EnhancingTextEncoder:
+    def __init__(self) -> None:
+        self.enhanced: list[tuple[str, int]] = []
+
+    def enhance_t2v(self, prompt: str, seed: int) -> str:
+        self.enhanced.append((prompt, seed))
+        return f"Enhanced {prompt} ({seed})"
+
+
+def test_enhance_prompt_cached_only_builds_text_encoder_on_miss(tmp_path: Path) -> None:
+    checkpoint, gemma_root = _model_files(tmp_path)
+    text_encoders = []
+
+    def text_encoder() -> _EnhancingTextEncoder:
+        text_encoders.append(_EnhancingTextEncoder())
+        return text_encoders[-1]
+
+    ledger = SimpleNamespace(
+        checkpoint_path=str(checkpoint),
+        gemma_root_path=str(gemma_root),
+        dtype=torch.bfloat16,
+        text_padding_multiple=None,
+        text_encoder=text_encoder,
+    )
+    cache = TextEmbeddingCache(tmp_path / "cache")
+
+    enhanced, built = enhance_prompt_cached(ledger, "a cat", seed=1, text_cache=cache)
+    assert enhanced == "Enhanced a cat (1)"
+    assert built is text_encoders[0]
+
+    assert enhance_prompt_cached(ledger, "a cat", seed=1, text_cache=cache) == (enhanced, None)
+    assert len(text_encoders) == 1
+
+    enhance_prompt_cached(ledger, "a cat", seed=2, text_cache=cache)
+    assert text_encoders[1].enhanced == [("a cat", 2)]
+
+
+@pytest.mark.parametrize("content", ["not json", '{"other": 1}'])
+def test_unreadable_enhanced_prompt_entries_are_misses(tmp_path: Path, content: str) -> None:
+    cache = TextEmbeddingCache(tmp_path)
+    key = cache.key("a cat", "enhance")
+    cache.put_enhanced_prompt(key, "A cat")
+    assert cache.get_enhanced_prompt(key) == "A cat"
+    cache._path(key, ".json").write_text(content)
+    assert cache.get_enhanced_prompt(key) is None
@@ -28,6 +28,7 @@ from ltx_core.text_encoders.gemma.encoders.av_encoder import (
     AV_GEMMA_TEXT_ENCODER_KEY_OPS,
     AVGemmaTextEncoderModel,
 )
+from ltx_core.text_encoders.gemma.encoders.base_encoder import TEXT_MAX_LENGTH
 from ltx_core.text_encoders.gemma.feature_extractor import GemmaFeaturesExtractorProjLinear
 from ltx_core.text_encoders.gemma.tokenizer import LTXVGemmaTokenizer
 
@@ -77,7 +78,7 @@ def load_8bit_gemma(
         )
 
     # Load tokenizer
-    tokenizer = LTXVGemmaTokenizer(tokenizer_path, 1024)
+    tokenizer = LTXVGemmaTokenizer(tokenizer_path, TEXT_MAX_LENGTH)
 
     # Load config and weights from the LTX-2 checkpoint
     loader = SafetensorsModelStateDictLoader()